@@ -0,0 +1,149 @@
+"""
+Local stand-in for the Open-Meteo geocoding, forecast, archive and air quality APIs,
+for load tests that shouldn't depend on (or hammer) the real service. Responses have
+the real shape, with deterministic values per location, and are delayed by
+`latency` ± `jitter` ms; a fraction `error_rate` of requests fail with a 503.
+
+GET /stats returns the number of requests served per endpoint and POST /reset zeroes them.
+
+    python benchmarks/fake_open_meteo.py --port 9100 --latency 40 --jitter 20 --error-rate 0.01
+    WEATHER_MCP_UPSTREAM_BASE_URL=http://127.0.0.1:9100 mcp-weather-plus
+"""
+import argparse
+import asyncio
+import math
+import random
+import zlib
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# Variables whose real values are whole numbers (and that the server's models parse as int)
+INTEGER_VARIABLES = {
+    "relative_humidity_2m", "wind_direction_10m", "weather_code", "is_day", "cloud_cover",
+    "precipitation_probability", "precipitation_probability_max", "us_aqi", "european_aqi",
+}
+TIME_VARIABLES = {"sunrise", "sunset"}
+
+def _variables(request, name: str) -> List[str]:
+    # The server sends lists as repeated parameters; the real API also takes comma-separated ones
+    return [v for value in request.query_params.getlist(name) for v in value.split(",") if v]
+
+def _value(name: str, seed: int, index: int) -> Any:
+    # A daily cycle plus a per-location offset, so values look plausible and are reproducible
+    base = (seed % 200) / 10
+    value = base + 8 * math.sin((index % 24) / 24 * 2 * math.pi) + (zlib.crc32(name.encode()) % 50) / 10
+    return int(abs(value) * 3) % 100 if name in INTEGER_VARIABLES else round(abs(value), 1)
+
+def _hours(request) -> List[datetime]:
+    params = request.query_params
+    if "start_date" in params:
+        start = date.fromisoformat(params["start_date"])
+        days = (date.fromisoformat(params["end_date"]) - start).days + 1
+    else:
+        start = date.today()
+        days = int(params.get("forecast_days", 7))
+    first = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+    count = min(days * 24, int(params["forecast_hours"])) if "forecast_hours" in params else days * 24
+    return [first + timedelta(hours=h) for h in range(count)]
+
+def _format_time(moment: datetime, unixtime: bool) -> Any:
+    return int(moment.timestamp()) if unixtime else moment.strftime("%Y-%m-%dT%H:%M")
+
+def _location(request, lat: float, lon: float) -> Dict[str, Any]:
+    seed = zlib.crc32(f"{lat:.2f},{lon:.2f}".encode())
+    unixtime = request.query_params.get("timeformat") == "unixtime"
+    data: Dict[str, Any] = {
+        "latitude": lat, "longitude": lon, "generationtime_ms": 0.1, "utc_offset_seconds": 0,
+        "timezone": "GMT", "timezone_abbreviation": "GMT", "elevation": 10.0,
+    }
+    current = _variables(request, "current")
+    if current:
+        now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        data["current"] = {"time": _format_time(now, unixtime), "interval": 900, **{name: _value(name, seed, now.hour) for name in current}}
+    hourly = _variables(request, "hourly")
+    if hourly:
+        hours = _hours(request)
+        data["hourly"] = {"time": [_format_time(h, unixtime) for h in hours]}
+        for name in hourly:
+            data["hourly"][name] = [_value(name, seed, i) for i in range(len(hours))]
+    daily = _variables(request, "daily")
+    if daily:
+        days = _hours(request)[::24]
+        data["daily"] = {"time": [d.strftime("%Y-%m-%d") if not unixtime else int(d.timestamp()) for d in days]}
+        for name in daily:
+            if name in TIME_VARIABLES:
+                offset = timedelta(hours=6 if name == "sunrise" else 18)
+                data["daily"][name] = [_format_time(d + offset, unixtime) for d in days]
+            else:
+                data["daily"][name] = [_value(name, seed, i) for i in range(len(days))]
+    return data
+
+def create_app(latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> Starlette:
+    """Builds the fake API. `latency` and `jitter` are in milliseconds."""
+    rng = random.Random(seed)
+    counts: Counter = Counter()
+
+    async def delay_or_fail(request):
+        counts[request.url.path] += 1
+        delay = latency + rng.uniform(-jitter, jitter)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if error_rate and rng.random() < error_rate:
+            return JSONResponse({"error": True, "reason": "Injected failure"}, status_code=503)
+        return None
+
+    async def search(request):
+        failure = await delay_or_fail(request)
+        if failure:
+            return failure
+        name = request.query_params.get("name", "")
+        seed = zlib.crc32(name.strip().lower().encode())
+        result = {"name": name, "latitude": round((seed % 12000) / 100 - 60, 4), "longitude": round((seed // 12000 % 36000) / 100 - 180, 4)}
+        return JSONResponse({"results": [result], "generationtime_ms": 0.1})
+
+    async def forecast(request):
+        failure = await delay_or_fail(request)
+        if failure:
+            return failure
+        lats = [float(v) for v in request.query_params["latitude"].split(",")]
+        lons = [float(v) for v in request.query_params["longitude"].split(",")]
+        locations = [_location(request, lat, lon) for lat, lon in zip(lats, lons)]
+        # Like the real API: one location is an object, several are a list
+        return JSONResponse(locations[0] if len(locations) == 1 else locations)
+
+    async def stats(request):
+        return JSONResponse(dict(counts))
+
+    async def reset(request):
+        counts.clear()
+        return JSONResponse({})
+
+    return Starlette(routes=[
+        Route("/v1/search", search),
+        Route("/v1/forecast", forecast),
+        Route("/v1/archive", forecast),
+        Route("/v1/air-quality", forecast),
+        Route("/stats", stats),
+        Route("/reset", reset, methods=["POST"]),
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Open-Meteo APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean response delay in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Delay varies uniformly by ± this many ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+    app = create_app(args.latency, args.jitter, args.error_rate, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
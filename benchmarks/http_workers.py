@@ -0,0 +1,107 @@
+"""
+Measures HTTP-mode tool-call throughput for increasing worker counts. For each count it
+starts `python -m mcp_weather_plus --mode streamable-http --workers N --stateless` against
+the local Open-Meteo stand-in (fake_open_meteo.py), makes MCP tool calls from the
+load-test workload at a fixed concurrency for a fixed time and reports calls per second
+and latency percentiles.
+
+Prefetching and the outbound rate limit are turned off, so the numbers reflect the
+request path. Each worker has its own caches, so `--cache-backend sqlite` shows the
+effect of sharing one.
+
+    python benchmarks/http_workers.py --workers 1 2 4 --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+from load_test import WORKLOAD, percentile, wait_for_http
+
+DEFAULT_TOOLS = ["get_current_weather", "get_weather_details", "convert_times"]
+
+async def drive(url: str, tools, concurrency: int, duration: float, seed: int):
+    latencies = []
+    errors = 0
+    rng = random.Random(seed)
+    async with streamable_http_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            stop_at = time.monotonic() + duration
+
+            async def worker():
+                nonlocal errors
+                while time.monotonic() < stop_at:
+                    tool = rng.choice(tools)
+                    started = time.perf_counter()
+                    try:
+                        result = await session.call_tool(tool, WORKLOAD[tool](rng))
+                    except Exception:
+                        errors += 1
+                        continue
+                    if result.isError:
+                        errors += 1
+                        continue
+                    latencies.append(time.perf_counter() - started)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(latencies), errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tools", nargs="+", choices=list(WORKLOAD), default=DEFAULT_TOOLS)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=40.0, help="Fake upstream latency in ms")
+    parser.add_argument("--cache-backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fake-port", type=int, default=9101)
+    args = parser.parse_args()
+
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    fake = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_open_meteo.py"),
+         "--port", str(args.fake_port), "--latency", str(args.latency), "--seed", str(args.seed)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    env = {
+        **os.environ,
+        "WEATHER_MCP_UPSTREAM_BASE_URL": fake_url,
+        "WEATHER_MCP_PREFETCH_ENABLED": "false",
+        "WEATHER_MCP_RATE_LIMIT_PER_SECOND": "0",
+        "WEATHER_MCP_CACHE_BACKEND": args.cache_backend,
+    }
+    print(f"{'workers':>7} {'calls/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    try:
+        asyncio.run(wait_for_http(f"{fake_url}/stats"))
+        for workers in args.workers:
+            process = subprocess.Popen(
+                [sys.executable, "-m", "mcp_weather_plus", "--mode", "streamable-http", "--stateless",
+                 "--host", "127.0.0.1", "--port", str(args.port), "--workers", str(workers)],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                asyncio.run(wait_for_http(f"http://127.0.0.1:{args.port}/metrics"))
+                latencies, errors = asyncio.run(
+                    drive(f"http://127.0.0.1:{args.port}/mcp", args.tools, args.concurrency, args.duration, args.seed)
+                )
+            finally:
+                process.send_signal(signal.SIGTERM)
+                process.wait(timeout=30)
+            print(
+                f"{workers:>7} {len(latencies) / args.duration:>10.1f} {percentile(latencies, 50) * 1000:>8.2f} "
+                f"{percentile(latencies, 95) * 1000:>8.2f} {percentile(latencies, 99) * 1000:>8.2f} {errors:>7}"
+            )
+    finally:
+        fake.terminate()
+        fake.wait(timeout=30)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Load test of the MCP server against the local Open-Meteo stand-in (fake_open_meteo.py).
+For every tool in the workload it makes `--calls` calls at `--concurrency` over the chosen
+transports and reports latency percentiles, calls per second, failed calls and the
+upstream requests the calls caused. Results are written as JSON; with `--baseline` a
+previous result file is compared and the exit status is 1 when a tool got slower, served
+fewer calls per second or sent more upstream requests per call than `--tolerance` allows.
+
+Prefetching and the outbound rate limit are turned off in the server under test, so the
+numbers reflect the request path itself. Caches stay on: cities are drawn from a skewed
+distribution (a few popular ones, a long tail), so the upstream counts show how well
+caching and request coalescing work.
+
+    python benchmarks/load_test.py --transport stdio http --concurrency 16 --calls 200 \\
+        --latency 40 --jitter 20 --output benchmarks/results/baseline.json
+    python benchmarks/load_test.py --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+import httpx
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamable_http_client
+
+CITIES = [
+    "London", "Paris", "New York", "Tokyo", "Berlin", "Madrid", "Rome", "Sydney", "Toronto", "Mumbai",
+    "Beijing", "Cairo", "Lagos", "Lima", "Moscow", "Seoul", "Bangkok", "Istanbul", "Chicago", "Vienna",
+    "Oslo", "Dublin", "Lisbon", "Prague", "Warsaw", "Athens", "Nairobi", "Santiago", "Bogota", "Hanoi",
+    "Manila", "Jakarta", "Karachi", "Dhaka", "Tehran", "Riyadh", "Doha", "Helsinki", "Zurich", "Denver",
+]
+# Zipf-like popularity: the first cities are asked for far more often than the last ones
+CITY_WEIGHTS = [1 / (rank + 1) for rank in range(len(CITIES))]
+TIMEZONES = ["Europe/London", "America/New_York", "Asia/Tokyo", "Australia/Sydney", "Asia/Kolkata"]
+
+def _city(rng: random.Random) -> str:
+    return rng.choices(CITIES, CITY_WEIGHTS)[0]
+
+def _past_range(rng: random.Random) -> Dict[str, str]:
+    end = date.today() - timedelta(days=rng.randint(10, 400))
+    return {"start_date": (end - timedelta(days=rng.choice([7, 31, 90]))).isoformat(), "end_date": end.isoformat()}
+
+WORKLOAD: Dict[str, Callable[[random.Random], Dict[str, Any]]] = {
+    "get_current_weather": lambda rng: {"city": _city(rng)},
+    "get_current_weather_batch": lambda rng: {"cities": rng.sample(CITIES, 20)},
+    "get_weather_details": lambda rng: {"city": _city(rng), "forecast_days": rng.choice([1, 3, 7])},
+    "get_weather_by_datetime_range": lambda rng: {"city": _city(rng), **_past_range(rng)},
+    "get_air_quality": lambda rng: {"city": _city(rng)},
+    "get_air_quality_details": lambda rng: {"city": _city(rng), "forecast_days": 2},
+    "get_conditions": lambda rng: {"city": _city(rng)},
+    "get_current_datetime": lambda rng: {"timezone_name": rng.choice(TIMEZONES)},
+    "convert_times": lambda rng: {
+        "times": [f"2024-03-{day:02d}T{hour:02d}:00:00" for day in range(1, 11) for hour in range(0, 24, 3)],
+        "from_timezone": "UTC",
+        "to_timezones": rng.sample(TIMEZONES, 3),
+    },
+}
+
+def percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))] if ordered else float("nan")
+
+async def wait_for_http(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+async def run_tool(session: ClientSession, fake: httpx.AsyncClient, tool: str, calls: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(f"{seed}:{tool}")
+    arguments = [WORKLOAD[tool](rng) for _ in range(calls)]
+    await fake.post("/reset")
+    latencies: List[float] = []
+    failed = 0
+    queue = iter(arguments)
+
+    async def worker():
+        nonlocal failed
+        for args in queue:
+            started = time.perf_counter()
+            try:
+                result = await session.call_tool(tool, args)
+            except Exception:
+                failed += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            failed += bool(result.isError)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    upstream = (await fake.get("/stats")).json()
+    latencies.sort()
+    return {
+        "calls": calls,
+        "failed": failed,
+        "calls_per_second": round(calls / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "upstream_requests": upstream,
+        "upstream_per_call": round(sum(upstream.values()) / calls, 3),
+    }
+
+async def run_session(session: ClientSession, fake_url: str, args) -> Dict[str, Any]:
+    await session.initialize()
+    results = {}
+    async with httpx.AsyncClient(base_url=fake_url) as fake:
+        for tool in args.tools:
+            results[tool] = await run_tool(session, fake, tool, args.calls, args.concurrency, args.seed)
+            print_row(tool, results[tool])
+    return results
+
+async def run_stdio(env: Dict[str, str], fake_url: str, args) -> Dict[str, Any]:
+    params = StdioServerParameters(command=sys.executable, args=["-m", "mcp_weather_plus"], env=env)
+    async with stdio_client(params, errlog=subprocess.DEVNULL) as (read, write):
+        async with ClientSession(read, write) as session:
+            return await run_session(session, fake_url, args)
+
+async def run_http(env: Dict[str, str], fake_url: str, args) -> Dict[str, Any]:
+    command = [sys.executable, "-m", "mcp_weather_plus", "--mode", "streamable-http", "--host", "127.0.0.1",
+               "--port", str(args.port), "--workers", str(args.workers)]
+    if args.stateless:
+        command.append("--stateless")
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        await wait_for_http(f"http://127.0.0.1:{args.port}/metrics")
+        async with streamable_http_client(f"http://127.0.0.1:{args.port}/mcp") as (read, write, _):
+            async with ClientSession(read, write) as session:
+                return await run_session(session, fake_url, args)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def print_row(tool: str, row: Dict[str, Any]):
+    print(
+        f"  {tool:<30} {row['calls_per_second']:>9.1f} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+        f"{row['p99_ms']:>9.2f} {row['failed']:>7} {sum(row['upstream_requests'].values()):>9} {row['upstream_per_call']:>8.3f}"
+    )
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Lists tools that regressed against the baseline by more than `tolerance` (a fraction)."""
+    regressions = []
+    for transport, tools in results.items():
+        for tool, now in tools.items():
+            before = baseline.get(transport, {}).get(tool)
+            if before is None:
+                continue
+            checks = [
+                ("p95_ms", now["p95_ms"] > before["p95_ms"] * (1 + tolerance)),
+                ("calls_per_second", now["calls_per_second"] < before["calls_per_second"] * (1 - tolerance)),
+                ("upstream_per_call", now["upstream_per_call"] > before["upstream_per_call"] * (1 + tolerance) + 0.01),
+            ]
+            regressions.extend(
+                f"{transport} {tool}: {metric} {before[metric]} -> {now[metric]}" for metric, worse in checks if worse
+            )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the MCP server against a local Open-Meteo stand-in")
+    parser.add_argument("--transport", nargs="+", choices=["stdio", "http"], default=["stdio", "http"])
+    parser.add_argument("--tools", nargs="+", choices=list(WORKLOAD), default=list(WORKLOAD))
+    parser.add_argument("--calls", type=int, default=200, help="Calls per tool")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=40.0, help="Fake upstream latency in ms")
+    parser.add_argument("--jitter", type=float, default=20.0, help="Fake upstream latency varies by ± this many ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream requests failing with a 503")
+    parser.add_argument("--workers", type=int, default=1, help="HTTP worker processes")
+    parser.add_argument("--stateless", action="store_true", help="Serve /mcp statelessly")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8790, help="Port of the MCP server in HTTP mode")
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--output", default=None, help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="Earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    fake = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_open_meteo.py"),
+         "--port", str(args.fake_port), "--latency", str(args.latency), "--jitter", str(args.jitter),
+         "--error-rate", str(args.error_rate), "--seed", str(args.seed)],
+    )
+    env = {
+        **os.environ,
+        "WEATHER_MCP_UPSTREAM_BASE_URL": fake_url,
+        "WEATHER_MCP_PREFETCH_ENABLED": "false",
+        "WEATHER_MCP_RATE_LIMIT_PER_SECOND": "0",
+    }
+    runners = {"stdio": run_stdio, "http": run_http}
+    results = {}
+    try:
+        asyncio.run(wait_for_http(f"{fake_url}/stats"))
+        for transport in args.transport:
+            print(f"{transport}:")
+            print(f"  {'tool':<30} {'calls/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'failed':>7} {'upstream':>9} {'per call':>8}")
+            results[transport] = asyncio.run(runners[transport](env, fake_url, args))
+    finally:
+        fake.terminate()
+        fake.wait(timeout=30)
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    meta = {key: getattr(args, key) for key in ("calls", "concurrency", "latency", "jitter", "error_rate", "workers", "stateless", "seed")}
+    meta.update(python=platform.python_version(), machine=platform.machine(), cpus=os.cpu_count(), date=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        differences = [key for key in meta if key != "date" and baseline["meta"].get(key) != meta[key]]
+        if differences:
+            print(f"Note: the baseline was recorded with different {', '.join(differences)}")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Compares the size and encoding time of the tool output formats for a full 16-day
+hourly forecast (every detail variable) and for a 90-day range summary.
+
+    python benchmarks/output_formats.py
+"""
+import timeit
+from mcp_weather_plus.formats import open_meteo_sections, render_sections
+from mcp_weather_plus.models import HourlySeries, RangeSummary
+from mcp_weather_plus.serialization import dumps
+from mcp_weather_plus.services.weather import WeatherService
+
+def forecast_response(hours: int = 16 * 24):
+    hourly = {"time": [f"2024-01-{1 + i // 24:02d}T{i % 24:02d}:00" for i in range(hours)]}
+    for n, name in enumerate(WeatherService.DETAILS_VARIABLES["hourly"]):
+        hourly[name] = [round((i * 7 + n * 13) % 400 / 10, 1) for i in range(hours)]
+    return {"latitude": 51.5, "longitude": -0.15, "utc_offset_seconds": 0, "hourly": hourly}
+
+def report(label: str, text: str, encode, runs: int = 50):
+    seconds = timeit.timeit(encode, number=runs) / runs
+    print(f"{label:<32} {len(text.encode()):>10,} bytes {seconds * 1000:>9.2f} ms")
+
+def main():
+    data = forecast_response()
+    print("get_weather_details, 16 days x 15 hourly variables")
+    report("indented JSON (default)", dumps(data, indent=True), lambda: dumps(data, indent=True))
+    report("json (minified)", dumps(data), lambda: dumps(data))
+    for fmt in ("csv", "tsv"):
+        report(fmt, render_sections(fmt, open_meteo_sections(data)), lambda: render_sections(fmt, open_meteo_sections(data)))
+
+    hours = 90 * 24
+    series = HourlySeries.from_open_meteo({"hourly": {
+        "time": [1704067200 + 3600 * i for i in range(hours)],
+        "temperature_2m": [float(i % 24) for i in range(hours)],
+        "precipitation_probability": [float(i % 100) for i in range(hours)],
+        "wind_speed_10m": [float(i % 30) for i in range(hours)],
+    }})
+    summary = RangeSummary.from_series(series)
+    print("\nget_weather_by_datetime_range, 90 days")
+    report("markdown (default)", summary.to_markdown("Weather"), lambda: summary.to_markdown("Weather"))
+    for fmt in ("json", "csv", "tsv", "kv"):
+        report(fmt, summary.render(fmt), lambda: summary.render(fmt))
+
+if __name__ == "__main__":
+    main()
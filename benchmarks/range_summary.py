@@ -0,0 +1,41 @@
+"""
+Compares the old get_weather_by_datetime_range output (str() of the raw hourly
+response) with the daily summary, for ranges of increasing length.
+
+    python benchmarks/range_summary.py
+"""
+import random
+import timeit
+from mcp_weather_plus.models import HourlySeries, RangeSummary
+
+START = 1704067200
+
+def make_response(days: int) -> dict:
+    hours = 24 * days
+    rng = random.Random(days)
+    return {
+        "utc_offset_seconds": 3600,
+        "hourly": {
+            "time": [START + 3600 * i for i in range(hours)],
+            "temperature_2m": [round(rng.uniform(-5, 30), 1) for _ in range(hours)],
+            "precipitation_probability": [rng.randint(0, 100) for _ in range(hours)],
+            "wind_speed_10m": [round(rng.uniform(0, 40), 1) for _ in range(hours)],
+        },
+    }
+
+def summarize(data: dict) -> str:
+    return RangeSummary.from_series(HourlySeries.from_open_meteo(data)).to_markdown("Weather")
+
+def main():
+    print(f"{'days':>5} {'raw bytes':>10} {'summary bytes':>14} {'raw ms':>8} {'summary ms':>11}")
+    for days in (1, 7, 14, 31, 92, 365):
+        data = make_response(days)
+        runs = 20
+        raw_ms = timeit.timeit(lambda: str(data), number=runs) / runs * 1000
+        summary_ms = timeit.timeit(lambda: summarize(data), number=runs) / runs * 1000
+        raw_size = len(str(data).encode())
+        summary_size = len(summarize(data).encode())
+        print(f"{days:>5} {raw_size:>10} {summary_size:>14} {raw_ms:>8.2f} {summary_ms:>11.2f}")
+
+if __name__ == "__main__":
+    main()
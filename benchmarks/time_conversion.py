@@ -0,0 +1,42 @@
+"""
+Compares the previous pytz-based time conversion with the zoneinfo-based TimeService,
+for single lookups and for converting a batch of times.
+
+    python benchmarks/time_conversion.py      (pytz is in the dev dependency group)
+"""
+import timeit
+from datetime import datetime, timedelta
+import pytz
+from mcp_weather_plus.services.time import TimeService
+
+ZONES = ["Europe/London", "America/New_York", "Asia/Shanghai", "Australia/Sydney"]
+TIMES = [(datetime(2024, 1, 1) + timedelta(hours=7 * i)).isoformat() for i in range(1000)]
+
+def pytz_current(name: str) -> str:
+    return datetime.now(pytz.timezone(name)).isoformat()
+
+def pytz_convert(time_str: str, from_name: str, to_name: str) -> str:
+    from_tz = pytz.timezone(from_name)
+    to_tz = pytz.timezone(to_name)
+    dt = datetime.fromisoformat(time_str)
+    dt = from_tz.localize(dt) if dt.tzinfo is None else dt.astimezone(from_tz)
+    return dt.astimezone(to_tz).isoformat()
+
+def report(label: str, seconds: float, runs: int):
+    print(f"{label:<48} {seconds / runs * 1e6:>10.2f} µs")
+
+def main():
+    service = TimeService()
+    runs = 20000
+    report("get_current_datetime (pytz)", timeit.timeit(lambda: pytz_current("Asia/Shanghai"), number=runs), runs)
+    report("get_current_datetime (zoneinfo)", timeit.timeit(lambda: service.get_current_datetime("Asia/Shanghai"), number=runs), runs)
+    report("convert_time (pytz)", timeit.timeit(lambda: pytz_convert(TIMES[0], "UTC", "Asia/Shanghai"), number=runs), runs)
+    report("convert_time (zoneinfo)", timeit.timeit(lambda: service.convert_time(TIMES[0], "UTC", "Asia/Shanghai"), number=runs), runs)
+
+    runs = 20
+    one_by_one = lambda: [pytz_convert(t, "UTC", zone) for t in TIMES for zone in ZONES]
+    report(f"{len(TIMES)} times x {len(ZONES)} zones, convert_time (pytz)", timeit.timeit(one_by_one, number=runs), runs)
+    report(f"{len(TIMES)} times x {len(ZONES)} zones, convert_times", timeit.timeit(lambda: service.convert_times(TIMES, "UTC", ZONES), number=runs), runs)
+
+if __name__ == "__main__":
+    main()
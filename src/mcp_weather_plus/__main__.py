@@ -1,5 +1,6 @@
 import argparse
 import sys
+from mcp_weather_plus.config import export_settings, update_settings
 from mcp_weather_plus.server import serve
 
 def main():
@@ -17,10 +18,34 @@ def main():
         default=8080,
         help="Port for streamable-http mode (default: 8080)"
     )
+    server_group = parser.add_argument_group("HTTP server (streamable-http mode)")
+    server_group.add_argument("--host", dest="server_host", help="Interface to bind (default: 0.0.0.0)")
+    server_group.add_argument("--workers", dest="server_workers", type=int, help="Number of worker processes (default: 1)")
+    server_group.add_argument("--graceful-timeout", dest="server_graceful_shutdown_timeout", type=float, help="Seconds in-flight requests get to finish on shutdown")
+    server_group.add_argument("--stateless", dest="server_stateless", action="store_true", default=None, help="Serve /mcp without sessions, so requests can go to any worker or replica")
+    server_group.add_argument("--json-response", dest="server_json_response", action="store_true", default=None, help="Answer /mcp requests with JSON instead of SSE streams")
+    server_group.add_argument("--debug", dest="server_debug", action="store_true", default=None, help="Serve debug tracebacks")
+    http_group = parser.add_argument_group("upstream HTTP client (defaults come from WEATHER_MCP_* env vars)")
+    http_group.add_argument("--http-max-connections", type=int, help="Maximum concurrent upstream connections")
+    http_group.add_argument("--http-max-keepalive-connections", type=int, help="Maximum idle connections kept alive")
+    http_group.add_argument("--http-keepalive-expiry", type=float, help="Seconds an idle connection is kept alive")
+    http_group.add_argument("--http2", action="store_true", default=None, help="Use HTTP/2 (requires the 'http2' extra)")
+    http_group.add_argument("--http-connect-timeout", type=float, help="Connect timeout in seconds")
+    http_group.add_argument("--http-read-timeout", type=float, help="Read timeout in seconds")
+    http_group.add_argument("--http-write-timeout", type=float, help="Write timeout in seconds")
+    http_group.add_argument("--http-pool-timeout", type=float, help="Seconds to wait for a free pooled connection")
+    http_group.add_argument("--http-prewarm", action="store_true", default=None, help="Open upstream connections at startup")
     
     args = parser.parse_args()
+    overrides = {
+        name: value for name, value in vars(args).items()
+        if name.startswith(("http", "server_")) and value is not None
+    }
     
     try:
+        if overrides:
+            update_settings(**overrides)
+            export_settings(**overrides)
         serve(mode=args.mode, port=args.port)
     except KeyboardInterrupt:
         sys.exit(0)
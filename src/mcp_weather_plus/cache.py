@@ -0,0 +1,356 @@
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from mcp_weather_plus.config import get_settings
+
+logger = logging.getLogger("weather-mcp")
+
+class CacheBackend(ABC):
+    """
+    Abstract base class for key/value caches with per-entry expiry.
+    Implementations count hits and misses in `hits` / `misses`, and keep
+    expired entries for `stale_ttl` more seconds so they can be served by
+    `get_stale` while the upstream is unavailable.
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    @abstractmethod
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value, or `default` if it is missing or expired."""
+        pass
+
+    @abstractmethod
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value even if it expired less than `stale_ttl` seconds ago."""
+        pass
+
+    @abstractmethod
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """Returns the seconds until a cached value expires, or None if it is missing or expired."""
+        pass
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores a value for `ttl` seconds (the backend default when None)."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """Releases any resources held by the backend."""
+        pass
+
+def _nbytes(value: Any) -> int:
+    """Size counted against a cache's byte budget: the length of bytes values, 0 for anything else."""
+    return len(value) if isinstance(value, (bytes, bytearray, memoryview)) else 0
+
+class TTLCache(CacheBackend):
+    """
+    In-process LRU cache with per-entry expiry, bounded by number of entries and,
+    when `maxbytes` is set, by the total size of its bytes values.
+    Not thread-safe; meant to be used from a single event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0, maxbytes: int = 0):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        now = time.monotonic()
+        if expires_at <= now:
+            # Expired entries stay around (within the LRU bound) for get_stale
+            if expires_at + self.stale_ttl <= now:
+                self.delete(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None or entry[0] + self.stale_ttl <= time.monotonic():
+            return default
+        return entry[1]
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        entry = self._data.get(key)
+        remaining = None if entry is None else entry[0] - time.monotonic()
+        return remaining if remaining is not None and remaining > 0 else None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        size = _nbytes(value)
+        if self.maxbytes and size > self.maxbytes:
+            # Storing it would evict everything else
+            self.delete(key)
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self.delete(key)
+        self._data[key] = (expires_at, value)
+        self.nbytes += size
+        while len(self._data) > self.maxsize or (self.maxbytes and self.nbytes > self.maxbytes):
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.nbytes -= _nbytes(evicted)
+
+    def delete(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.nbytes -= _nbytes(entry[1])
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+class SQLiteCache(CacheBackend):
+    """
+    On-disk cache stored in a SQLite database in WAL mode, so that several
+    processes on the same host can share it. Values must be bytes (stored as is)
+    or JSON-serializable.
+
+    Entries of several caches live in one file, separated by `namespace`.
+    Expiry uses wall-clock time since entries outlive the process that wrote them.
+    When the cache grows past `maxsize` entries (or `maxbytes` of stored values, when
+    set), entries past their stale period and then the oldest entries are removed. While another process holds the database
+    lock for more than _BUSY_TIMEOUT, lookups miss and writes are skipped rather
+    than blocking the event loop.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value BLOB NOT NULL,
+            expires_at REAL NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (namespace, key)
+        ) WITHOUT ROWID
+    """
+    # Eviction runs every N writes rather than on each one to keep writes cheap
+    _EVICT_EVERY = 64
+    # Seconds a query may wait for the lock; queries run on the event loop
+    _BUSY_TIMEOUT = 0.05
+
+    def __init__(self, path: str, namespace: str, maxsize: int, ttl: float, stale_ttl: float = 0, maxbytes: int = 0):
+        self.path = path
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        import sqlite3  # only needed for the sqlite backend
+        self._error = sqlite3.OperationalError
+        # Autocommit mode: every statement is its own short transaction. Setting up the schema
+        # may wait longer for the lock than the queries that follow
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self._SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache (namespace, created_at)")
+        self._conn.execute(f"PRAGMA busy_timeout={int(self._BUSY_TIMEOUT * 1000)}")
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        return key if isinstance(key, str) else json.dumps(key, separators=(",", ":"))
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        # SQLite is dynamically typed: bytes become a BLOB, everything else JSON TEXT
+        return value if isinstance(value, bytes) else json.dumps(value, separators=(",", ":"))
+
+    @staticmethod
+    def _decode_value(stored: Any) -> Any:
+        return stored if isinstance(stored, bytes) else json.loads(stored)
+
+    def _execute(self, sql: str, params: Tuple[Any, ...]) -> Optional[Any]:
+        """Runs a statement, returning None instead of raising when the database stays locked."""
+        try:
+            return self._conn.execute(sql, params)
+        except self._error as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            logger.debug(f"Cache {self.namespace} busy: {e}")
+            return None
+
+    def _fetchone(self, sql: str, params: Tuple[Any, ...]) -> Optional[Tuple[Any, ...]]:
+        cursor = self._execute(sql, params)
+        return None if cursor is None else cursor.fetchone()
+
+    def __len__(self) -> int:
+        row = self._fetchone(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ? AND expires_at > ?", (self.namespace, time.time())
+        )
+        return 0 if row is None else row[0]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        row = self._fetchone(
+            "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (self.namespace, self._encode_key(key), time.time()),
+        )
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return self._decode_value(row[0])
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        row = self._fetchone(
+            "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (self.namespace, self._encode_key(key), time.time() - self.stale_ttl),
+        )
+        return default if row is None else self._decode_value(row[0])
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        now = time.time()
+        row = self._fetchone(
+            "SELECT expires_at FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (self.namespace, self._encode_key(key), now),
+        )
+        return None if row is None else row[0] - now
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        self._execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, created_at) VALUES (?, ?, ?, ?, ?)",
+            (self.namespace, self._encode_key(key), self._encode_value(value), expires_at, now),
+        )
+        self._writes += 1
+        if self._writes % self._EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes entries past their stale period, then the oldest ones until the namespace fits in `maxsize` and `maxbytes`."""
+        self._execute(
+            "DELETE FROM cache WHERE namespace = ? AND expires_at <= ?", (self.namespace, time.time() - self.stale_ttl)
+        )
+        self._execute(
+            """DELETE FROM cache WHERE namespace = ? AND key IN (
+                SELECT key FROM cache WHERE namespace = ? ORDER BY created_at DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.namespace, self.namespace, self.maxsize),
+        )
+        if self.maxbytes:
+            self._execute(
+                """DELETE FROM cache WHERE namespace = ? AND key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(length(value)) OVER (ORDER BY created_at DESC, key) AS total
+                        FROM cache WHERE namespace = ?
+                    ) WHERE total > ?
+                )""",
+                (self.namespace, self.namespace, self.maxbytes),
+            )
+
+    def delete(self, key: Hashable) -> None:
+        self._execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, self._encode_key(key)))
+
+    def clear(self) -> None:
+        self._execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        self._conn.close()
+
+def create_cache(namespace: str, maxsize: int, ttl: float, stale_ttl: float = 0, maxbytes: int = 0) -> CacheBackend:
+    """Creates a cache using the backend selected in the settings."""
+    settings = get_settings()
+    if settings.cache_backend == "sqlite":
+        return SQLiteCache(os.path.expanduser(settings.cache_path), namespace, maxsize, ttl, stale_ttl, maxbytes)
+    return TTLCache(maxsize, ttl, stale_ttl, maxbytes)
+
+def snap_coordinates(lat: float, lon: float) -> Tuple[float, float]:
+    """
+    Snaps coordinates to the configured grid so that nearby locations share
+    upstream requests and cache entries.
+    """
+    resolution = get_settings().grid_resolution
+    if resolution <= 0:
+        return lat, lon
+    # Rounding to 6 decimals removes float noise such as 51.50000000000001
+    return round(round(lat / resolution) * resolution, 6), round(round(lon / resolution) * resolution, 6)
+
+_geocoding_cache: Optional[CacheBackend] = None
+_response_cache: Optional[CacheBackend] = None
+
+def get_geocoding_cache() -> CacheBackend:
+    """
+    Returns the shared geocoding cache.
+    Creates it from the current settings if it doesn't exist.
+    """
+    global _geocoding_cache
+    if _geocoding_cache is None:
+        settings = get_settings()
+        _geocoding_cache = create_cache("geocoding", settings.geocoding_cache_size, settings.geocoding_cache_ttl)
+    return _geocoding_cache
+
+def get_response_cache() -> CacheBackend:
+    """
+    Returns the shared cache of raw upstream response bodies.
+    Creates it from the current settings if it doesn't exist.
+    """
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = create_cache(
+            "responses",
+            settings.response_cache_size,
+            settings.forecast_cache_ttl,
+            settings.stale_cache_ttl,
+            settings.response_cache_max_bytes,
+        )
+    return _response_cache
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Returns hit, miss and entry counts of the shared caches that have been created."""
+    caches = {"geocoding": _geocoding_cache, "responses": _response_cache}
+    return {
+        name: {"hits": cache.hits, "misses": cache.misses, "entries": len(cache)}
+        for name, cache in caches.items() if cache is not None
+    }
+
+def reset_caches() -> None:
+    """Drops all shared caches so they are rebuilt from the current settings."""
+    global _geocoding_cache, _response_cache
+    for cache in (_geocoding_cache, _response_cache):
+        if cache is not None:
+            cache.close()
+    _geocoding_cache = None
+    _response_cache = None
@@ -0,0 +1,108 @@
+import os
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+ENV_PREFIX = "WEATHER_MCP_"
+
+def _default_cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return os.path.join(base, "mcp-weather-plus", "cache.sqlite3")
+
+class Settings(BaseModel):
+    """Runtime settings. Every field can be overridden with a WEATHER_MCP_<FIELD> env var."""
+
+    upstream_base_url: Optional[str] = Field(None, description="Send every Open-Meteo request to this scheme://host[:port] instead, keeping the path (e.g. a local stand-in for load tests)")
+    cache_backend: Literal["memory", "sqlite"] = Field("memory", description="Where geocoding and forecast responses are cached")
+    cache_path: str = Field(default_factory=_default_cache_path, description="SQLite database used by the 'sqlite' cache backend")
+    geocoding_cache_size: int = Field(4096, ge=0, description="Maximum number of cached geocoding results (0 disables the cache)")
+    geocoding_cache_ttl: float = Field(30 * 24 * 3600, gt=0, description="Seconds a resolved city stays cached")
+    geocoding_negative_cache_ttl: float = Field(3600, ge=0, description="Seconds a 'city not found' result stays cached")
+    gazetteer_path: Optional[str] = Field(None, description="Offline geocoding index tried before the geocoding API (see services/gazetteer.py)")
+    response_cache_size: int = Field(2048, ge=0, description="Maximum number of cached forecast/air-quality responses (0 disables the cache)")
+    response_cache_max_bytes: int = Field(64 * 1024 * 1024, ge=0, description="Maximum total size in bytes of cached response bodies (0 means no limit)")
+    grid_resolution: float = Field(0.05, ge=0, description="Coordinates are snapped to this grid (degrees) before requesting data; 0 disables snapping")
+    current_cache_ttl: float = Field(15 * 60, gt=0, description="Seconds a response containing current conditions stays cached")
+    forecast_cache_ttl: float = Field(3600, gt=0, description="Seconds an hourly forecast response stays cached")
+    historical_cache_ttl: float = Field(365 * 24 * 3600, gt=0, description="Seconds a response covering only past dates stays cached")
+    archive_delay_days: int = Field(5, ge=1, description="Days before today after which range queries use the archive API instead of the forecast API")
+    range_max_concurrency: int = Field(4, ge=1, description="Maximum number of concurrent upstream requests for one date range query")
+    range_max_days: int = Field(3660, ge=1, description="Longest date range, in days, that one query may span")
+    batch_chunk_size: int = Field(50, ge=1, description="Locations per upstream request in batch tools")
+    batch_max_cities: int = Field(100, ge=1, description="Maximum number of cities accepted by a batch tool call")
+    range_summary_max_rows: int = Field(62, ge=1, description="Maximum number of rows in a date range summary; longer ranges use wider periods")
+    http_max_connections: int = Field(200, ge=1, description="Maximum number of concurrent upstream connections")
+    http_max_keepalive_connections: int = Field(100, ge=0, description="Maximum number of idle connections kept alive")
+    http_keepalive_expiry: float = Field(30.0, ge=0, description="Seconds an idle connection is kept alive")
+    http2: bool = Field(False, description="Use HTTP/2 to multiplex requests per host (requires the 'http2' extra)")
+    http_connect_timeout: float = Field(5.0, gt=0, description="Seconds to establish an upstream connection")
+    http_read_timeout: float = Field(30.0, gt=0, description="Seconds to wait for upstream response data")
+    http_write_timeout: float = Field(10.0, gt=0, description="Seconds to send request data upstream")
+    http_pool_timeout: float = Field(10.0, gt=0, description="Seconds to wait for a free connection from the pool")
+    http_prewarm: bool = Field(False, description="Open connections to the Open-Meteo hosts at startup")
+    retry_attempts: int = Field(2, ge=0, description="Retries after a failed upstream request (429, 5xx or transport error)")
+    retry_backoff_base: float = Field(0.2, gt=0, description="Base delay in seconds of the jittered exponential backoff")
+    retry_backoff_max: float = Field(5.0, gt=0, description="Longest delay in seconds before a retry, including Retry-After")
+    retry_deadline: float = Field(20.0, gt=0, description="No retry is started once this many seconds have passed")
+    hedge_requests: bool = Field(False, description="Send a second request when the first is slower than the host's p95 latency")
+    hedge_min_delay: float = Field(0.1, ge=0, description="Shortest wait in seconds before a hedged request is sent")
+    circuit_failure_threshold: int = Field(5, ge=1, description="Consecutive upstream failures that open a host's circuit breaker")
+    circuit_reset_timeout: float = Field(30.0, gt=0, description="Seconds an open circuit waits before letting a trial request through")
+    rate_limit_per_second: float = Field(10.0, ge=0, description="Outbound requests per second allowed per upstream host (0 disables rate limiting)")
+    rate_limit_burst: int = Field(20, ge=1, description="Requests that may be sent at once before the rate limit applies")
+    rate_limit_max_queue: int = Field(500, ge=0, description="Requests that may wait for the rate limiter per host before new ones are rejected")
+    rate_limit_max_wait: float = Field(10.0, gt=0, description="Seconds a request may wait for the rate limiter before it is rejected")
+    server_host: str = Field("0.0.0.0", description="Interface the HTTP server binds to")
+    server_workers: int = Field(1, ge=1, description="Worker processes serving HTTP mode; rate limits and prefetch budgets are split between them")
+    server_graceful_shutdown_timeout: float = Field(10.0, ge=0, description="Seconds in-flight HTTP requests get to finish on shutdown")
+    server_stateless: bool = Field(False, description="Handle every streamable HTTP request on its own, without server-side sessions, so any worker or replica can serve it")
+    server_json_response: bool = Field(False, description="Answer streamable HTTP requests with a single JSON body instead of an SSE stream")
+    server_debug: bool = Field(False, description="Serve debug tracebacks from the HTTP server")
+    stale_cache_ttl: float = Field(24 * 3600, ge=0, description="Seconds an expired response may still be served while the upstream fails")
+    prefetch_enabled: bool = Field(False, description="Refresh frequently requested cached responses in the background before they expire")
+    prefetch_interval: float = Field(30.0, gt=0, description="Seconds between prefetch passes")
+    prefetch_refresh_ahead: float = Field(90.0, ge=0, description="Refresh a hot response when it expires within this many seconds")
+    prefetch_min_hits: float = Field(3.0, gt=0, description="Decayed request count from which a response is kept warm")
+    prefetch_max_entries: int = Field(1000, ge=1, description="Maximum number of requests tracked for prefetching")
+    prefetch_budget_per_minute: float = Field(60.0, gt=0, description="Maximum upstream requests per minute spent on prefetching")
+    prefetch_seed_path: Optional[str] = Field(None, description="File with one city per line whose current weather and air quality are kept warm from startup")
+    job_workers: int = Field(4, ge=1, description="Background jobs (submit_job) run concurrently per process")
+    job_max_queue: int = Field(100, ge=1, description="Background jobs that may wait for a worker before submit_job is rejected")
+    job_result_ttl: float = Field(3600.0, gt=0, description="Seconds a finished job's result can be fetched")
+    job_max_results: int = Field(1000, ge=1, description="Maximum number of job results kept")
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        values = {}
+        for name in cls.model_fields:
+            raw = os.environ.get(ENV_PREFIX + name.upper())
+            if raw is not None:
+                values[name] = raw
+        return cls(**values)
+
+_settings: Optional[Settings] = None
+
+def get_settings() -> Settings:
+    """
+    Returns the process-wide settings.
+    Loads them from the environment on first use.
+    """
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
+
+def set_settings(settings: Optional[Settings]) -> None:
+    """Replaces the process-wide settings. Passing None reloads from the environment on next use."""
+    global _settings
+    _settings = settings
+
+def update_settings(**overrides) -> Settings:
+    """Applies overrides (e.g. from command line flags) on top of the current settings."""
+    settings = Settings(**{**get_settings().model_dump(), **overrides})
+    set_settings(settings)
+    return settings
+
+def export_settings(**overrides) -> None:
+    """Sets the WEATHER_MCP_* env vars of the given settings, so that child processes (HTTP workers) load them too."""
+    for name, value in overrides.items():
+        os.environ[ENV_PREFIX + name.upper()] = str(value)
@@ -13,3 +13,23 @@ class GeocodingError(WeatherMcpError):
 class InvalidParameterError(WeatherMcpError):
     """Raised when input parameters are invalid."""
     pass
+
+class UpstreamUnavailableError(ApiError):
+    """Raised without calling the upstream while its circuit breaker is open."""
+    pass
+
+class RateLimitedError(ApiError):
+    """Raised when an upstream request is shed by the outbound rate limiter."""
+    pass
+
+class JobQueueFullError(WeatherMcpError):
+    """Raised when a background job is submitted while the job queue is full."""
+    pass
+
+class JobsUnavailableError(WeatherMcpError):
+    """Raised when a background job is submitted while job results can't be shared between worker processes."""
+    pass
+
+class JobFailedError(WeatherMcpError):
+    """Raised when the result of a background job that failed is requested."""
+    pass
@@ -0,0 +1,143 @@
+"""
+Output formats shared by the tools. Besides each tool's markdown, results can be
+returned as minified JSON, as CSV or TSV (for tabular data such as hourly series, less
+than half the size of indented JSON) or as compact key=value lines, one per record.
+
+Everything except markdown is rendered from a table: a header and rows of values,
+with None for missing values. RecordFormat compiles, once per model, how a record
+becomes a row.
+"""
+import csv
+import io
+import re
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+from mcp_weather_plus.exceptions import InvalidParameterError
+from mcp_weather_plus.metrics import STAGE_DURATION
+from mcp_weather_plus.serialization import dumps
+
+FORMATS = ("markdown", "json", "csv", "tsv", "kv")
+TABLE_FORMATS = ("json", "csv", "tsv", "kv")
+
+_DESCRIPTIONS = {
+    "markdown": "'markdown'",
+    "json": "'json' (minified)",
+    "csv": "'csv'",
+    "tsv": "'tsv'",
+    "kv": "'kv' (key=value lines)",
+}
+_NEEDS_QUOTES = re.compile(r'[\s"=\\]')
+
+def format_schema(formats: Sequence[str] = FORMATS, default: str = "markdown") -> Dict[str, Any]:
+    """JSON schema of the 'format' argument for a tool supporting `formats`."""
+    choices = ", ".join(_DESCRIPTIONS[name] for name in formats)
+    return {"type": "string", "enum": list(formats), "description": f"Output format: {choices}. Default: {default}"}
+
+def _kv_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    text = value if isinstance(value, str) else str(value)
+    # Values with spaces, quotes or '=' are quoted like JSON strings
+    return text if text and not _NEEDS_QUOTES.search(text) else dumps(text)
+
+def _delimited(fmt: str, header: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter="," if fmt == "csv" else "\t", lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+def _cell_texts(column: Sequence[Any]) -> Sequence[Any]:
+    """
+    Text of every cell of a numeric column, from a single JSON encoding of the whole column,
+    which is several times faster than converting each float on its own. Columns holding
+    strings are returned as they are.
+    """
+    text = dumps(column)
+    if not column or '"' in text:
+        return column
+    return text[1:-1].replace("null", "").split(",")
+
+def render_table(fmt: str, header: Sequence[str], rows: Iterable[Sequence[Any]], single: bool = False) -> str:
+    """
+    Renders rows of values under `header` as 'json' (a list of objects, or one object
+    when `single`), 'csv', 'tsv' or 'kv' (one line per row, None values left out).
+    """
+    with STAGE_DURATION.time("encode"):
+        if fmt == "csv" or fmt == "tsv":
+            return _delimited(fmt, header, rows)
+        if fmt == "json":
+            records = [dict(zip(header, row)) for row in rows]
+            return dumps(records[0] if single and records else records)
+        if fmt == "kv":
+            return "\n".join(
+                " ".join(f"{name}={_kv_value(value)}" for name, value in zip(header, row) if value is not None)
+                for row in rows
+            ) + "\n"
+    raise InvalidParameterError(f"Unsupported format: {fmt}")
+
+def render_columns(fmt: str, header: Sequence[str], columns: Sequence[Sequence[Any]], single: bool = False) -> str:
+    """render_table for column-oriented data, such as the hourly block of an Open-Meteo response."""
+    if fmt == "csv" or fmt == "tsv":
+        with STAGE_DURATION.time("encode"):
+            return _delimited(fmt, header, zip(*map(_cell_texts, columns)))
+    return render_table(fmt, header, zip(*columns), single)
+
+Section = Tuple[str, Sequence[str], Sequence[Sequence[Any]]]
+
+def render_sections(fmt: str, sections: Sequence[Section]) -> str:
+    """
+    Renders several (name, header, columns) tables. JSON gives one object keyed by name,
+    where a table of one row becomes an object; the text formats put a '# name' line
+    before each table.
+    """
+    if fmt == "json":
+        result = {}
+        for name, header, columns in sections:
+            rows = list(zip(*columns))
+            result[name] = dict(zip(header, rows[0])) if len(rows) == 1 else [dict(zip(header, row)) for row in rows]
+        with STAGE_DURATION.time("encode"):
+            return dumps(result)
+    return "".join(f"# {name}\n" + render_columns(fmt, header, columns) for name, header, columns in sections)
+
+def open_meteo_sections(data: Dict[str, Any]) -> List[Section]:
+    """Turns the current/hourly/daily blocks of an Open-Meteo response into tables (current is one row)."""
+    sections = []
+    for name in ("current", "hourly", "daily"):
+        block = data.get(name)
+        if block:
+            columns = [[value] for value in block.values()] if name == "current" else list(block.values())
+            sections.append((name, list(block), columns))
+    return sections
+
+class RecordFormat:
+    """
+    How records of one type become table rows, compiled once per model:
+    the field names form the header and a single attrgetter reads a row.
+    """
+
+    __slots__ = ("header", "_row")
+
+    def __init__(self, fields: Sequence[str]):
+        self.header = tuple(fields)
+        getter = attrgetter(*self.header)
+        self._row = getter if len(self.header) > 1 else (lambda record: (getter(record),))
+
+    @classmethod
+    def for_model(cls, model: type) -> "RecordFormat":
+        return cls(list(model.model_fields))
+
+    def row(self, record: Any) -> Tuple[Any, ...]:
+        return self._row(record)
+
+    def render(self, fmt: str, record: Any) -> str:
+        return render_table(fmt, self.header, [self._row(record)], single=True)
+
+    def render_rows(self, fmt: str, rows: Sequence[Tuple[str, Union[Any, str]]], key: str = "city") -> str:
+        """Renders (name, record) rows; a string in place of a record goes into an 'error' column."""
+        missing = (None,) * len(self.header)
+        table = [
+            (name, *missing, record) if isinstance(record, str) else (name, *self._row(record), None)
+            for name, record in rows
+        ]
+        return render_table(fmt, (key, *self.header, "error"), table)
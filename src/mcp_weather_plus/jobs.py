@@ -0,0 +1,222 @@
+import asyncio
+import contextvars
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from mcp_weather_plus.cache import CacheBackend, create_cache
+from mcp_weather_plus.config import Settings, get_settings
+from mcp_weather_plus.exceptions import InvalidParameterError, JobQueueFullError, WeatherMcpError
+
+logger = logging.getLogger("weather-mcp")
+
+JobRunner = Callable[[], Awaitable[List[str]]]
+# Receives (progress, total, message) whenever a job advances; see Job.watch
+ProgressWatcher = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+ACTIVE = ("queued", "running")
+
+# The job whose runner is executing in this context, so services can report progress without it being passed down
+_current_job: contextvars.ContextVar[Optional["Job"]] = contextvars.ContextVar("current_job", default=None)
+
+class Job:
+    """A tool call running in the background. Progress counts finished steps out of a total that may grow."""
+
+    __slots__ = ("id", "tool", "status", "completed", "total", "result", "error", "_finished", "_watchers", "_on_change")
+
+    def __init__(self, tool: str, on_change: Callable[["Job", bool], None]):
+        self.id = uuid.uuid4().hex
+        self.tool = tool
+        self.status = "queued"
+        self.completed = 0
+        self.total = 0
+        self.result: Optional[List[str]] = None
+        self.error: Optional[str] = None
+        self._finished = asyncio.Event()
+        self._watchers: List[ProgressWatcher] = []
+        self._on_change = on_change
+
+    def add_steps(self, count: int) -> None:
+        self.total += count
+        self._on_change(self, False)
+
+    def advance(self) -> None:
+        self.completed += 1
+        self._on_change(self, False)
+
+    def watch(self, watcher: ProgressWatcher) -> None:
+        """Sends progress to `watcher` until the job finishes (e.g. as MCP progress notifications)."""
+        self._watchers.append(watcher)
+
+    def unwatch(self, watcher: ProgressWatcher) -> None:
+        if watcher in self._watchers:
+            self._watchers.remove(watcher)
+
+    def to_record(self) -> Dict[str, Any]:
+        """The job's state as stored for get_job_result: plain JSON-serializable values."""
+        return {
+            "job_id": self.id,
+            "tool": self.tool,
+            "status": self.status,
+            "progress": self.completed,
+            "total": self.total or None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+def _no_progress() -> None:
+    pass
+
+def track_progress(total: int) -> Callable[[], None]:
+    """
+    Adds `total` steps to the running job and returns the function to call as each one
+    finishes. Outside a background job it returns a function that does nothing.
+    """
+    job = _current_job.get()
+    if job is None or total <= 0:
+        return _no_progress
+    job.add_steps(total)
+    return job.advance
+
+class JobManager:
+    """
+    Runs submitted tool calls on up to `workers` tasks, with at most `max_queue` jobs
+    waiting. Job records (including results, once finished) are kept in a cache for
+    `result_ttl` seconds: in memory, or shared by all processes with the sqlite backend.
+    """
+
+    def __init__(self, workers: int, max_queue: int, result_ttl: float, max_results: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.result_ttl = result_ttl
+        self._store: CacheBackend = create_cache("jobs", max_results, result_ttl)
+        self._active: Dict[str, Job] = {}
+        self._queue: "asyncio.Queue[tuple[Job, JobRunner]]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._notifications: set = set()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "JobManager":
+        return cls(settings.job_workers, settings.job_max_queue, settings.job_result_ttl, settings.job_max_results)
+
+    def submit(self, tool: str, run: JobRunner) -> Job:
+        """Queues `run` (a tool call returning its text contents) and returns the new job."""
+        if self._queue.qsize() >= self.max_queue:
+            raise JobQueueFullError(f"Too many background jobs waiting ({self.max_queue}); try again later")
+        job = Job(tool, self._changed)
+        self._active[job.id] = job
+        self._changed(job)
+        self._queue.put_nowait((job, run))
+        self._start_workers()
+        return job
+
+    def _start_workers(self) -> None:
+        # The full pool is started with the first job; idle workers just wait on the queue
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            # A fresh context, so workers don't carry the request context of whichever call started them
+            self._tasks.append(asyncio.create_task(self._work(), context=contextvars.Context()))
+
+    async def _work(self) -> None:
+        while True:
+            job, run = await self._queue.get()
+            job.status = "running"
+            self._changed(job)
+            token = _current_job.set(job)
+            try:
+                job.result = await run()
+                job.status = "done"
+            except WeatherMcpError as e:
+                job.status, job.error = "failed", str(e)
+            except Exception as e:
+                logger.exception(f"Background job {job.id} ({job.tool}) failed")
+                job.status, job.error = "failed", f"Internal error: {e}"
+            finally:
+                _current_job.reset(token)
+                if job.status == "running":  # cancelled
+                    job.status, job.error = "failed", "Cancelled"
+                job.completed = max(job.completed, job.total)
+                self._changed(job)
+                del self._active[job.id]
+                job._watchers.clear()
+                job._finished.set()
+                self._queue.task_done()
+
+    def _changed(self, job: Job, transition: bool = True) -> None:
+        # The store is written when the status changes; progress of running jobs is read from _active
+        if transition:
+            self._store.set(job.id, job.to_record())
+        message = job.status if job.status != "running" else None
+        for watcher in job._watchers:
+            # Watchers are async (they send notifications), while progress is reported synchronously
+            task = asyncio.ensure_future(self._notify(watcher, job.completed, job.total or None, message))
+            self._notifications.add(task)
+            task.add_done_callback(self._notifications.discard)
+
+    async def _notify(self, watcher: ProgressWatcher, progress: float, total: Optional[float], message: Optional[str]) -> None:
+        try:
+            await watcher(progress, total, message)
+        except Exception as e:
+            logger.debug(f"Could not send job progress: {e}")
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        """Returns the record of a job, raising InvalidParameterError if it is unknown or expired."""
+        job = self._active.get(job_id)
+        if job is not None:
+            return job.to_record()
+        record = self._store.get(job_id)
+        if record is None:
+            raise InvalidParameterError(f"Unknown or expired job: {job_id}")
+        return record
+
+    async def wait(self, job_id: str, timeout: float, watcher: Optional[ProgressWatcher] = None) -> Dict[str, Any]:
+        """Waits up to `timeout` seconds for a job of this process to finish, then returns its record."""
+        job = self._active.get(job_id)
+        if job is None:
+            return self.get(job_id)
+        if watcher is not None:
+            job.watch(watcher)
+        try:
+            await asyncio.wait_for(job._finished.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            job.unwatch(watcher)
+        return self.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        counts = {status: 0 for status in ACTIVE}
+        for job in self._active.values():
+            counts[job.status] += 1
+        return counts
+
+    async def close(self) -> None:
+        """Cancels the workers; jobs still running are recorded as failed."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._store.close()
+
+_manager: Optional[JobManager] = None
+
+def get_job_manager() -> JobManager:
+    """Returns the shared job manager, created from the current settings on first use."""
+    global _manager
+    if _manager is None:
+        _manager = JobManager.from_settings(get_settings())
+    return _manager
+
+def get_job_stats() -> Dict[str, int]:
+    """Numbers of queued and running jobs (empty before the first job is submitted)."""
+    return _manager.stats() if _manager is not None else {}
+
+async def close_job_manager() -> None:
+    global _manager
+    if _manager is not None:
+        await _manager.close()
+        _manager = None
+
+def reset_job_manager() -> None:
+    """Drops the shared job manager so it is rebuilt from the current settings."""
+    global _manager
+    _manager = None
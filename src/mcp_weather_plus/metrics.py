@@ -0,0 +1,261 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+from mcp_weather_plus.cache import get_cache_stats
+from mcp_weather_plus.jobs import get_job_stats
+from mcp_weather_plus.ratelimit import get_rate_limiter_stats
+from mcp_weather_plus.resilience import get_circuit_states
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metric(ABC):
+    """Base class of labelled metrics, rendered in the Prometheus text exposition format."""
+
+    TYPE = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, "Metric"] = {}
+
+    def labels(self, *values: str):
+        """Returns the child for one combination of label values (created on first use)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """Returns the value holder of a new child."""
+        pass
+
+    @abstractmethod
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """Yields (suffix, labels, value) for every child."""
+        pass
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(f"{self.name}{suffix}{labels} {_format_value(value)}" for suffix, labels, value in self.samples())
+        return lines
+
+    def clear(self) -> None:
+        self._children.clear()
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+class Counter(Metric):
+    TYPE = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def samples(self):
+        for values, child in self._children.items():
+            yield "", _format_labels(self.labelnames, values), child.value
+
+class Gauge(Counter):
+    TYPE = "gauge"
+
+    @contextmanager
+    def track_in_progress(self, *values: str):
+        child = self.labels(*values)
+        child.inc()
+        try:
+            yield
+        finally:
+            child.dec()
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimates the q-quantile (0-1) as the upper bound of the bucket it falls in."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+class Histogram(Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    @contextmanager
+    def time(self, *values: str):
+        child = self.labels(*values)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            child.observe(time.perf_counter() - started)
+
+    def samples(self):
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                yield "_bucket", _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"'), cumulative
+            labels = _format_labels(self.labelnames, values)
+            yield "_sum", labels, child.sum
+            yield "_count", labels, child.count
+
+class CallbackMetric(Metric):
+    """Metric whose values are read from a callback at scrape time, for state kept elsewhere."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], callback: Callable[[], Dict[LabelValues, float]], type: str = "gauge"):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.TYPE = type
+
+    def _new_child(self):
+        raise TypeError(f"{self.name} is read from a callback; it has no children to update")
+
+    def samples(self):
+        for values, value in self.callback().items():
+            yield "", _format_labels(self.labelnames, values), value
+
+_metrics: List[Metric] = []
+
+def register(metric: Metric) -> Metric:
+    _metrics.append(metric)
+    return metric
+
+def render() -> str:
+    """Returns every registered metric in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def reset_metrics() -> None:
+    for metric in _metrics:
+        metric.clear()
+
+TOOL_DURATION = register(Histogram("weather_mcp_tool_duration_seconds", "Tool call latency", ["tool"]))
+TOOL_IN_FLIGHT = register(Gauge("weather_mcp_tool_in_flight", "Tool calls in progress", ["tool"]))
+TOOL_ERRORS = register(Counter("weather_mcp_tool_errors_total", "Failed tool calls by exception type", ["tool", "error"]))
+TOOL_RESPONSE_BYTES = register(Counter("weather_mcp_tool_response_bytes_total", "Bytes of text returned by tools", ["tool"]))
+UPSTREAM_DURATION = register(Histogram("weather_mcp_upstream_request_duration_seconds", "Upstream request latency", ["host"]))
+UPSTREAM_IN_FLIGHT = register(Gauge("weather_mcp_upstream_in_flight", "Upstream requests in progress", ["host"]))
+UPSTREAM_RESPONSES = register(Counter("weather_mcp_upstream_responses_total", "Upstream responses by status code ('error' for transport errors)", ["host", "status"]))
+UPSTREAM_RESPONSE_BYTES = register(Counter("weather_mcp_upstream_response_bytes_total", "Bytes received from upstreams", ["host"]))
+STAGE_DURATION = register(Histogram("weather_mcp_stage_duration_seconds", "Time spent per processing stage (geocode, decode, encode)", ["stage"]))
+
+def _cache_requests() -> Dict[LabelValues, float]:
+    samples = {}
+    for name, stats in get_cache_stats().items():
+        samples[(name, "hit")] = stats["hits"]
+        samples[(name, "miss")] = stats["misses"]
+    return samples
+
+register(CallbackMetric("weather_mcp_cache_requests_total", "Cache lookups by result", ["cache", "result"], _cache_requests, type="counter"))
+register(CallbackMetric(
+    "weather_mcp_cache_entries", "Entries held per cache", ["cache"],
+    lambda: {(name,): stats["entries"] for name, stats in get_cache_stats().items()},
+))
+register(CallbackMetric(
+    "weather_mcp_rate_limiter_queue_depth", "Requests waiting for the rate limiter", ["host"],
+    lambda: {(host,): stats["queue_depth"] for host, stats in get_rate_limiter_stats().items()},
+))
+register(CallbackMetric(
+    "weather_mcp_rate_limiter_shed_total", "Requests rejected by the rate limiter", ["host"],
+    lambda: {(host,): stats["shed"] for host, stats in get_rate_limiter_stats().items()}, type="counter",
+))
+register(CallbackMetric(
+    "weather_mcp_rate_limiter_acquired_total", "Requests let through by the rate limiter", ["host"],
+    lambda: {(host,): stats["acquired"] for host, stats in get_rate_limiter_stats().items()}, type="counter",
+))
+# Divided by the acquired count, gives the mean time requests waited for a token
+register(CallbackMetric(
+    "weather_mcp_rate_limiter_wait_seconds_total", "Time requests let through spent waiting for the rate limiter", ["host"],
+    lambda: {(host,): stats["wait_seconds_total"] for host, stats in get_rate_limiter_stats().items()}, type="counter",
+))
+register(CallbackMetric(
+    "weather_mcp_rate_limiter_max_wait_seconds", "Longest time a request waited for the rate limiter", ["host"],
+    lambda: {(host,): stats["max_wait_seconds"] for host, stats in get_rate_limiter_stats().items()},
+))
+register(CallbackMetric(
+    "weather_mcp_circuit_open", "1 while a host's circuit breaker is open or half-open", ["host"],
+    lambda: {(host,): float(state != "closed") for host, state in get_circuit_states().items()},
+))
+register(CallbackMetric(
+    "weather_mcp_jobs", "Background jobs queued or running in this process", ["status"],
+    lambda: {(status,): count for status, count in get_job_stats().items()},
+))
+
+def _latency_lines(metric: Histogram) -> List[str]:
+    lines = []
+    for (label,), child in sorted(metric._children.items()):
+        if not child.count:
+            continue
+        p95 = child.quantile(0.95)
+        p95_text = f"<= {p95 * 1000:.0f} ms" if p95 != math.inf else f"> {metric.buckets[-1]:g} s"
+        lines.append(f"  {label}: {child.count} calls, mean {child.sum / child.count * 1000:.1f} ms, p95 {p95_text}")
+    return lines
+
+def summary() -> str:
+    """Short human-readable digest of tool and upstream activity, e.g. for logging at shutdown."""
+    lines = ["Tool calls:", *_latency_lines(TOOL_DURATION), "Upstream requests:", *_latency_lines(UPSTREAM_DURATION)]
+    errors = sorted((labels, child.value) for labels, child in TOOL_ERRORS._children.items() if child.value)
+    if errors:
+        lines.append("Tool errors:")
+        lines.extend(f"  {tool} {error}: {count:.0f}" for (tool, error), count in errors)
+    return "\n".join(lines)
@@ -1,5 +1,11 @@
+import math
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from mcp_weather_plus.formats import RecordFormat, render_table
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 class Coordinates(BaseModel):
     latitude: float = Field(..., ge=-90, le=90, description="Latitude of the location")
@@ -27,6 +33,24 @@ class WeatherForecast(BaseModel):
 - **Visibility**: {self.visibility} m
 """
 
+    @staticmethod
+    def to_markdown_table(rows: List[Tuple[str, Union["WeatherForecast", str]]]) -> str:
+        """Renders (city, forecast) rows as one table; a string in place of a forecast is shown as an error."""
+        lines = [
+            "### Current Weather",
+            "| City | Temperature (°C) | Feels Like (°C) | Humidity (%) | Wind (km/h) | Precipitation (mm) | UV Index |",
+            "| --- | --- | --- | --- | --- | --- | --- |",
+        ]
+        for city, forecast in rows:
+            if isinstance(forecast, str):
+                lines.append(f"| {city} | {forecast} | | | | | |")
+            else:
+                lines.append(
+                    f"| {city} | {forecast.temperature} | {forecast.feels_like} | {forecast.humidity} | "
+                    f"{forecast.wind_speed} | {forecast.precipitation} | {forecast.uv_index} |"
+                )
+        return "\n".join(lines) + "\n"
+
 class AirQualityData(BaseModel):
     aqi: int = Field(..., description="Air Quality Index")
     pm2_5: float = Field(..., description="PM2.5 concentration")
@@ -52,3 +76,231 @@ class AirQualityData(BaseModel):
 - **PM10**: {self.pm10} µg/m³
 - **Ozone**: {self.ozone} µg/m³
 """
+
+    @staticmethod
+    def to_markdown_table(rows: List[Tuple[str, Union["AirQualityData", str]]]) -> str:
+        """Renders (city, air quality) rows as one table; a string in place of data is shown as an error."""
+        lines = [
+            "### Air Quality",
+            "| City | AQI | Level | PM2.5 (µg/m³) | PM10 (µg/m³) | Ozone (µg/m³) |",
+            "| --- | --- | --- | --- | --- | --- |",
+        ]
+        for city, aq in rows:
+            if isinstance(aq, str):
+                lines.append(f"| {city} | {aq} | | | | |")
+            else:
+                lines.append(f"| {city} | {aq.aqi} | {aq.get_aqi_level()} | {aq.pm2_5} | {aq.pm10} | {aq.ozone} |")
+        return "\n".join(lines) + "\n"
+
+# Table serializers, compiled once per model
+WEATHER_FORMAT = RecordFormat.for_model(WeatherForecast)
+AIR_QUALITY_FORMAT = RecordFormat.for_model(AirQualityData)
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _zone(name: Any) -> Optional[tzinfo]:
+    try:
+        return ZoneInfo(name) if isinstance(name, str) and name else None
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+class HourlySeries:
+    """
+    Columnar hourly time series backed by typed arrays.
+    Timestamps are epoch seconds (UTC); missing values are NaN. Local time, used to align
+    aggregation buckets to local midnight, comes from the location's zone `tz` when known,
+    so it follows DST changes; otherwise from the fixed `utc_offset` in seconds.
+    """
+
+    __slots__ = ("timestamps", "columns", "utc_offset", "tz", "_has_nan")
+
+    def __init__(
+        self,
+        timestamps: array,
+        columns: Dict[str, array],
+        utc_offset: int = 0,
+        has_nan: Optional[Dict[str, bool]] = None,
+        tz: Optional[tzinfo] = None,
+    ):
+        self.timestamps = timestamps
+        self.columns = columns
+        self.utc_offset = utc_offset
+        self.tz = tz
+        self._has_nan = has_nan if has_nan is not None else {name: any(v != v for v in col) for name, col in columns.items()}
+
+    @classmethod
+    def from_open_meteo(cls, data: Dict[str, Any]) -> "HourlySeries":
+        """
+        Builds a series from the "hourly" block of an Open-Meteo response.
+        Times may be epoch seconds (timeformat=unixtime, preferred) or local ISO strings.
+        """
+        hourly = data.get("hourly") or {}
+        utc_offset = int(data.get("utc_offset_seconds") or 0)
+        tz = _zone(data.get("timezone"))
+        series = cls(array("q"), {}, utc_offset, {}, tz)
+        times = hourly.get("time") or []
+        if times and isinstance(times[0], str):
+            series.timestamps = array("q", (series._to_utc(int((datetime.fromisoformat(t) - _EPOCH).total_seconds())) for t in times))
+        else:
+            series.timestamps = array("q", times)
+
+        for name, values in hourly.items():
+            if name == "time":
+                continue
+            series._has_nan[name] = None in values
+            series.columns[name] = array("d", [math.nan if v is None else v for v in values] if series._has_nan[name] else values)
+        return series
+
+    def _to_local(self, timestamp: int) -> int:
+        """Epoch seconds to local wall-clock seconds since 1970-01-01T00:00."""
+        if self.tz is None:
+            return timestamp + self.utc_offset
+        return timestamp + int(datetime.fromtimestamp(timestamp, self.tz).utcoffset().total_seconds())
+
+    def _to_utc(self, local: int) -> int:
+        """Local wall-clock seconds to epoch seconds (the earlier reading of an ambiguous time)."""
+        if self.tz is None:
+            return local - self.utc_offset
+        return local - int(self.tz.utcoffset(_EPOCH + timedelta(seconds=local)).total_seconds())
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the timestamp and value arrays."""
+        return sum(a.itemsize * len(a) for a in (self.timestamps, *self.columns.values()))
+
+    def column(self, name: str) -> array:
+        return self.columns[name]
+
+    def slice(self, start: int, end: int) -> "HourlySeries":
+        """Returns the rows with start <= timestamp < end (epoch seconds)."""
+        i = bisect_left(self.timestamps, start)
+        j = bisect_left(self.timestamps, end)
+        return HourlySeries(
+            self.timestamps[i:j],
+            {name: col[i:j] for name, col in self.columns.items()},
+            self.utc_offset,
+            dict(self._has_nan),
+            self.tz,
+        )
+
+    def resample(self, period: int, how: Dict[str, Union[str, Sequence[str]]]) -> "HourlySeries":
+        """
+        Aggregates the series into buckets of `period` seconds aligned to local midnight,
+        e.g. resample(86400, {"temperature_2m": ("min", "max")}). `how` maps column names to
+        one or more of "min", "max", "mean" or "sum"; output columns are named
+        "<column>_<aggregation>". NaN values are ignored; a bucket with no values yields NaN.
+        """
+        funcs = {name: (func,) if isinstance(func, str) else tuple(func) for name, func in how.items()}
+        for name, names in funcs.items():
+            for func in names:
+                if func not in _AGGREGATIONS:
+                    raise ValueError(f"Unknown aggregation '{func}' for column '{name}'")
+        starts = array("q")
+        out: Dict[str, array] = {f"{name}_{func}": array("d") for name, names in funcs.items() for func in names}
+        ts = self.timestamps
+        i = 0
+        while i < len(ts):
+            # Buckets are cut in local time, so a day spanning a DST change has 23 or 25 hours
+            local = (self._to_local(ts[i]) // period) * period
+            j = max(bisect_left(ts, self._to_utc(local + period), i), i + 1)
+            starts.append(self._to_utc(local))
+            for name, names in funcs.items():
+                values = self.columns[name][i:j]
+                if self._has_nan[name]:
+                    values = [v for v in values if v == v]
+                for func in names:
+                    out[f"{name}_{func}"].append(_AGGREGATIONS[func](values) if len(values) else math.nan)
+            i = j
+        return HourlySeries(starts, out, self.utc_offset, tz=self.tz)
+
+    def local_time(self, index: int) -> datetime:
+        """Returns the timestamp of row `index` as a naive datetime in the location's local time."""
+        return _EPOCH + timedelta(seconds=self._to_local(self.timestamps[index]))
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Returns the series as plain lists (NaN as None), with timestamps under "time"."""
+        result: Dict[str, List[Any]] = {"time": self.timestamps.tolist()}
+        for name, col in self.columns.items():
+            result[name] = [None if v != v else v for v in col] if self._has_nan[name] else col.tolist()
+        return result
+
+_AGGREGATIONS = {
+    "min": min,
+    "max": max,
+    "sum": math.fsum,
+    "mean": lambda values: math.fsum(values) / len(values),
+}
+
+class RangeSummary:
+    """
+    Per-period summary of an hourly weather range: min/max temperature, peak
+    precipitation probability and maximum wind speed. The number of rows is capped,
+    so the rendered size doesn't grow with the length of the range.
+    """
+
+    AGGREGATIONS = {
+        "temperature_2m": ("min", "max"),
+        "precipitation_probability": "max",
+        "wind_speed_10m": "max",
+    }
+    COLUMNS = [
+        ("temperature_2m_min", "Min Temp (°C)"),
+        ("temperature_2m_max", "Max Temp (°C)"),
+        ("precipitation_probability_max", "Max Precip. Prob. (%)"),
+        ("wind_speed_10m_max", "Max Wind (km/h)"),
+    ]
+
+    def __init__(self, series: HourlySeries, period: int):
+        self.series = series
+        self.period = period
+
+    @classmethod
+    def from_series(cls, series: HourlySeries, period: int = 86400, max_rows: int = 62) -> "RangeSummary":
+        """
+        Resamples `series` into buckets of `period` seconds. When that would give more
+        than `max_rows` rows, the period is widened to a whole number of periods that fits.
+        """
+        if len(series):
+            span = series.timestamps[-1] - series.timestamps[0] + 3600
+            if span > period * max_rows:
+                period *= -(-span // (period * max_rows))
+        how = {name: func for name, func in cls.AGGREGATIONS.items() if name in series.columns}
+        return cls(series.resample(period, how), period)
+
+    def to_table(self) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        """Returns the header and rows of the summary: local period start (ISO) then one column per aggregate, NaN as None."""
+        series = self.series
+        names = [name for name, _ in self.COLUMNS if name in series.columns]
+        columns = [series.columns[name] for name in names]
+        time_format = "%Y-%m-%d" if self.period % 86400 == 0 else "%Y-%m-%dT%H:%M"
+        rows = [
+            (series.local_time(i).strftime(time_format), *(None if v != v else v for v in values))
+            for i, *values in zip(range(len(series)), *columns)
+        ]
+        return ["time", *names], rows
+
+    def render(self, fmt: str) -> str:
+        """Renders the summary as 'json', 'csv', 'tsv' or 'kv'; see formats.render_table."""
+        header, rows = self.to_table()
+        return render_table(fmt, header, rows)
+
+    def to_markdown(self, title: str) -> str:
+        series = self.series
+        columns = [(name, label) for name, label in self.COLUMNS if name in series.columns]
+        time_format = "%Y-%m-%d" if self.period % 86400 == 0 else "%Y-%m-%d %H:%M"
+        header = "Period" if self.period != 86400 else "Date"
+        lines = [
+            f"### {title}",
+            "| " + " | ".join([header, *(label for _, label in columns)]) + " |",
+            "| " + " | ".join(["---"] * (len(columns) + 1)) + " |",
+        ]
+        for i in range(len(series)):
+            cells = [series.local_time(i).strftime(time_format)]
+            for name, _ in columns:
+                value = series.columns[name][i]
+                cells.append("-" if value != value else f"{value:g}")
+            lines.append("| " + " | ".join(cells) + " |")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,167 @@
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Mapping, Optional
+import httpx
+from mcp_weather_plus.cache import get_response_cache
+from mcp_weather_plus.config import Settings, get_settings
+from mcp_weather_plus.exceptions import WeatherMcpError
+from mcp_weather_plus.ratelimit import TokenBucket
+
+logger = logging.getLogger("weather-mcp")
+
+RefreshFn = Callable[[str, Mapping[str, Any], float], Awaitable[Any]]
+
+# Requests made while this is set (e.g. while loading the seed list) are kept warm regardless of traffic
+_pinned = contextvars.ContextVar("prefetch_pinned", default=False)
+
+class _Entry:
+    __slots__ = ("url", "params", "ttl", "hits", "expires_at", "pinned")
+
+    def __init__(self, url: str, params: Dict[str, Any], ttl: float):
+        self.url = url
+        self.params = params
+        self.ttl = ttl
+        self.hits = 0.0
+        # Unknown until the response is found in the cache or fetched; until then the entry counts as due
+        self.expires_at = 0.0
+        self.pinned = False
+
+class PrefetchScheduler:
+    """
+    Refresh-ahead for the response cache. Cached upstream requests are counted as they are
+    made; requests that are requested often ("hot") are fetched again shortly before their
+    cached response expires, so users don't wait on the upstream. Counts decay on every pass,
+    so locations that stop being requested drop out of the hot set. Refreshes are limited to
+    `budget_per_minute` upstream requests.
+    """
+
+    DECAY = 0.9
+
+    def __init__(self, interval: float, refresh_ahead: float, min_hits: float, max_entries: int, budget_per_minute: float):
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.min_hits = min_hits
+        self.max_entries = max_entries
+        self.entries: Dict[Hashable, _Entry] = {}
+        self._budget = TokenBucket(budget_per_minute / 60, max(1.0, budget_per_minute))
+        self.refreshed = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "PrefetchScheduler":
+        return cls(
+            interval=settings.prefetch_interval,
+            refresh_ahead=settings.prefetch_refresh_ahead,
+            min_hits=settings.prefetch_min_hits,
+            max_entries=settings.prefetch_max_entries,
+            budget_per_minute=settings.prefetch_budget_per_minute / settings.server_workers,
+        )
+
+    def record(self, key: Hashable, url: str, params: Mapping[str, Any], ttl: float) -> None:
+        """Counts one request for a cached upstream response."""
+        entry = self.entries.get(key)
+        if entry is None:
+            if len(self.entries) >= self.max_entries:
+                # Full until the next pass trims cold entries
+                return
+            entry = self.entries[key] = _Entry(url, dict(params), ttl)
+        entry.hits += 1
+        entry.pinned = entry.pinned or _pinned.get()
+        if not entry.expires_at:
+            # The response may already be cached, e.g. fetched by another worker or before the entry was trimmed
+            remaining = get_response_cache().expires_in(key)
+            if remaining is not None:
+                entry.expires_at = time.monotonic() + remaining
+
+    def fetched(self, key: Hashable) -> None:
+        """Notes that a fresh response for `key` was just stored in the cache."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + entry.ttl
+
+    def is_hot(self, entry: _Entry) -> bool:
+        return entry.pinned or entry.hits >= self.min_hits
+
+    def due(self) -> List[_Entry]:
+        """Hot entries whose cached response expires within `refresh_ahead` seconds, hottest first."""
+        deadline = time.monotonic() + self.refresh_ahead
+        due = [entry for entry in self.entries.values() if self.is_hot(entry) and entry.expires_at <= deadline]
+        return sorted(due, key=lambda entry: (not entry.pinned, -entry.hits))
+
+    async def refresh_due(self, refresh: RefreshFn) -> None:
+        """One pass: refreshes what is due within the budget, then decays and trims the counts."""
+        for entry in self.due():
+            if not self._budget.try_take():
+                self.skipped += 1
+                continue
+            try:
+                await refresh(entry.url, entry.params, entry.ttl)
+                self.refreshed += 1
+            except (httpx.HTTPError, WeatherMcpError) as e:
+                logger.warning(f"Prefetch of {entry.url} failed: {e}")
+            except Exception:
+                logger.exception(f"Prefetch of {entry.url} failed")
+
+        for key, entry in list(self.entries.items()):
+            entry.hits *= self.DECAY
+            if not entry.pinned and entry.hits < 0.5:
+                del self.entries[key]
+
+    async def load_seed(self, cities: Iterable[str], warm: Callable[[str], Awaitable[Any]]) -> None:
+        """
+        Runs `warm` for each city, paced by the budget. The cached requests it makes
+        are kept warm from then on, however often they are requested.
+        """
+        token = _pinned.set(True)
+        try:
+            for city in cities:
+                while not self._budget.try_take():
+                    await asyncio.sleep(self._budget.time_until_token())
+                try:
+                    await warm(city)
+                except (httpx.HTTPError, WeatherMcpError) as e:
+                    logger.warning(f"Prefetch seed '{city}' failed: {e}")
+                except Exception:
+                    logger.exception(f"Prefetch seed '{city}' failed")
+        finally:
+            _pinned.reset(token)
+
+    async def run(self, refresh: RefreshFn) -> None:
+        # Nobody awaits this task, so an unexpected error is logged and the next pass runs anyway
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh_due(refresh)
+            except Exception:
+                logger.exception("Prefetch pass failed")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked": len(self.entries),
+            "hot": sum(1 for entry in self.entries.values() if self.is_hot(entry)),
+            "refreshed": self.refreshed,
+            "skipped_over_budget": self.skipped,
+        }
+
+def read_seed_file(path: str) -> List[str]:
+    """Reads one city per line, skipping blank lines and '#' comments."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+_scheduler: Optional[PrefetchScheduler] = None
+
+def get_prefetch_scheduler() -> Optional[PrefetchScheduler]:
+    """Returns the shared scheduler, or None when prefetching is disabled."""
+    global _scheduler
+    settings = get_settings()
+    if not settings.prefetch_enabled:
+        return None
+    if _scheduler is None:
+        _scheduler = PrefetchScheduler.from_settings(settings)
+    return _scheduler
+
+def reset_prefetch_scheduler() -> None:
+    global _scheduler
+    _scheduler = None
@@ -0,0 +1,145 @@
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+from mcp_weather_plus.config import Settings, get_settings
+from mcp_weather_plus.exceptions import RateLimitedError
+
+class Priority(IntEnum):
+    """Queueing priority of an upstream request; lower values are served first."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity` tokens."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self) -> float:
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+class RateLimiter:
+    """
+    Token-bucket limiter for one upstream host with a bounded priority queue.
+    Requests that can't get a token right away wait in the queue, highest priority
+    first. A request is shed with RateLimitedError when the queue is full or when it
+    can't be served within its maximum wait.
+    """
+
+    def __init__(self, host: str, rate: float, burst: int, max_queue: int):
+        self.host = host
+        self.max_queue = max_queue
+        self._bucket = TokenBucket(rate, burst)
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.acquired = 0
+        self.shed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._queue if not future.done())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "acquired": self.acquired,
+            "shed": self.shed,
+            "wait_seconds_total": self.total_wait,
+            "max_wait_seconds": self.max_wait,
+        }
+
+    def _record_wait(self, seconds: float) -> None:
+        self.acquired += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    def _shed(self, reason: str) -> RateLimitedError:
+        self.shed += 1
+        return RateLimitedError(f"Upstream {self.host} is rate limited: {reason}")
+
+    async def acquire(self, priority: Priority = Priority.NORMAL, max_wait: float = 10.0) -> None:
+        """Waits for permission to send one request. Raises RateLimitedError instead of waiting longer than `max_wait`."""
+        if not self._queue and self._bucket.try_take():
+            self._record_wait(0.0)
+            return
+
+        if self.queue_depth >= self.max_queue:
+            raise self._shed("request queue is full")
+        # Everything queued at the same or a higher priority is served first
+        ahead = sum(1 for p, _, future in self._queue if p <= priority and not future.done())
+        estimate = self._bucket.time_until_token() + ahead / self._bucket.rate
+        if estimate > max_wait:
+            raise self._shed(f"estimated wait {estimate:.1f}s exceeds {max_wait:.1f}s")
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._counter), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await asyncio.wait_for(future, timeout=max_wait)
+        except asyncio.TimeoutError:
+            raise self._shed(f"no capacity within {max_wait:.1f}s") from None
+        self._record_wait(time.monotonic() - started)
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            future = self._queue[0][2]
+            if future.done():
+                # Waiter gave up (timeout or cancellation)
+                heapq.heappop(self._queue)
+                continue
+            if not self._bucket.try_take():
+                await asyncio.sleep(self._bucket.time_until_token())
+                continue
+            heapq.heappop(self._queue)
+            future.set_result(None)
+
+_limiters: Dict[str, RateLimiter] = {}
+
+def get_rate_limiter(host: str, settings: Optional[Settings] = None) -> Optional[RateLimiter]:
+    """Returns the limiter for a host, or None when rate limiting is disabled."""
+    settings = settings or get_settings()
+    if settings.rate_limit_per_second <= 0:
+        return None
+    limiter = _limiters.get(host)
+    if limiter is None:
+        # Each worker process gets an equal share of the per-host budget
+        workers = settings.server_workers
+        limiter = _limiters[host] = RateLimiter(
+            host,
+            settings.rate_limit_per_second / workers,
+            max(1, settings.rate_limit_burst // workers),
+            settings.rate_limit_max_queue,
+        )
+    return limiter
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Returns queue depth and wait-time statistics for every upstream host."""
+    return {host: limiter.stats() for host, limiter in _limiters.items()}
+
+def reset_rate_limiters() -> None:
+    _limiters.clear()
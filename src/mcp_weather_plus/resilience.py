@@ -0,0 +1,164 @@
+import asyncio
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+import httpx
+from mcp_weather_plus.config import Settings
+from mcp_weather_plus.exceptions import UpstreamUnavailableError
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+def is_retryable(error: httpx.HTTPError) -> bool:
+    """Transport errors, rate limiting and server errors are worth retrying; other client errors are not."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def retry_delay(attempt: int, error: httpx.HTTPError, settings: Settings) -> Optional[float]:
+    """
+    Returns how long to wait before retry number `attempt` (0-based), or None if the
+    upstream asked us to wait longer than `retry_backoff_max`.
+    Without a Retry-After header this is "full jitter" exponential backoff.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after if retry_after <= settings.retry_backoff_max else None
+    return random.uniform(0, min(settings.retry_backoff_max, settings.retry_backoff_base * 2 ** attempt))
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker. After `failure_threshold` consecutive failures calls
+    fail fast for `reset_timeout` seconds; then a single trial call is let through
+    and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def check(self, host: str) -> bool:
+        """Raises UpstreamUnavailableError unless a call may be made now. Returns True for the half-open trial call."""
+        if self.opened_at is None:
+            return False
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            raise UpstreamUnavailableError(f"Upstream {host} is unavailable (circuit open)")
+        # Half-open: one trial at a time; a trial that never reported back is given up on
+        if self._trial_started is not None and now - self._trial_started < self.reset_timeout:
+            raise UpstreamUnavailableError(f"Upstream {host} is unavailable (circuit half-open)")
+        self._trial_started = now
+        return True
+
+    def abandon_trial(self) -> None:
+        """Lets the next call be the trial, when this one ended without reaching the upstream (e.g. shed or cancelled)."""
+        self._trial_started = None
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_started is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._trial_started = None
+
+class LatencyTracker:
+    """Keeps a window of recent latencies for one host."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Returns the q-th percentile (0-100), or None until enough samples were recorded."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+async def hedged(call: Callable[[], Awaitable[T]], delay: float) -> T:
+    """
+    Runs `call`, and runs it a second time if the first hasn't finished after `delay`
+    seconds. Returns the first successful result and cancels the other attempt.
+    If both fail, the first attempt's error is raised.
+    """
+    first = asyncio.ensure_future(call())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    second = asyncio.ensure_future(call())
+    pending = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        return first.result()
+    finally:
+        for task in (first, second):
+            if not task.done():
+                task.cancel()
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_latencies: Dict[str, LatencyTracker] = {}
+
+def get_circuit_breaker(host: str, settings: Settings) -> CircuitBreaker:
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker(settings.circuit_failure_threshold, settings.circuit_reset_timeout)
+    return breaker
+
+def get_latency_tracker(host: str) -> LatencyTracker:
+    tracker = _latencies.get(host)
+    if tracker is None:
+        tracker = _latencies[host] = LatencyTracker()
+    return tracker
+
+def get_circuit_states() -> Dict[str, str]:
+    """Returns the circuit breaker state ("closed", "open" or "half-open") of every upstream host."""
+    return {host: breaker.state for host, breaker in _breakers.items()}
+
+def reset_resilience_state() -> None:
+    """Forgets all circuit breakers and latency samples."""
+    _breakers.clear()
+    _latencies.clear()
@@ -1,63 +1,151 @@
+import asyncio
+import contextlib
 import logging
-from typing import Optional, Literal
-from mcp.server import Server
-from mcp.server.stdio import stdio_server
-from mcp.server.sse import SseServerTransport
-import mcp.types as types
-from starlette.applications import Starlette
-from starlette.routing import Route, Mount
-import uvicorn
-
-from mcp_weather_plus.tools.weather import WeatherTools
-from mcp_weather_plus.tools.air_quality import AirQualityTools
-from mcp_weather_plus.tools.time import TimeTools
-from mcp_weather_plus.utils import close_http_client
+from typing import TYPE_CHECKING, Optional, Literal
+from mcp_weather_plus.config import get_settings
+
+if TYPE_CHECKING:
+    from mcp.server import Server
+    from mcp_weather_plus.tools.registry import ToolRegistry
+
+# Tools, services and the upstream client (httpx) are imported where they are first
+# used, so importing this module (e.g. to parse the command line) stays cheap
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("weather-mcp")
 
-def create_mcp_server() -> Server:
+def create_mcp_server() -> "Server":
+    from mcp.server import Server
+    import mcp.types as types
+
     server = Server("weather-mcp")
-    
-    # Register tool handlers
-    weather_tools = WeatherTools()
-    aq_tools = AirQualityTools()
-    time_tools = TimeTools()
-    
+    registry: Optional["ToolRegistry"] = None
+
+    def get_registry() -> "ToolRegistry":
+        # Built on the first request, which is when the tools and services get imported
+        nonlocal registry
+        if registry is None:
+            from mcp_weather_plus.tools.registry import create_registry
+
+            registry = create_registry()
+        return registry
+
     @server.list_tools()
     async def handle_list_tools() -> list[types.Tool]:
-        return (
-            weather_tools.get_tools() +
-            aq_tools.get_tools() +
-            time_tools.get_tools()
-        )
+        return get_registry().list_tools()
 
-    # Register tool execution handler
-    @server.call_tool()
+    # Arguments are checked by the registry's precompiled validators, so the
+    # per-call jsonschema validation of the MCP server is turned off
+    @server.call_tool(validate_input=False)
     async def handle_call_tool(name: str, arguments: dict):
-        if name in ["get_current_weather", "get_weather_by_datetime_range", "get_weather_details"]:
-            return await weather_tools.handle_call(name, arguments)
-        elif name in ["get_air_quality", "get_air_quality_details"]:
-            return await aq_tools.handle_call(name, arguments)
-        elif name in ["get_current_datetime", "get_timezone_info", "convert_time"]:
-            return await time_tools.handle_call(name, arguments)
-        else:
-            raise ValueError(f"Unknown tool: {name}")
+        return await get_registry().call(name, arguments)
 
     return server
 
+def start_warm_up() -> Optional[asyncio.Task]:
+    """Pre-warms upstream connections in the background when enabled, so startup isn't delayed."""
+    if not get_settings().http_prewarm:
+        return None
+    from mcp_weather_plus.services.air_quality import AirQualityService
+    from mcp_weather_plus.services.weather import WeatherService
+    from mcp_weather_plus.upstream import upstream_url
+    from mcp_weather_plus.utils import warm_up_http_client
+
+    urls = [WeatherService.GEOCODING_URL, WeatherService.WEATHER_URL, AirQualityService.AIR_QUALITY_URL]
+    return asyncio.create_task(warm_up_http_client([upstream_url(url) for url in urls]))
+
+async def _warm_city(city: str) -> None:
+    from mcp_weather_plus.services.air_quality import AirQualityService
+    from mcp_weather_plus.services.weather import WeatherService
+
+    weather = WeatherService()
+    coords = await weather.get_coordinates(city)
+    await asyncio.gather(
+        weather.get_current_weather(coords.latitude, coords.longitude),
+        AirQualityService().get_air_quality(coords.latitude, coords.longitude),
+    )
+
+def start_prefetch() -> Optional[asyncio.Task]:
+    """Starts the background refresh-ahead scheduler, after loading the seed list, when prefetching is enabled."""
+    from mcp_weather_plus.prefetch import get_prefetch_scheduler, read_seed_file
+    from mcp_weather_plus.upstream import refresh_raw
+
+    scheduler = get_prefetch_scheduler()
+    if scheduler is None:
+        return None
+    seed_path = get_settings().prefetch_seed_path
+
+    async def _run():
+        if seed_path:
+            try:
+                cities = read_seed_file(seed_path)
+            except OSError as e:
+                logger.warning(f"Could not read prefetch seed list {seed_path}: {e}")
+            else:
+                await scheduler.load_seed(cities, _warm_city)
+        await scheduler.run(refresh_raw)
+
+    return asyncio.create_task(_run())
+
+async def _close_background(background: list) -> None:
+    """Stops the background tasks, the job workers and the upstream client."""
+    from mcp_weather_plus.jobs import close_job_manager
+    from mcp_weather_plus.utils import close_http_client
+
+    for task in background:
+        task.cancel()
+    await close_job_manager()
+    await close_http_client()
+
 async def run_stdio_server():
+    from mcp.server.stdio import stdio_server
+    from mcp_weather_plus import metrics
+
     server = create_mcp_server()
+    background = [task for task in (start_warm_up(), start_prefetch()) if task]
     async with stdio_server() as (read_stream, write_stream):
         try:
             await server.run(read_stream, write_stream, server.create_initialization_options())
         finally:
-            await close_http_client()
+            await _close_background(background)
+            # stdio has no /metrics route, so leave a digest in the log (stderr) instead
+            logger.info("Session metrics:\n" + metrics.summary())
 
-async def run_http_server(port: int = 8080):
+class _StreamableHTTPEndpoint:
+    """ASGI endpoint handing /mcp requests to the session manager (a class, so Starlette routes raw ASGI to it)."""
+
+    def __init__(self, session_manager):
+        self.session_manager = session_manager
+
+    async def __call__(self, scope, receive, send):
+        await self.session_manager.handle_request(scope, receive, send)
+
+def create_http_app():
+    """
+    ASGI app factory for HTTP mode. uvicorn calls it once in every worker process;
+    background tasks and the upstream client live and die with the app's lifespan.
+
+    Serves the streamable HTTP transport at /mcp and, for older clients and a single
+    worker only, the SSE transport at /sse + /messages. Metrics at /metrics are those of
+    the worker that answers the request.
+    """
+    # The HTTP stack is only needed in this mode, so stdio sessions don't import it
+    from mcp.server.sse import SseServerTransport
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Route
+    from mcp_weather_plus import metrics
+
+    settings = get_settings()
     server = create_mcp_server()
     sse = SseServerTransport("/messages")
+    session_manager = StreamableHTTPSessionManager(
+        app=server,
+        stateless=settings.server_stateless,
+        json_response=settings.server_json_response,
+    )
 
     async def handle_sse(request):
         async with sse.connect_sse(
@@ -70,27 +158,74 @@ async def run_http_server(port: int = 8080):
     async def handle_messages(request):
         await sse.handle_post_message(request.scope, request.receive, request._send)
 
-    app = Starlette(
-        debug=True,
-        routes=[
+    async def handle_metrics(request):
+        return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        background = [task for task in (start_warm_up(), start_prefetch()) if task]
+        try:
+            async with session_manager.run():
+                yield
+        finally:
+            await _close_background(background)
+
+    routes = [
+        Route("/mcp", endpoint=_StreamableHTTPEndpoint(session_manager)),
+        Route("/metrics", endpoint=handle_metrics),
+    ]
+    # An SSE stream and its POSTs must reach the same process, which several workers can't ensure
+    if settings.server_workers == 1:
+        routes += [
             Route("/sse", endpoint=handle_sse),
             Route("/messages", endpoint=handle_messages, methods=["POST"]),
-        ],
+        ]
+    return Starlette(debug=settings.server_debug, routes=routes, lifespan=lifespan)
+
+def _uvicorn_options(port: int) -> dict:
+    settings = get_settings()
+    return dict(
+        host=settings.server_host,
+        port=port,
+        # uvloop and httptools are used when installed (e.g. via uvicorn[standard])
+        loop="auto",
+        http="auto",
+        timeout_graceful_shutdown=settings.server_graceful_shutdown_timeout,
+        log_level="info",
     )
 
-    config = uvicorn.Config(app, host="0.0.0.0", port=port, log_level="info")
-    server_instance = uvicorn.Server(config)
-    
-    try:
-        await server_instance.serve()
-    finally:
-        await close_http_client()
+async def run_http_server(port: int = 8080):
+    """Serves HTTP mode from the current process and event loop."""
+    import uvicorn
+
+    config = uvicorn.Config(create_http_app(), **_uvicorn_options(port))
+    await uvicorn.Server(config).serve()
+
+def run_http_workers(port: int = 8080):
+    """Serves HTTP mode from `server_workers` processes sharing one listening socket."""
+    import uvicorn
+
+    settings = get_settings()
+    workers = settings.server_workers
+    if not settings.server_stateless:
+        logger.warning(
+            "Sessions are bound to the worker that opened them; with several workers a client's "
+            "requests may reach a different one. Use --stateless for /mcp (SSE is turned off with several workers)"
+        )
+    if settings.cache_backend != "sqlite":
+        logger.error(
+            "Background jobs are turned off: with several workers their results must be shared "
+            "through WEATHER_MCP_CACHE_BACKEND=sqlite"
+        )
+    uvicorn.run("mcp_weather_plus.server:create_http_app", factory=True, workers=workers, **_uvicorn_options(port))
 
 def serve(mode: Literal["stdio", "streamable-http"] = "stdio", port: int = 8080):
-    import asyncio
     if mode == "stdio":
         asyncio.run(run_stdio_server())
     elif mode == "streamable-http":
-        asyncio.run(run_http_server(port))
+        if get_settings().server_workers > 1:
+            run_http_workers(port)
+        else:
+            asyncio.run(run_http_server(port))
     else:
         raise ValueError(f"Unknown mode: {mode}")
@@ -1,28 +1,70 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 import httpx
-from mcp_weather_plus.utils import get_http_client
+from mcp_weather_plus.upstream import fetch_json, fetch_raw
+from mcp_weather_plus.serialization import loads
+from mcp_weather_plus.ratelimit import Priority
+from mcp_weather_plus.cache import snap_coordinates
+from mcp_weather_plus.config import get_settings
+from mcp_weather_plus.utils import check_range, chunked, select_variables
 from mcp_weather_plus.exceptions import ApiError
-from mcp_weather_plus.models import AirQualityData
+from mcp_weather_plus.jobs import track_progress
+from mcp_weather_plus.models import AirQualityData, Coordinates
 
 class AirQualityService:
     AIR_QUALITY_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
+    DETAILS_VARIABLES = {
+        "current": ["us_aqi", "pm10", "pm2_5", "ozone", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide", "european_aqi"],
+        "hourly": ["pm10", "pm2_5", "ozone", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide", "us_aqi", "european_aqi"],
+    }
+    CURRENT_VARIABLES = ["us_aqi", "pm10", "pm2_5", "ozone", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide"]
 
     async def get_air_quality(self, lat: float, lon: float) -> AirQualityData:
-        client = get_http_client()
+        lat, lon = snap_coordinates(lat, lon)
         params = {
             "latitude": lat,
             "longitude": lon,
-            "current": ["us_aqi", "pm10", "pm2_5", "ozone", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide"],
+            "current": self.CURRENT_VARIABLES,
             "timezone": "auto"
         }
         
         try:
-            response = await client.get(self.AIR_QUALITY_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = await fetch_json(self.AIR_QUALITY_URL, params=params, ttl=get_settings().current_cache_ttl, priority=Priority.INTERACTIVE)
         except httpx.HTTPError as e:
             raise ApiError(f"Air Quality API failed: {str(e)}") from e
 
+        return self._parse_air_quality(data)
+
+    async def get_air_quality_batch(self, locations: List[Coordinates]) -> List[AirQualityData]:
+        """
+        Fetches current air quality for many locations using multi-location requests,
+        one request per chunk of locations. Results are returned in the order of `locations`.
+        """
+        settings = get_settings()
+        points = [snap_coordinates(c.latitude, c.longitude) for c in locations]
+
+        async def fetch_chunk(chunk: List[Tuple[float, float]]) -> List[AirQualityData]:
+            params = {
+                "latitude": ",".join(str(lat) for lat, _ in chunk),
+                "longitude": ",".join(str(lon) for _, lon in chunk),
+                "current": self.CURRENT_VARIABLES,
+                "timezone": "auto"
+            }
+            try:
+                data = await fetch_json(self.AIR_QUALITY_URL, params=params, ttl=settings.current_cache_ttl)
+            except httpx.HTTPError as e:
+                raise ApiError(f"Air Quality API failed: {str(e)}") from e
+            step()
+            results = data if isinstance(data, list) else [data]
+            return [self._parse_air_quality(item) for item in results]
+
+        batches = list(chunked(points, settings.batch_chunk_size))
+        step = track_progress(len(batches))
+        chunks = await asyncio.gather(*(fetch_chunk(chunk) for chunk in batches))
+        return [aq for chunk in chunks for aq in chunk]
+
+    @staticmethod
+    def _parse_air_quality(data: Dict[str, Any]) -> AirQualityData:
         current = data["current"]
         
         return AirQualityData(
@@ -35,19 +77,46 @@ class AirQualityService:
             sulphur_dioxide=current["sulphur_dioxide"]
         )
 
-    async def get_air_quality_details(self, lat: float, lon: float) -> Dict[str, Any]:
-        client = get_http_client()
-        params = {
+    async def get_air_quality_details(
+        self,
+        lat: float,
+        lon: float,
+        variables: Optional[List[str]] = None,
+        forecast_days: Optional[int] = None,
+        forecast_hours: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Returns the decoded air quality response; see get_air_quality_details_raw."""
+        return loads(await self.get_air_quality_details_raw(lat, lon, variables, forecast_days, forecast_hours))
+
+    async def get_air_quality_details_raw(
+        self,
+        lat: float,
+        lon: float,
+        variables: Optional[List[str]] = None,
+        forecast_days: Optional[int] = None,
+        forecast_hours: Optional[int] = None,
+    ) -> bytes:
+        """
+        Returns the air quality response body exactly as sent by the upstream, so it can be
+        passed through without re-encoding. `variables` restricts the current/hourly/daily
+        blocks to the named variables; `forecast_days` and `forecast_hours` shorten the
+        forecast horizon, so less data is fetched and serialized.
+        """
+        lat, lon = snap_coordinates(lat, lon)
+        settings = get_settings()
+        params: Dict[str, Any] = {
             "latitude": lat,
             "longitude": lon,
-            "current": ["us_aqi", "pm10", "pm2_5", "ozone", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide", "european_aqi"],
-            "hourly": ["pm10", "pm2_5", "ozone", "carbon_monoxide", "nitrogen_dioxide", "sulphur_dioxide", "us_aqi", "european_aqi"],
+            **select_variables(self.DETAILS_VARIABLES, variables),
             "timezone": "auto"
         }
+        if forecast_days is not None:
+            params["forecast_days"] = check_range("forecast_days", forecast_days, 1, 7)
+        if forecast_hours is not None:
+            params["forecast_hours"] = check_range("hours", forecast_hours, 1, 168)
+        ttl = settings.current_cache_ttl if "current" in params else settings.forecast_cache_ttl
         
         try:
-            response = await client.get(self.AIR_QUALITY_URL, params=params)
-            response.raise_for_status()
-            return response.json()
+            return await fetch_raw(self.AIR_QUALITY_URL, params=params, ttl=ttl, priority=Priority.BULK)
         except httpx.HTTPError as e:
             raise ApiError(f"Air Quality API failed: {str(e)}") from e
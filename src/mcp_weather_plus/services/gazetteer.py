@@ -0,0 +1,177 @@
+"""
+Offline geocoding from a local gazetteer index.
+
+The index is built from a GeoNames-style CSV with:
+
+    python -m mcp_weather_plus.services.gazetteer cities.csv gazetteer.idx --min-population 15000
+
+and enabled by pointing WEATHER_MCP_GAZETTEER_PATH at the generated file.
+
+Index layout (little-endian):
+    header   magic (8 bytes), record count (u32)
+    records  count x (key offset u32, key length u16, latitude f64, longitude f64), sorted by key
+    keys     UTF-8 encoded normalized names, concatenated
+"""
+import argparse
+import csv
+import logging
+import mmap
+import struct
+import sys
+import unicodedata
+from typing import Dict, Iterator, List, Optional, Tuple
+from mcp_weather_plus.config import get_settings
+from mcp_weather_plus.models import Coordinates
+
+logger = logging.getLogger("weather-mcp")
+
+MAGIC = b"MWPGAZ01"
+_HEADER = struct.Struct("<8sI")
+_RECORD = struct.Struct("<IHdd")
+
+def normalize_place_name(name: str) -> str:
+    """Normalizes a place name for index lookups: accents stripped, case-folded, whitespace collapsed."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split()).casefold()
+
+class Gazetteer:
+    """Read-only, memory-mapped gazetteer index supporting exact and prefix lookups."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            self._mm.close()
+            raise ValueError(f"Not a gazetteer index: {path}")
+        magic, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a gazetteer index: {path}")
+        self._records_offset = _HEADER.size
+        self._keys_offset = self._records_offset + self._count * _RECORD.size
+        if len(self._mm) < self._keys_offset:
+            self._mm.close()
+            raise ValueError(f"Truncated gazetteer index: {path}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _record(self, index: int) -> Tuple[bytes, float, float]:
+        key_offset, key_length, lat, lon = _RECORD.unpack_from(self._mm, self._records_offset + index * _RECORD.size)
+        start = self._keys_offset + key_offset
+        return self._mm[start:start + key_length], lat, lon
+
+    def _bisect(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, name: str) -> Optional[Coordinates]:
+        """Returns the coordinates of an exact (normalized) name or alias match."""
+        key = normalize_place_name(name).encode("utf-8")
+        index = self._bisect(key)
+        if index < self._count:
+            found, lat, lon = self._record(index)
+            if found == key:
+                return Coordinates(latitude=lat, longitude=lon)
+        return None
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[Tuple[str, Coordinates]]:
+        """Returns up to `limit` (normalized name, coordinates) pairs whose name starts with `prefix`."""
+        key = normalize_place_name(prefix).encode("utf-8")
+        results = []
+        index = self._bisect(key)
+        while index < self._count and len(results) < limit:
+            found, lat, lon = self._record(index)
+            if not found.startswith(key):
+                break
+            results.append((found.decode("utf-8"), Coordinates(latitude=lat, longitude=lon)))
+            index += 1
+        return results
+
+def _read_places(path: str, min_population: int) -> Iterator[Tuple[List[str], float, float, int]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            population = int(row.get("population") or 0)
+            if population < min_population:
+                continue
+            names = [row["name"], row.get("asciiname") or ""]
+            names.extend((row.get("alternatenames") or "").split(","))
+            yield names, float(row["latitude"]), float(row["longitude"]), population
+
+def build_index(csv_path: str, index_path: str, min_population: int = 0) -> int:
+    """
+    Builds an index file from a CSV with `name`, `latitude` and `longitude` columns and
+    optional `asciiname`, `alternatenames` (comma-separated aliases) and `population`.
+    When several places share a name, the most populous one wins.
+    Returns the number of indexed names.
+    """
+    best: Dict[bytes, Tuple[int, float, float]] = {}
+    for names, lat, lon, population in _read_places(csv_path, min_population):
+        for name in names:
+            key = normalize_place_name(name).encode("utf-8")
+            if key and (key not in best or population > best[key][0]):
+                best[key] = (population, lat, lon)
+
+    keys = sorted(best)
+    records = bytearray()
+    blob = bytearray()
+    for key in keys:
+        _, lat, lon = best[key]
+        records += _RECORD.pack(len(blob), len(key), lat, lon)
+        blob += key
+
+    with open(index_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(keys)))
+        f.write(records)
+        f.write(blob)
+    return len(keys)
+
+_gazetteer: Optional[Gazetteer] = None
+_unusable_path: Optional[str] = None
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """
+    Returns the gazetteer configured in the settings, or None when offline geocoding is disabled
+    or the index can't be opened.
+    """
+    global _gazetteer, _unusable_path
+    path = get_settings().gazetteer_path
+    if not path or path == _unusable_path:
+        return None
+    if _gazetteer is None or _gazetteer.path != path:
+        try:
+            _gazetteer = Gazetteer(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Offline geocoding disabled: {e}")
+            _unusable_path = path
+            return None
+    return _gazetteer
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an offline geocoding index from a GeoNames-style CSV")
+    parser.add_argument("csv_path", help="Input CSV (name, latitude, longitude[, asciiname, alternatenames, population])")
+    parser.add_argument("index_path", help="Output index file")
+    parser.add_argument(
+        "--min-population",
+        type=int,
+        default=0,
+        help="Skip places with a smaller population (default: 0)"
+    )
+
+    args = parser.parse_args()
+    count = build_index(args.csv_path, args.index_path, args.min_population)
+    print(f"Indexed {count} names into {args.index_path}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,85 @@
-from datetime import datetime
-import pytz
-from typing import Dict, Any
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Dict, Any, List
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
 from mcp_weather_plus.exceptions import InvalidParameterError
 
+@lru_cache(maxsize=1)
+def _zone_names() -> Dict[str, str]:
+    """Canonical IANA names by their case-folded form, built on the first miss."""
+    return {name.casefold(): name for name in available_timezones()}
+
+@lru_cache(maxsize=1024)
+def _load_zone(timezone_name: str) -> tzinfo:
+    try:
+        return ZoneInfo(timezone_name)
+    except ZoneInfoNotFoundError:
+        # ZoneInfo is case-sensitive; names such as 'asia/shanghai' are accepted as before
+        canonical = _zone_names().get(timezone_name.casefold())
+        if canonical is None:
+            raise
+        return ZoneInfo(canonical)
+
+def get_zone(timezone_name: str) -> tzinfo:
+    """Returns the (memoized) zone for an IANA name, raising InvalidParameterError for unknown names."""
+    try:
+        return _load_zone(timezone_name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        raise InvalidParameterError(f"Unknown timezone: {timezone_name}") from None
+
 class TimeService:
+    MAX_BATCH_TIMES = 1000
+
     def get_current_datetime(self, timezone_name: str) -> str:
-        try:
-            tz = pytz.timezone(timezone_name)
-            return datetime.now(tz).isoformat()
-        except pytz.UnknownTimeZoneError:
-            raise InvalidParameterError(f"Unknown timezone: {timezone_name}")
+        return datetime.now(get_zone(timezone_name)).isoformat()
 
     def get_timezone_info(self, timezone_name: str) -> Dict[str, Any]:
-        try:
-            tz = pytz.timezone(timezone_name)
-            now = datetime.now(tz)
-            return {
-                "timezone": timezone_name,
-                "offset": now.strftime("%z"),
-                "is_dst": bool(now.dst()),
-                "name": now.tzname()
-            }
-        except pytz.UnknownTimeZoneError:
-            raise InvalidParameterError(f"Unknown timezone: {timezone_name}")
+        now = datetime.now(get_zone(timezone_name))
+        return {
+            "timezone": timezone_name,
+            "offset": now.strftime("%z"),
+            "is_dst": bool(now.dst()),
+            "name": now.tzname()
+        }
 
     def convert_time(self, time_str: str, from_timezone: str, to_timezone: str) -> str:
+        from_tz = get_zone(from_timezone)
+        to_tz = get_zone(to_timezone)
+        # Parse time string. Assume ISO format.
         try:
-            from_tz = pytz.timezone(from_timezone)
-            to_tz = pytz.timezone(to_timezone)
-            
-            # Parse time string. Assume ISO format.
-            try:
-                dt = datetime.fromisoformat(time_str)
-            except ValueError:
-                raise InvalidParameterError(f"Invalid time format: {time_str}. Expected ISO format.")
+            dt = datetime.fromisoformat(time_str)
+        except ValueError:
+            raise InvalidParameterError(f"Invalid time format: {time_str}. Expected ISO format.")
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=from_tz)
+        return dt.astimezone(to_tz).isoformat()
 
+    def convert_times(self, times: List[str], from_timezone: str, to_timezones: List[str]) -> List[Dict[str, str]]:
+        """
+        Converts each ISO time (naive times are read in `from_timezone`) into every target zone.
+        Returns one {"time": ..., <zone>: ...} row per input; a time that can't be parsed
+        gets an "error" entry instead, so one bad value doesn't fail the whole batch.
+        """
+        if not times or not to_timezones:
+            raise InvalidParameterError("'times' and 'to_timezones' must be non-empty lists")
+        if len(times) > self.MAX_BATCH_TIMES:
+            raise InvalidParameterError(f"At most {self.MAX_BATCH_TIMES} times can be converted at once")
+        # Resolve every zone once, up front, so the loop below only converts
+        from_tz = get_zone(from_timezone)
+        targets = [(name, get_zone(name)) for name in to_timezones]
+
+        parse = datetime.fromisoformat
+        rows: List[Dict[str, str]] = []
+        for time_str in times:
+            try:
+                dt = parse(time_str)
+            except (TypeError, ValueError):
+                rows.append({"time": time_str, "error": "Invalid time format. Expected ISO format."})
+                continue
             if dt.tzinfo is None:
-                dt = from_tz.localize(dt)
-            else:
-                dt = dt.astimezone(from_tz)
-                
-            return dt.astimezone(to_tz).isoformat()
-        except pytz.UnknownTimeZoneError as e:
-            raise InvalidParameterError(f"Unknown timezone: {str(e)}")
+                dt = dt.replace(tzinfo=from_tz)
+            row = {"time": time_str}
+            for name, tz in targets:
+                row[name] = dt.astimezone(tz).isoformat()
+            rows.append(row)
+        return rows
@@ -1,45 +1,137 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
 import httpx
-from mcp_weather_plus.utils import get_http_client
-from mcp_weather_plus.exceptions import ApiError, GeocodingError
-from mcp_weather_plus.models import Coordinates, WeatherForecast
+from mcp_weather_plus.utils import check_range, chunked, normalize_city_name, select_variables
+from mcp_weather_plus.upstream import fetch_json, fetch_raw
+from mcp_weather_plus.serialization import loads
+from mcp_weather_plus.ratelimit import Priority
+from mcp_weather_plus.metrics import STAGE_DURATION
+from mcp_weather_plus.cache import get_geocoding_cache, snap_coordinates
+from mcp_weather_plus.config import get_settings
+from mcp_weather_plus.services.gazetteer import get_gazetteer
+from mcp_weather_plus.exceptions import ApiError, GeocodingError, InvalidParameterError, WeatherMcpError
+from mcp_weather_plus.jobs import track_progress
+from mcp_weather_plus.models import Coordinates, HourlySeries, WeatherForecast
+
+_MISSING = object()
 
 class WeatherService:
     GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
     WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
+    ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+    DETAILS_VARIABLES = {
+        "current": ["temperature_2m", "relative_humidity_2m", "apparent_temperature", "is_day", "precipitation", "rain", "showers", "snowfall", "weather_code", "cloud_cover", "pressure_msl", "surface_pressure", "wind_speed_10m", "wind_direction_10m", "wind_gusts_10m", "visibility"],
+        "hourly": ["temperature_2m", "relative_humidity_2m", "dew_point_2m", "apparent_temperature", "precipitation_probability", "precipitation", "weather_code", "pressure_msl", "surface_pressure", "cloud_cover", "visibility", "wind_speed_10m", "wind_direction_10m", "wind_gusts_10m", "uv_index"],
+        "daily": ["weather_code", "temperature_2m_max", "temperature_2m_min", "apparent_temperature_max", "apparent_temperature_min", "sunrise", "sunset", "uv_index_max", "precipitation_sum", "rain_sum", "showers_sum", "snowfall_sum", "precipitation_hours", "precipitation_probability_max"],
+    }
+    RANGE_VARIABLES = ["temperature_2m", "precipitation_probability", "wind_speed_10m"]
+    ARCHIVE_VARIABLES = ["temperature_2m", "wind_speed_10m"]
+    CURRENT_VARIABLES = ["temperature_2m", "relative_humidity_2m", "apparent_temperature", "precipitation", "weather_code", "wind_speed_10m", "wind_direction_10m", "visibility"]
 
     async def get_coordinates(self, city: str) -> Coordinates:
-        client = get_http_client()
+        with STAGE_DURATION.time("geocode"):
+            return await self._get_coordinates(city)
+
+    async def _get_coordinates(self, city: str) -> Coordinates:
+        cache = get_geocoding_cache()
+        key = normalize_city_name(city)
+        cached = cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            if cached is None:
+                raise GeocodingError(f"City not found: {city}")
+            return Coordinates(**cached)
+
+        gazetteer = get_gazetteer()
+        if gazetteer is not None:
+            coords = gazetteer.lookup(city)
+            if coords is not None:
+                return coords
+
         try:
-            response = await client.get(self.GEOCODING_URL, params={"name": city, "count": 1, "language": "en", "format": "json"})
-            response.raise_for_status()
-            data = response.json()
+            data = await fetch_json(self.GEOCODING_URL, params={"name": city, "count": 1, "language": "en", "format": "json"}, priority=Priority.INTERACTIVE)
         except httpx.HTTPError as e:
             raise ApiError(f"Geocoding API failed: {str(e)}") from e
 
         if not data.get("results"):
+            # Negative caching: repeated lookups of unknown names don't hit the API again
+            cache.set(key, None, ttl=get_settings().geocoding_negative_cache_ttl)
             raise GeocodingError(f"City not found: {city}")
 
         result = data["results"][0]
-        return Coordinates(latitude=result["latitude"], longitude=result["longitude"])
+        coords = Coordinates(latitude=result["latitude"], longitude=result["longitude"])
+        cache.set(key, coords.model_dump())
+        return coords
+
+    async def get_coordinates_batch(self, cities: List[str]) -> List[Union[Coordinates, WeatherMcpError]]:
+        """
+        Geocodes several cities concurrently.
+        A failed lookup is returned in place of its coordinates as the raised error.
+        """
+        step = track_progress(len(cities))
+
+        async def lookup(city: str) -> Coordinates:
+            try:
+                return await self.get_coordinates(city)
+            finally:
+                step()
+
+        results = await asyncio.gather(*(lookup(city) for city in cities), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, WeatherMcpError):
+                raise result
+        return results
 
     async def get_current_weather(self, lat: float, lon: float) -> WeatherForecast:
-        client = get_http_client()
+        lat, lon = snap_coordinates(lat, lon)
         params = {
             "latitude": lat,
             "longitude": lon,
-            "current": ["temperature_2m", "relative_humidity_2m", "apparent_temperature", "precipitation", "weather_code", "wind_speed_10m", "wind_direction_10m", "visibility"],
+            "current": self.CURRENT_VARIABLES,
             "daily": ["uv_index_max"],
             "timezone": "auto"
         }
         
         try:
-            response = await client.get(self.WEATHER_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = await fetch_json(self.WEATHER_URL, params=params, ttl=get_settings().current_cache_ttl, priority=Priority.INTERACTIVE)
         except httpx.HTTPError as e:
             raise ApiError(f"Weather API failed: {str(e)}") from e
 
+        return self._parse_current_weather(data)
+
+    async def get_current_weather_batch(self, locations: List[Coordinates]) -> List[WeatherForecast]:
+        """
+        Fetches current weather for many locations using Open-Meteo's multi-location
+        requests (comma-separated coordinates), one request per chunk of locations.
+        Results are returned in the order of `locations`.
+        """
+        settings = get_settings()
+        points = [snap_coordinates(c.latitude, c.longitude) for c in locations]
+
+        async def fetch_chunk(chunk: List[Tuple[float, float]]) -> List[WeatherForecast]:
+            params = {
+                "latitude": ",".join(str(lat) for lat, _ in chunk),
+                "longitude": ",".join(str(lon) for _, lon in chunk),
+                "current": self.CURRENT_VARIABLES,
+                "daily": ["uv_index_max"],
+                "timezone": "auto"
+            }
+            try:
+                data = await fetch_json(self.WEATHER_URL, params=params, ttl=settings.current_cache_ttl)
+            except httpx.HTTPError as e:
+                raise ApiError(f"Weather API failed: {str(e)}") from e
+            step()
+            # A single location comes back as an object rather than a list
+            results = data if isinstance(data, list) else [data]
+            return [self._parse_current_weather(item) for item in results]
+
+        batches = list(chunked(points, settings.batch_chunk_size))
+        step = track_progress(len(batches))
+        chunks = await asyncio.gather(*(fetch_chunk(chunk) for chunk in batches))
+        return [forecast for chunk in chunks for forecast in chunk]
+
+    @staticmethod
+    def _parse_current_weather(data: Dict[str, Any]) -> WeatherForecast:
         current = data["current"]
         daily = data.get("daily", {})
         
@@ -54,38 +146,151 @@ class WeatherService:
             visibility=current.get("visibility", 0)
         )
 
-    async def get_weather_details(self, lat: float, lon: float) -> Dict[str, Any]:
-        client = get_http_client()
-        params = {
+    async def get_weather_details(
+        self,
+        lat: float,
+        lon: float,
+        variables: Optional[List[str]] = None,
+        forecast_days: Optional[int] = None,
+        forecast_hours: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Returns the decoded forecast response; see get_weather_details_raw."""
+        return loads(await self.get_weather_details_raw(lat, lon, variables, forecast_days, forecast_hours))
+
+    async def get_weather_details_raw(
+        self,
+        lat: float,
+        lon: float,
+        variables: Optional[List[str]] = None,
+        forecast_days: Optional[int] = None,
+        forecast_hours: Optional[int] = None,
+    ) -> bytes:
+        """
+        Returns the forecast response body exactly as sent by the upstream, so it can be
+        passed through without re-encoding. `variables` restricts the current/hourly/daily
+        blocks to the named variables; `forecast_days` and `forecast_hours` shorten the
+        forecast horizon, so less data is fetched and serialized.
+        """
+        lat, lon = snap_coordinates(lat, lon)
+        settings = get_settings()
+        params: Dict[str, Any] = {
             "latitude": lat,
             "longitude": lon,
-            "current": ["temperature_2m", "relative_humidity_2m", "apparent_temperature", "is_day", "precipitation", "rain", "showers", "snowfall", "weather_code", "cloud_cover", "pressure_msl", "surface_pressure", "wind_speed_10m", "wind_direction_10m", "wind_gusts_10m", "visibility"],
-            "hourly": ["temperature_2m", "relative_humidity_2m", "dew_point_2m", "apparent_temperature", "precipitation_probability", "precipitation", "weather_code", "pressure_msl", "surface_pressure", "cloud_cover", "visibility", "wind_speed_10m", "wind_direction_10m", "wind_gusts_10m", "uv_index"],
-            "daily": ["weather_code", "temperature_2m_max", "temperature_2m_min", "apparent_temperature_max", "apparent_temperature_min", "sunrise", "sunset", "uv_index_max", "precipitation_sum", "rain_sum", "showers_sum", "snowfall_sum", "precipitation_hours", "precipitation_probability_max"],
+            **select_variables(self.DETAILS_VARIABLES, variables),
             "timezone": "auto"
         }
+        if forecast_days is not None:
+            params["forecast_days"] = check_range("forecast_days", forecast_days, 1, 16)
+        if forecast_hours is not None:
+            params["forecast_hours"] = check_range("hours", forecast_hours, 1, 384)
+        ttl = settings.current_cache_ttl if "current" in params else settings.forecast_cache_ttl
         
         try:
-            response = await client.get(self.WEATHER_URL, params=params)
-            response.raise_for_status()
-            return response.json()
+            return await fetch_raw(self.WEATHER_URL, params=params, ttl=ttl, priority=Priority.BULK)
         except httpx.HTTPError as e:
             raise ApiError(f"Weather API failed: {str(e)}") from e
 
-    async def get_weather_by_range(self, lat: float, lon: float, start_date: str, end_date: str) -> Dict[str, Any]:
-        client = get_http_client()
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "start_date": start_date,
-            "end_date": end_date,
-            "hourly": ["temperature_2m", "precipitation_probability", "wind_speed_10m"],
-            "timezone": "auto"
-        }
-        
+    async def get_weather_by_range(self, lat: float, lon: float, start_date: str, end_date: str, unixtime: bool = False) -> Dict[str, Any]:
+        """
+        Returns hourly temperature, precipitation probability and wind speed between two dates.
+        With `unixtime` the hourly times are epoch seconds instead of local ISO strings.
+
+        The range is fetched in calendar-month chunks, concurrently. Chunks old enough to be
+        in the archive come from the archive API and are cached for good; the rest come from
+        the forecast API. The archive has no precipitation probability, so it is None there.
+        """
+        settings = get_settings()
+        lat, lon = snap_coordinates(lat, lon)
         try:
-            response = await client.get(self.WEATHER_URL, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise ApiError(f"Weather API failed: {str(e)}") from e
+            start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        except ValueError:
+            raise InvalidParameterError("Dates must be in YYYY-MM-DD format") from None
+        if start > end:
+            raise InvalidParameterError("'start_date' must not be after 'end_date'")
+        if (end - start).days + 1 > settings.range_max_days:
+            raise InvalidParameterError(f"Date range too long: at most {settings.range_max_days} days")
+
+        archive_cutoff = date.today() - timedelta(days=settings.archive_delay_days)
+        semaphore = asyncio.Semaphore(settings.range_max_concurrency)
+
+        async def fetch_chunk(chunk_start: date, chunk_end: date) -> Dict[str, Any]:
+            archived = chunk_end < archive_cutoff
+            params = {
+                "latitude": lat,
+                "longitude": lon,
+                "start_date": chunk_start.isoformat(),
+                "end_date": chunk_end.isoformat(),
+                "hourly": self.ARCHIVE_VARIABLES if archived else self.RANGE_VARIABLES,
+                "timezone": "auto"
+            }
+            if unixtime:
+                params["timeformat"] = "unixtime"
+            url = self.ARCHIVE_URL if archived else self.WEATHER_URL
+            ttl = settings.historical_cache_ttl if archived else self._range_ttl(params["end_date"])
+            async with semaphore:
+                try:
+                    data = await fetch_json(url, params=params, ttl=ttl, priority=Priority.BULK)
+                except httpx.HTTPError as e:
+                    raise ApiError(f"Weather API failed: {str(e)}") from e
+            step()
+            return data
+
+        ranges = self._range_chunks(start, end, archive_cutoff)
+        # In a background job, each month fetched counts as a step of progress
+        step = track_progress(len(ranges))
+        tasks = [asyncio.ensure_future(fetch_chunk(a, b)) for a, b in ranges]
+        try:
+            chunks = await asyncio.gather(*tasks)
+        finally:
+            # One failed chunk fails the whole query, so chunks still waiting for the semaphore are dropped
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        return self._merge_hourly(chunks, self.RANGE_VARIABLES)
+
+    @staticmethod
+    def _range_chunks(start: date, end: date, archive_cutoff: date) -> List[Tuple[date, date]]:
+        """Splits [start, end] at month boundaries and at the archive cutoff."""
+        chunks = []
+        while start <= end:
+            next_month = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+            chunk_end = min(end, next_month - timedelta(days=1))
+            if start < archive_cutoff <= chunk_end:
+                chunk_end = archive_cutoff - timedelta(days=1)
+            chunks.append((start, chunk_end))
+            start = chunk_end + timedelta(days=1)
+        return chunks
+
+    @staticmethod
+    def _merge_hourly(chunks: List[Dict[str, Any]], variables: List[str]) -> Dict[str, Any]:
+        """Concatenates the hourly blocks of consecutive responses; variables a chunk lacks are filled with None."""
+        merged = {key: value for key, value in chunks[0].items() if key != "hourly"}
+        hourly: Dict[str, List[Any]] = {"time": []}
+        for name in variables:
+            hourly[name] = []
+        for chunk in chunks:
+            block = chunk.get("hourly") or {}
+            times = block.get("time") or []
+            hourly["time"].extend(times)
+            for name in variables:
+                hourly[name].extend(block.get(name) or [None] * len(times))
+        merged["hourly"] = hourly
+        return merged
+
+    async def get_hourly_series_by_range(self, lat: float, lon: float, start_date: str, end_date: str) -> HourlySeries:
+        """Same data as get_weather_by_range, as a columnar HourlySeries."""
+        data = await self.get_weather_by_range(lat, lon, start_date, end_date, unixtime=True)
+        return HourlySeries.from_open_meteo(data)
+
+    @staticmethod
+    def _range_ttl(end_date: str) -> float:
+        """Past data doesn't change, so ranges that ended before yesterday are cached (almost) for good."""
+        settings = get_settings()
+        try:
+            end = date.fromisoformat(end_date)
+        except ValueError:
+            return settings.forecast_cache_ttl
+        # One day of margin because the API resolves dates in the location's timezone
+        if end < date.today() - timedelta(days=1):
+            return settings.historical_cache_ttl
+        return settings.forecast_cache_ttl
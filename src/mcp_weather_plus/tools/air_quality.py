@@ -1,11 +1,10 @@
 from typing import Any, Dict, List
-from mcp.server import Server
-from mcp.types import Tool, TextContent, EmbeddedResource, ImageContent
 import mcp.types as types
-from mcp_weather_plus.tools.toolhandler import ToolHandler
+from mcp_weather_plus.tools.toolhandler import ToolHandler, format_json, get_city_list
 from mcp_weather_plus.services.air_quality import AirQualityService
 from mcp_weather_plus.services.weather import WeatherService
-from mcp_weather_plus.exceptions import InvalidParameterError
+from mcp_weather_plus.formats import format_schema, open_meteo_sections, render_sections
+from mcp_weather_plus.models import AIR_QUALITY_FORMAT, AirQualityData, Coordinates
 
 class AirQualityTools(ToolHandler):
     def __init__(self):
@@ -21,10 +20,27 @@ class AirQualityTools(ToolHandler):
                     "type": "object",
                     "properties": {
                         "city": {"type": "string", "description": "City name (e.g. 'London')"},
+                        "format": format_schema(),
                     },
                     "required": ["city"],
                 },
             ),
+            types.Tool(
+                name="get_air_quality_batch",
+                description="Get current air quality metrics for several cities at once, as one table.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "cities": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "City names (e.g. ['London', 'Paris'])",
+                        },
+                        "format": format_schema(),
+                    },
+                    "required": ["cities"],
+                },
+            ),
             types.Tool(
                 name="get_air_quality_details",
                 description="Get detailed raw air quality data (JSON) for a city.",
@@ -32,32 +48,56 @@ class AirQualityTools(ToolHandler):
                     "type": "object",
                     "properties": {
                         "city": {"type": "string", "description": "City name (e.g. 'London')"},
+                        "variables": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Only return these variables (e.g. ['pm2_5', 'us_aqi'])",
+                        },
+                        "forecast_days": {"type": "integer", "minimum": 1, "maximum": 7, "description": "Number of forecast days"},
+                        "hours": {"type": "integer", "minimum": 1, "maximum": 168, "description": "Limit the hourly forecast to this many hours"},
+                        "compact": {"type": "boolean", "description": "Return minified JSON (same as format 'json')"},
+                        "format": format_schema(("json", "csv", "tsv"), default="indented JSON"),
                     },
                     "required": ["city"],
                 },
             ),
         ]
 
-    async def handle_call(self, name: str, args: Dict[str, Any]) -> List[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-        if name == "get_air_quality":
-            city = args.get("city")
-            if not city:
-                raise InvalidParameterError("Missing 'city' parameter")
-            
-            coords = await self.weather_service.get_coordinates(city)
-            aq_data = await self.aq_service.get_air_quality(coords.latitude, coords.longitude)
-            return [types.TextContent(type="text", text=aq_data.to_markdown())]
+    async def get_air_quality(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        coords = await self.weather_service.get_coordinates(args["city"])
+        aq_data = await self.aq_service.get_air_quality(coords.latitude, coords.longitude)
+        fmt = args.get("format") or "markdown"
+        text = aq_data.to_markdown() if fmt == "markdown" else AIR_QUALITY_FORMAT.render(fmt, aq_data)
+        return [types.TextContent(type="text", text=text)]
 
-        elif name == "get_air_quality_details":
-            city = args.get("city")
-            if not city:
-                raise InvalidParameterError("Missing 'city' parameter")
+    async def get_air_quality_batch(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        cities = get_city_list(args)
+        locations = await self.weather_service.get_coordinates_batch(cities)
+        found = [coords for coords in locations if isinstance(coords, Coordinates)]
+        readings = iter(await self.aq_service.get_air_quality_batch(found) if found else [])
+        rows = [
+            (city, next(readings) if isinstance(coords, Coordinates) else str(coords))
+            for city, coords in zip(cities, locations)
+        ]
+        fmt = args.get("format") or "markdown"
+        text = AirQualityData.to_markdown_table(rows) if fmt == "markdown" else AIR_QUALITY_FORMAT.render_rows(fmt, rows)
+        return [types.TextContent(type="text", text=text)]
 
-            coords = await self.weather_service.get_coordinates(city)
-            data = await self.aq_service.get_air_quality_details(coords.latitude, coords.longitude)
-            
-            # Return as JSON string
-            import json
-            return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+    async def get_air_quality_details(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        coords = await self.weather_service.get_coordinates(args["city"])
+        projection = dict(
+            variables=args.get("variables"),
+            forecast_days=args.get("forecast_days"),
+            forecast_hours=args.get("hours"),
+        )
+        fmt = args.get("format") or ("json" if args.get("compact") else None)
+        if fmt == "json":
+            # The upstream already sends minified JSON: pass it through without decoding
+            body = await self.aq_service.get_air_quality_details_raw(coords.latitude, coords.longitude, **projection)
+            return [types.TextContent(type="text", text=body.decode("utf-8"))]
 
-        raise ValueError(f"Unknown tool: {name}")
+        data = await self.aq_service.get_air_quality_details(coords.latitude, coords.longitude, **projection)
+        if fmt is not None:
+            return [types.TextContent(type="text", text=render_sections(fmt, open_meteo_sections(data)))]
+        # Return as JSON string
+        return [types.TextContent(type="text", text=format_json(data))]
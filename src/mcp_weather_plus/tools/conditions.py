@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Dict, List
+import mcp.types as types
+from mcp_weather_plus.tools.toolhandler import ToolHandler
+from mcp_weather_plus.services.air_quality import AirQualityService
+from mcp_weather_plus.services.weather import WeatherService
+from mcp_weather_plus.exceptions import WeatherMcpError
+from mcp_weather_plus.formats import format_schema, render_sections
+from mcp_weather_plus.models import AIR_QUALITY_FORMAT, WEATHER_FORMAT
+
+class ConditionsTools(ToolHandler):
+    def __init__(self):
+        self.weather_service = WeatherService()
+        self.aq_service = AirQualityService()
+
+    def get_tools(self) -> List[types.Tool]:
+        return [
+            types.Tool(
+                name="get_conditions",
+                description="Get current weather and air quality for a city in one call.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "city": {"type": "string", "description": "City name (e.g. 'London')"},
+                        "format": format_schema(),
+                    },
+                    "required": ["city"],
+                },
+            ),
+        ]
+
+    async def get_conditions(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        # Geocode once, then fetch both upstreams in parallel
+        coords = await self.weather_service.get_coordinates(args["city"])
+        results = await asyncio.gather(
+            self.weather_service.get_current_weather(coords.latitude, coords.longitude),
+            self.aq_service.get_air_quality(coords.latitude, coords.longitude),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, WeatherMcpError):
+                raise result
+        if all(isinstance(result, WeatherMcpError) for result in results):
+            raise results[0]
+
+        # Return whatever succeeded, with a note for the part that failed
+        fmt = args.get("format") or "markdown"
+        if fmt != "markdown":
+            tables = [
+                (name, ("error",), [[str(result)]]) if isinstance(result, WeatherMcpError)
+                else (name, record_format.header, [[value] for value in record_format.row(result)])
+                for name, record_format, result in zip(("weather", "air_quality"), (WEATHER_FORMAT, AIR_QUALITY_FORMAT), results)
+            ]
+            return [types.TextContent(type="text", text=render_sections(fmt, tables))]
+
+        sections = []
+        for title, result in zip(("Current Weather", "Air Quality"), results):
+            if isinstance(result, WeatherMcpError):
+                sections.append(f"\n### {title}\n- **Unavailable**: {result}\n")
+            else:
+                sections.append(result.to_markdown())
+        return [types.TextContent(type="text", text="".join(sections))]
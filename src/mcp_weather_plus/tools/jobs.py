@@ -0,0 +1,100 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import mcp.types as types
+from mcp_weather_plus.tools.toolhandler import ToolHandler, format_json
+from mcp_weather_plus.config import get_settings
+from mcp_weather_plus.exceptions import JobFailedError, JobsUnavailableError
+from mcp_weather_plus.jobs import ProgressWatcher, get_job_manager
+
+if TYPE_CHECKING:
+    from mcp_weather_plus.tools.registry import ToolRegistry
+
+def _progress_watcher() -> Optional[ProgressWatcher]:
+    """Sends job progress as MCP progress notifications for the current request, if its client asked for them."""
+    from mcp.server.lowlevel.server import request_ctx
+
+    try:
+        ctx = request_ctx.get()
+    except LookupError:
+        return None
+    token = ctx.meta.progressToken if ctx.meta is not None else None
+    if token is None:
+        return None
+
+    async def send(progress: float, total: Optional[float], message: Optional[str]) -> None:
+        await ctx.session.send_progress_notification(token, progress, total, message, related_request_id=ctx.request_id)
+
+    return send
+
+class JobTools(ToolHandler):
+    """
+    Runs any other tool in the background: submit_job returns a job id at once and
+    get_job_result returns the tool's output when the job is done, so long ranges and
+    large batches don't hold a call (and an HTTP connection) open until they finish.
+    """
+
+    def __init__(self, registry: "ToolRegistry"):
+        self.registry = registry
+        self.tool_names = registry.names()
+
+    def get_tools(self) -> List[types.Tool]:
+        return [
+            types.Tool(
+                name="submit_job",
+                description="Run a tool in the background, for long date ranges or large batches. Returns a job id for get_job_result.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "tool": {"type": "string", "enum": self.tool_names, "description": "Name of the tool to run"},
+                        "arguments": {"type": "object", "description": "Arguments of the tool"},
+                    },
+                    "required": ["tool"],
+                },
+            ),
+            types.Tool(
+                name="get_job_result",
+                description=(
+                    "Get the output of a background job once it is done, or its status and progress while it runs. "
+                    "Progress notifications are sent while waiting."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "job_id": {"type": "string", "description": "Id returned by submit_job"},
+                        "wait": {
+                            "type": "number",
+                            "minimum": 0,
+                            "maximum": 60,
+                            "description": "Seconds to wait for the job to finish before returning its status. Default: 0",
+                        },
+                    },
+                    "required": ["job_id"],
+                },
+            ),
+        ]
+
+    async def submit_job(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        settings = get_settings()
+        if settings.server_workers > 1 and settings.cache_backend != "sqlite":
+            # get_job_result may reach another worker, which could never find the job
+            raise JobsUnavailableError("Background jobs need WEATHER_MCP_CACHE_BACKEND=sqlite when serving from several workers")
+        tool, arguments = args["tool"], args.get("arguments") or {}
+        # Bad arguments are reported now rather than as a failed job
+        self.registry.validate(tool, arguments)
+
+        async def run() -> List[str]:
+            contents = await self.registry.call(tool, arguments)
+            return [content.text for content in contents]
+
+        job = get_job_manager().submit(tool, run)
+        return [types.TextContent(type="text", text=format_json({"job_id": job.id, "status": job.status}, compact=True))]
+
+    async def get_job_result(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        manager = get_job_manager()
+        wait = args.get("wait") or 0
+        record = await manager.wait(args["job_id"], wait, _progress_watcher()) if wait else manager.get(args["job_id"])
+        if record["status"] == "failed":
+            raise JobFailedError(f"Job {record['job_id']} ({record['tool']}) failed: {record['error']}")
+        if record["status"] == "done":
+            return [types.TextContent(type="text", text=text) for text in record["result"]]
+        status = {key: record[key] for key in ("job_id", "tool", "status", "progress", "total")}
+        return [types.TextContent(type="text", text=format_json(status, compact=True))]
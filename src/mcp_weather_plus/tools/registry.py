@@ -0,0 +1,62 @@
+from typing import Any, Dict, Iterable, List, Optional
+import mcp.types as types
+from mcp_weather_plus.tools.toolhandler import ToolHandler, ToolSpec
+from mcp_weather_plus.tools.weather import WeatherTools
+from mcp_weather_plus.tools.air_quality import AirQualityTools
+from mcp_weather_plus.tools.conditions import ConditionsTools
+from mcp_weather_plus.tools.time import TimeTools
+from mcp_weather_plus.tools.jobs import JobTools
+
+# New tool handlers are added here; the server picks up every tool they declare
+HANDLER_CLASSES = [WeatherTools, AirQualityTools, ConditionsTools, TimeTools]
+
+class ToolRegistry:
+    """
+    Maps tool names to their handlers. Tool definitions and argument validators are
+    built once when the registry is created, so listing tools returns a prebuilt list
+    and a call is a dict lookup plus validation.
+    """
+
+    def __init__(self, handlers: Iterable[ToolHandler]):
+        self._specs: Dict[str, ToolSpec] = {}
+        self._tools: List[types.Tool] = []
+        for handler in handlers:
+            self.add(handler)
+
+    def add(self, handler: ToolHandler) -> None:
+        for name, spec in handler.tool_specs().items():
+            if name in self._specs:
+                raise ValueError(f"Tool registered twice: {name}")
+            self._specs[name] = spec
+            self._tools.append(spec.tool)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def names(self) -> List[str]:
+        return list(self._specs)
+
+    def validate(self, name: str, arguments: Dict[str, Any]) -> None:
+        """Checks arguments for a tool without calling it, raising InvalidParameterError."""
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown tool: {name}")
+        spec.validate(arguments)
+
+    def list_tools(self) -> List[types.Tool]:
+        return self._tools
+
+    async def call(self, name: str, arguments: Optional[Dict[str, Any]]) -> Any:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown tool: {name}")
+        return await spec.call(arguments or {})
+
+def create_registry() -> ToolRegistry:
+    """
+    Builds a registry with one instance of every handler in HANDLER_CLASSES, plus the
+    background job tools, which can run any of those tools.
+    """
+    registry = ToolRegistry(cls() for cls in HANDLER_CLASSES)
+    registry.add(JobTools(registry))
+    return registry
@@ -1,10 +1,8 @@
 from typing import Any, Dict, List
-from mcp.server import Server
-from mcp.types import Tool, TextContent, EmbeddedResource, ImageContent
 import mcp.types as types
-from mcp_weather_plus.tools.toolhandler import ToolHandler
+from mcp_weather_plus.tools.toolhandler import ToolHandler, format_json
+from mcp_weather_plus.formats import TABLE_FORMATS, format_schema, render_table
 from mcp_weather_plus.services.time import TimeService
-from mcp_weather_plus.exceptions import InvalidParameterError
 
 class TimeTools(ToolHandler):
     def __init__(self):
@@ -19,6 +17,7 @@ class TimeTools(ToolHandler):
                     "type": "object",
                     "properties": {
                         "timezone_name": {"type": "string", "description": "IANA Timezone name (e.g. 'Asia/Shanghai')"},
+                        "format": format_schema(),
                     },
                     "required": ["timezone_name"],
                 },
@@ -30,6 +29,7 @@ class TimeTools(ToolHandler):
                     "type": "object",
                     "properties": {
                         "timezone_name": {"type": "string", "description": "IANA Timezone name (e.g. 'Asia/Shanghai')"},
+                        "format": format_schema(TABLE_FORMATS, default="indented JSON"),
                     },
                     "required": ["timezone_name"],
                 },
@@ -43,39 +43,60 @@ class TimeTools(ToolHandler):
                         "time_str": {"type": "string", "description": "Time string in ISO format"},
                         "from_timezone": {"type": "string", "description": "Source timezone name"},
                         "to_timezone": {"type": "string", "description": "Target timezone name"},
+                        "format": format_schema(),
                     },
                     "required": ["time_str", "from_timezone", "to_timezone"],
                 },
             ),
+            types.Tool(
+                name="convert_times",
+                description="Convert many times into one or more timezones in a single call.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "times": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Time strings in ISO format; times without an offset are read in from_timezone",
+                        },
+                        "from_timezone": {"type": "string", "description": "Source timezone name"},
+                        "to_timezones": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Target timezone names (e.g. ['UTC', 'Asia/Tokyo'])",
+                        },
+                        "format": format_schema(TABLE_FORMATS, default="indented JSON"),
+                    },
+                    "required": ["times", "from_timezone", "to_timezones"],
+                },
+            ),
         ]
 
-    async def handle_call(self, name: str, args: Dict[str, Any]) -> List[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-        if name == "get_current_datetime":
-            timezone_name = args.get("timezone_name")
-            if not timezone_name:
-                raise InvalidParameterError("Missing 'timezone_name' parameter")
-            
-            result = self.time_service.get_current_datetime(timezone_name)
-            return [types.TextContent(type="text", text=result)]
-
-        elif name == "get_timezone_info":
-            timezone_name = args.get("timezone_name")
-            if not timezone_name:
-                raise InvalidParameterError("Missing 'timezone_name' parameter")
-
-            result = self.time_service.get_timezone_info(timezone_name)
-            import json
-            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+    async def get_current_datetime(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        result = self.time_service.get_current_datetime(args["timezone_name"])
+        fmt = args.get("format") or "markdown"
+        if fmt != "markdown":
+            result = render_table(fmt, ("timezone", "datetime"), [(args["timezone_name"], result)], single=True)
+        return [types.TextContent(type="text", text=result)]
 
-        elif name == "convert_time":
-            time_str = args.get("time_str")
-            from_timezone = args.get("from_timezone")
-            to_timezone = args.get("to_timezone")
-            
-            if not all([time_str, from_timezone, to_timezone]):
-                raise InvalidParameterError("Missing required parameters: time_str, from_timezone, to_timezone")
+    async def get_timezone_info(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        result = self.time_service.get_timezone_info(args["timezone_name"])
+        if args.get("format"):
+            return [types.TextContent(type="text", text=render_table(args["format"], list(result), [tuple(result.values())], single=True))]
+        return [types.TextContent(type="text", text=format_json(result))]
 
-            result = self.time_service.convert_time(time_str, from_timezone, to_timezone)
-            return [types.TextContent(type="text", text=result)]
+    async def convert_time(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        result = self.time_service.convert_time(args["time_str"], args["from_timezone"], args["to_timezone"])
+        fmt = args.get("format") or "markdown"
+        if fmt != "markdown":
+            # Same shape as a convert_times row
+            result = render_table(fmt, ("time", args["to_timezone"]), [(args["time_str"], result)], single=True)
+        return [types.TextContent(type="text", text=result)]
 
-        raise ValueError(f"Unknown tool: {name}")
+    async def convert_times(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        result = self.time_service.convert_times(args["times"], args["from_timezone"], args["to_timezones"])
+        if args.get("format"):
+            header = ["time", *dict.fromkeys(args["to_timezones"]), "error"]
+            rows = [tuple(map(row.get, header)) for row in result]
+            return [types.TextContent(type="text", text=render_table(args["format"], header, rows))]
+        return [types.TextContent(type="text", text=format_json(result))]
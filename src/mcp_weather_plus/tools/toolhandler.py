@@ -1,16 +1,147 @@
 from abc import ABC, abstractmethod
-from mcp.server import Server
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from mcp_weather_plus.config import get_settings
+from mcp_weather_plus.exceptions import InvalidParameterError
+from mcp_weather_plus.metrics import STAGE_DURATION, TOOL_DURATION, TOOL_ERRORS, TOOL_IN_FLIGHT, TOOL_RESPONSE_BYTES
+from mcp_weather_plus.serialization import dumps
+from mcp_weather_plus.utils import normalize_city_name
+
+Validator = Callable[[Dict[str, Any]], None]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+}
+_TYPE_NAMES = {
+    "string": "a string",
+    "integer": "an integer",
+    "number": "a number",
+    "boolean": "true or false",
+    "array": "a list",
+    "object": "an object",
+}
+
+def _compile_property(name: str, schema: Dict[str, Any]) -> Validator:
+    kind = schema.get("type")
+    is_type = _TYPE_CHECKS.get(kind)
+    items = schema.get("items") or {}
+    is_item = _TYPE_CHECKS.get(items.get("type"))
+    enum = frozenset(schema["enum"]) if "enum" in schema else None
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+
+    expected = _TYPE_NAMES.get(kind, "valid")
+    if is_item is not None:
+        expected += f" of {items['type']}s"
+    if minimum is not None and maximum is not None:
+        expected += f" between {minimum} and {maximum}"
+    elif minimum is not None:
+        expected += f" of at least {minimum}"
+    elif maximum is not None:
+        expected += f" of at most {maximum}"
+    type_error = f"'{name}' must be {expected}"
+    enum_error = f"'{name}' must be one of: {', '.join(map(str, schema.get('enum', ())))}"
+
+    def check(value: Any) -> None:
+        if is_type is not None and not is_type(value):
+            raise InvalidParameterError(type_error)
+        if is_item is not None and not all(map(is_item, value)):
+            raise InvalidParameterError(type_error)
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            raise InvalidParameterError(type_error)
+        if enum is not None and value not in enum:
+            raise InvalidParameterError(enum_error)
+
+    return check
+
+def compile_validator(schema: Dict[str, Any]) -> Validator:
+    """
+    Turns a tool's JSON input schema into a function that checks call arguments,
+    raising InvalidParameterError. Supports the subset our schemas use: required
+    properties, basic types, array item types, enums and numeric bounds.
+    """
+    required = tuple(schema.get("required", ()))
+    checks = [(name, _compile_property(name, prop)) for name, prop in schema.get("properties", {}).items()]
+
+    def validate(args: Dict[str, Any]) -> None:
+        for name in required:
+            value = args.get(name)
+            if value is None or value == "":
+                raise InvalidParameterError(f"Missing '{name}' parameter")
+        for name, check in checks:
+            value = args.get(name)
+            if value is not None:
+                check(value)
+
+    return validate
+
+class ToolSpec:
+    """A tool definition together with its precompiled argument validator and implementation."""
+
+    __slots__ = ("tool", "validate", "run")
+
+    def __init__(self, tool: Any, run: Callable[[Dict[str, Any]], Awaitable[Any]]):
+        self.tool = tool
+        self.validate = compile_validator(tool.inputSchema)
+        self.run = run
+
+    async def call(self, args: Dict[str, Any]) -> Any:
+        name = self.tool.name
+        with TOOL_IN_FLIGHT.track_in_progress(name), TOOL_DURATION.time(name):
+            try:
+                self.validate(args)
+                result = await self.run(args)
+            except Exception as e:
+                TOOL_ERRORS.labels(name, type(e).__name__).inc()
+                raise
+        TOOL_RESPONSE_BYTES.labels(name).inc(sum(len(content.text.encode()) for content in result if hasattr(content, "text")))
+        return result
 
 class ToolHandler(ABC):
-    """Abstract base class for MCP tool handlers."""
+    """
+    Abstract base class for MCP tool handlers.
+    Each tool returned by get_tools() is implemented by the async method of the same
+    name, which receives the validated arguments.
+    """
+
+    _specs: Optional[Dict[str, ToolSpec]] = None
 
     @abstractmethod
     def get_tools(self) -> list[Any]:
         """Returns a list of tools provided by this handler."""
         pass
 
-    @abstractmethod
+    def tool_specs(self) -> Dict[str, ToolSpec]:
+        """Returns the handler's tools by name; built once per handler."""
+        if self._specs is None:
+            self._specs = {tool.name: ToolSpec(tool, getattr(self, tool.name)) for tool in self.get_tools()}
+        return self._specs
+
     async def handle_call(self, name: str, args: Dict[str, Any]) -> Any:
         """Handles a tool call."""
-        pass
+        spec = self.tool_specs().get(name)
+        if spec is None:
+            raise ValueError(f"Unknown tool: {name}")
+        return await spec.call(args)
+
+def get_city_list(args: Dict[str, Any]) -> List[str]:
+    """Validates the 'cities' argument of batch tools and drops duplicate names, keeping order."""
+    cities = args.get("cities")
+    if not cities or not isinstance(cities, list) or not all(isinstance(c, str) and c.strip() for c in cities):
+        raise InvalidParameterError("'cities' must be a non-empty list of city names")
+
+    unique: Dict[str, str] = {}
+    for city in cities:
+        unique.setdefault(normalize_city_name(city), city.strip())
+    limit = get_settings().batch_max_cities
+    if len(unique) > limit:
+        raise InvalidParameterError(f"Too many cities: {len(unique)} (maximum {limit})")
+    return list(unique.values())
+
+def format_json(data: Any, compact: bool = False) -> str:
+    """Serializes tool output as JSON: minified when `compact`, indented otherwise."""
+    with STAGE_DURATION.time("encode"):
+        return dumps(data, indent=not compact)
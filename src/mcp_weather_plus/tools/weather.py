@@ -1,10 +1,12 @@
 from typing import Any, Dict, List
-from mcp.server import Server
-from mcp.types import Tool, TextContent, EmbeddedResource, ImageContent
 import mcp.types as types
-from mcp_weather_plus.tools.toolhandler import ToolHandler
+from mcp_weather_plus.tools.toolhandler import ToolHandler, format_json, get_city_list
 from mcp_weather_plus.services.weather import WeatherService
-from mcp_weather_plus.exceptions import InvalidParameterError
+from mcp_weather_plus.config import get_settings
+from mcp_weather_plus.formats import format_schema, open_meteo_sections, render_sections
+from mcp_weather_plus.models import WEATHER_FORMAT, Coordinates, RangeSummary, WeatherForecast
+
+SUMMARY_PERIODS = {"daily": 86400, "12h": 43200, "6h": 21600, "3h": 10800}
 
 class WeatherTools(ToolHandler):
     def __init__(self):
@@ -19,19 +21,42 @@ class WeatherTools(ToolHandler):
                     "type": "object",
                     "properties": {
                         "city": {"type": "string", "description": "City name (e.g. 'London')"},
+                        "format": format_schema(),
                     },
                     "required": ["city"],
                 },
             ),
+            types.Tool(
+                name="get_current_weather_batch",
+                description="Get current weather metrics for several cities at once, as one table.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "cities": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "City names (e.g. ['London', 'Paris'])",
+                        },
+                        "format": format_schema(),
+                    },
+                    "required": ["cities"],
+                },
+            ),
             types.Tool(
                 name="get_weather_by_datetime_range",
-                description="Get hourly weather trends for a date range.",
+                description="Summarize the weather for a date range: min/max temperature, peak precipitation probability and max wind per day.",
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "city": {"type": "string", "description": "City name (e.g. 'London')"},
                         "start_date": {"type": "string", "description": "Start date (YYYY-MM-DD)"},
                         "end_date": {"type": "string", "description": "End date (YYYY-MM-DD)"},
+                        "granularity": {
+                            "type": "string",
+                            "enum": list(SUMMARY_PERIODS),
+                            "description": "Length of each summary row (default 'daily')",
+                        },
+                        "format": format_schema(),
                     },
                     "required": ["city", "start_date", "end_date"],
                 },
@@ -43,46 +68,68 @@ class WeatherTools(ToolHandler):
                     "type": "object",
                     "properties": {
                         "city": {"type": "string", "description": "City name (e.g. 'London')"},
+                        "variables": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Only return these variables (e.g. ['temperature_2m', 'precipitation_probability'])",
+                        },
+                        "forecast_days": {"type": "integer", "minimum": 1, "maximum": 16, "description": "Number of forecast days"},
+                        "hours": {"type": "integer", "minimum": 1, "maximum": 384, "description": "Limit the hourly forecast to this many hours"},
+                        "compact": {"type": "boolean", "description": "Return minified JSON (same as format 'json')"},
+                        "format": format_schema(("json", "csv", "tsv"), default="indented JSON"),
                     },
                     "required": ["city"],
                 },
             ),
         ]
 
-    async def handle_call(self, name: str, args: Dict[str, Any]) -> List[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-        if name == "get_current_weather":
-            city = args.get("city")
-            if not city:
-                raise InvalidParameterError("Missing 'city' parameter")
-            
-            coords = await self.weather_service.get_coordinates(city)
-            forecast = await self.weather_service.get_current_weather(coords.latitude, coords.longitude)
-            return [types.TextContent(type="text", text=forecast.to_markdown())]
+    async def get_current_weather(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        coords = await self.weather_service.get_coordinates(args["city"])
+        forecast = await self.weather_service.get_current_weather(coords.latitude, coords.longitude)
+        fmt = args.get("format") or "markdown"
+        text = forecast.to_markdown() if fmt == "markdown" else WEATHER_FORMAT.render(fmt, forecast)
+        return [types.TextContent(type="text", text=text)]
 
-        elif name == "get_weather_by_datetime_range":
-            city = args.get("city")
-            start_date = args.get("start_date")
-            end_date = args.get("end_date")
-            
-            if not all([city, start_date, end_date]):
-                raise InvalidParameterError("Missing required parameters: city, start_date, end_date")
+    async def get_current_weather_batch(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        cities = get_city_list(args)
+        locations = await self.weather_service.get_coordinates_batch(cities)
+        found = [coords for coords in locations if isinstance(coords, Coordinates)]
+        forecasts = iter(await self.weather_service.get_current_weather_batch(found) if found else [])
+        rows = [
+            (city, next(forecasts) if isinstance(coords, Coordinates) else str(coords))
+            for city, coords in zip(cities, locations)
+        ]
+        fmt = args.get("format") or "markdown"
+        text = WeatherForecast.to_markdown_table(rows) if fmt == "markdown" else WEATHER_FORMAT.render_rows(fmt, rows)
+        return [types.TextContent(type="text", text=text)]
 
-            coords = await self.weather_service.get_coordinates(city)
-            data = await self.weather_service.get_weather_by_range(coords.latitude, coords.longitude, start_date, end_date)
-            
-            # Basic formatting for now, can be improved to Markdown summary
-            return [types.TextContent(type="text", text=f"Weather for {city} from {start_date} to {end_date}:\n{str(data)}")]
+    async def get_weather_by_datetime_range(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        city, start_date, end_date = args["city"], args["start_date"], args["end_date"]
+        period = SUMMARY_PERIODS[args.get("granularity") or "daily"]
 
-        elif name == "get_weather_details":
-            city = args.get("city")
-            if not city:
-                raise InvalidParameterError("Missing 'city' parameter")
+        coords = await self.weather_service.get_coordinates(city)
+        series = await self.weather_service.get_hourly_series_by_range(coords.latitude, coords.longitude, start_date, end_date)
+        summary = RangeSummary.from_series(series, period, get_settings().range_summary_max_rows)
+        fmt = args.get("format") or "markdown"
+        if fmt != "markdown":
+            return [types.TextContent(type="text", text=summary.render(fmt))]
+        return [types.TextContent(type="text", text=summary.to_markdown(f"Weather for {city} from {start_date} to {end_date}"))]
 
-            coords = await self.weather_service.get_coordinates(city)
-            data = await self.weather_service.get_weather_details(coords.latitude, coords.longitude)
-            
-            # Return as JSON string
-            import json
-            return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+    async def get_weather_details(self, args: Dict[str, Any]) -> List[types.TextContent]:
+        coords = await self.weather_service.get_coordinates(args["city"])
+        projection = dict(
+            variables=args.get("variables"),
+            forecast_days=args.get("forecast_days"),
+            forecast_hours=args.get("hours"),
+        )
+        fmt = args.get("format") or ("json" if args.get("compact") else None)
+        if fmt == "json":
+            # The upstream already sends minified JSON: pass it through without decoding
+            body = await self.weather_service.get_weather_details_raw(coords.latitude, coords.longitude, **projection)
+            return [types.TextContent(type="text", text=body.decode("utf-8"))]
 
-        raise ValueError(f"Unknown tool: {name}")
+        data = await self.weather_service.get_weather_details(coords.latitude, coords.longitude, **projection)
+        if fmt is not None:
+            return [types.TextContent(type="text", text=render_sections(fmt, open_meteo_sections(data)))]
+        # Return as JSON string
+        return [types.TextContent(type="text", text=format_json(data))]
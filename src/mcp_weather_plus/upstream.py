@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+from mcp_weather_plus.utils import get_http_client
+from mcp_weather_plus.cache import get_response_cache
+from mcp_weather_plus.config import get_settings
+from mcp_weather_plus.exceptions import RateLimitedError, UpstreamUnavailableError
+from mcp_weather_plus.ratelimit import Priority, get_rate_limiter
+from mcp_weather_plus.metrics import STAGE_DURATION, UPSTREAM_DURATION, UPSTREAM_IN_FLIGHT, UPSTREAM_RESPONSE_BYTES, UPSTREAM_RESPONSES
+from mcp_weather_plus.prefetch import get_prefetch_scheduler
+from mcp_weather_plus.serialization import loads
+from mcp_weather_plus.resilience import get_circuit_breaker, get_latency_tracker, hedged, is_retryable, retry_delay
+
+logger = logging.getLogger("weather-mcp")
+
+RequestKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+    Every waiter receives the same result, or the same exception.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        # Shield so one waiter being cancelled doesn't cancel the call for everyone else
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved in case every waiter was cancelled
+            future.exception()
+
+def request_key(url: str, params: Mapping[str, Any]) -> RequestKey:
+    """Builds a hashable key from a URL and its query parameters, independent of parameter order."""
+    items = []
+    for name, value in params.items():
+        if isinstance(value, (list, tuple)):
+            value = tuple(str(v) for v in value)
+        else:
+            value = str(value)
+        items.append((name, value))
+    return url, tuple(sorted(items))
+
+def upstream_url(url: str) -> str:
+    """Returns the URL a request is actually sent to: the same path under `upstream_base_url` when that is set."""
+    base = get_settings().upstream_base_url
+    if not base:
+        return url
+    return base.rstrip("/") + urlsplit(url).path
+
+async def _attempt(url: str, params: Mapping[str, Any], host: str, priority: Priority) -> httpx.Response:
+    """One request, hedged with a second one when the first is slower than the host's p95."""
+    settings = get_settings()
+    latencies = get_latency_tracker(host)
+    limiter = get_rate_limiter(host, settings)
+
+    async def _timed_get() -> httpx.Response:
+        if limiter is not None:
+            await limiter.acquire(priority, settings.rate_limit_max_wait)
+        started = time.monotonic()
+        with UPSTREAM_IN_FLIGHT.track_in_progress(host):
+            try:
+                response = await get_http_client().get(url, params=params)
+            except httpx.HTTPError:
+                UPSTREAM_RESPONSES.labels(host, "error").inc()
+                raise
+        elapsed = time.monotonic() - started
+        latencies.record(elapsed)
+        UPSTREAM_DURATION.labels(host).observe(elapsed)
+        UPSTREAM_RESPONSES.labels(host, str(response.status_code)).inc()
+        UPSTREAM_RESPONSE_BYTES.labels(host).inc(len(response.content))
+        return response
+
+    p95 = latencies.percentile(95) if settings.hedge_requests else None
+    if p95 is None:
+        return await _timed_get()
+    return await hedged(_timed_get, max(p95, settings.hedge_min_delay))
+
+async def get_with_retries(url: str, params: Mapping[str, Any], priority: Priority = Priority.NORMAL) -> httpx.Response:
+    """
+    Performs a GET request with jittered exponential retries on 429/5xx and transport
+    errors (honoring Retry-After), behind the host's circuit breaker and rate limiter.
+    Raises httpx.HTTPError once retries are exhausted, UpstreamUnavailableError
+    while the circuit is open and RateLimitedError when the request is shed.
+    """
+    settings = get_settings()
+    # Cache and prefetch keys keep the canonical URL; only the request itself is redirected
+    url = upstream_url(url)
+    host = urlsplit(url).netloc
+    breaker = get_circuit_breaker(host, settings)
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        trial = breaker.check(host)
+        try:
+            response = await _attempt(url, params, host, priority)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            if not is_retryable(e):
+                # The upstream answered, it just didn't like the request
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            delay = retry_delay(attempt, e, settings)
+            if attempt >= settings.retry_attempts or delay is None or time.monotonic() - started + delay > settings.retry_deadline:
+                raise
+            attempt += 1
+            logger.info(f"Retrying {host} in {delay:.2f}s after: {e}")
+            await asyncio.sleep(delay)
+        except BaseException:
+            # Shed by the rate limiter or cancelled: says nothing about the upstream
+            if trial:
+                breaker.abandon_trial()
+            raise
+        else:
+            breaker.record_success()
+            return response
+
+_inflight = SingleFlight()
+_MISSING = object()
+
+async def _fetch_and_store(key: RequestKey, url: str, params: Mapping[str, Any], ttl: Optional[float], priority: Priority) -> bytes:
+    """Fetches a body from the upstream (coalesced with identical in-flight requests) and caches it."""
+    async def _fetch() -> bytes:
+        response = await get_with_retries(url, params, priority)
+        body = response.content
+        if ttl is not None:
+            get_response_cache().set(key, body, ttl=ttl)
+            scheduler = get_prefetch_scheduler()
+            if scheduler is not None:
+                scheduler.fetched(key)
+        return body
+
+    return await _inflight.do(key, _fetch)
+
+async def fetch_raw(
+    url: str, params: Mapping[str, Any], ttl: Optional[float] = None, priority: Priority = Priority.NORMAL
+) -> bytes:
+    """
+    Performs a GET request on the shared HTTP client and returns the raw response body.
+    Identical concurrent requests share a single upstream call, and when `ttl` is
+    given the body is served from / stored in the shared response cache.
+    If the upstream fails, a recently expired cached body is served instead when available.
+    `priority` orders the request in the host's rate limiter queue.
+    Raises httpx.HTTPError on transport errors and non-2xx responses,
+    UpstreamUnavailableError while the upstream's circuit breaker is open and
+    RateLimitedError when the rate limiter sheds the request.
+    """
+    key = request_key(url, params)
+    if ttl is not None:
+        scheduler = get_prefetch_scheduler()
+        if scheduler is not None:
+            scheduler.record(key, url, params, ttl)
+        cached = get_response_cache().get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+    try:
+        return await _fetch_and_store(key, url, params, ttl, priority)
+    except (httpx.HTTPError, UpstreamUnavailableError, RateLimitedError) as e:
+        if ttl is not None:
+            stale = get_response_cache().get_stale(key, _MISSING)
+            if stale is not _MISSING:
+                logger.warning(f"Serving stale response for {url}: {e}")
+                return stale
+        raise
+
+async def refresh_raw(url: str, params: Mapping[str, Any], ttl: float) -> bytes:
+    """Fetches a response again at bulk priority, bypassing and then replacing the cached copy."""
+    return await _fetch_and_store(request_key(url, params), url, params, ttl, Priority.BULK)
+
+async def fetch_json(
+    url: str, params: Mapping[str, Any], ttl: Optional[float] = None, priority: Priority = Priority.NORMAL
+) -> Any:
+    """
+    Like fetch_raw, but returns the decoded JSON body.
+    Each caller gets its own decoded copy, even for coalesced or cached responses.
+    """
+    body = await fetch_raw(url, params, ttl, priority)
+    with STAGE_DURATION.time("decode"):
+        return loads(body)
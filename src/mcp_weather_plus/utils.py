@@ -1,21 +1,99 @@
+import asyncio
+import importlib.util
+import logging
 import httpx
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+from urllib.parse import urlsplit
+from mcp_weather_plus.config import Settings, get_settings
+from mcp_weather_plus.exceptions import InvalidParameterError
+
+T = TypeVar("T")
+
+logger = logging.getLogger("weather-mcp")
 
 _http_client: Optional[httpx.AsyncClient] = None
 
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """Builds an httpx.AsyncClient with the pool limits, timeouts and protocol from the settings."""
+    http2 = settings.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.http_connect_timeout,
+            read=settings.http_read_timeout,
+            write=settings.http_write_timeout,
+            pool=settings.http_pool_timeout,
+        ),
+    )
+
 def get_http_client() -> httpx.AsyncClient:
     """
     Returns a shared instance of httpx.AsyncClient.
-    Creates a new instance if one doesn't exist.
+    Creates a new instance from the current settings if one doesn't exist.
     """
     global _http_client
     if _http_client is None:
-        _http_client = httpx.AsyncClient(timeout=30.0)
+        _http_client = create_http_client(get_settings())
     return _http_client
 
+async def warm_up_http_client(urls: Iterable[str]):
+    """
+    Resolves DNS and opens a pooled connection to the host of each URL,
+    so that the first tool calls don't pay for connection setup.
+    """
+    client = get_http_client()
+    origins = {f"{parts.scheme}://{parts.netloc}/" for parts in map(urlsplit, urls)}
+
+    async def _warm(origin: str):
+        try:
+            await client.head(origin)
+        except httpx.HTTPError as e:
+            logger.warning(f"Connection warm-up to {origin} failed: {e}")
+
+    await asyncio.gather(*(_warm(origin) for origin in origins))
+
 async def close_http_client():
     """Closes the shared HTTP client if it exists."""
     global _http_client
     if _http_client:
         await _http_client.aclose()
         _http_client = None
+
+def normalize_city_name(city: str) -> str:
+    """Normalizes a city name for use as a lookup key (case-folded, whitespace collapsed)."""
+    return " ".join(city.split()).casefold()
+
+def chunked(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    """Splits a sequence into consecutive lists of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
+
+def select_variables(blocks: Dict[str, List[str]], variables: Optional[List[str]]) -> Dict[str, List[str]]:
+    """
+    Restricts each block of variables (e.g. "current", "hourly") to the requested names.
+    Blocks left empty are dropped. Raises InvalidParameterError for unknown names.
+    """
+    if not variables:
+        return dict(blocks)
+    known = {name for names in blocks.values() for name in names}
+    unknown = sorted(set(variables) - known)
+    if unknown:
+        raise InvalidParameterError(f"Unknown variables: {', '.join(unknown)}. Available: {', '.join(sorted(known))}")
+    wanted = set(variables)
+    selected = {block: [name for name in names if name in wanted] for block, names in blocks.items()}
+    return {block: names for block, names in selected.items() if names}
+
+def check_range(name: str, value: int, minimum: int, maximum: int) -> int:
+    """Validates an integer parameter, raising InvalidParameterError when it is out of range."""
+    if isinstance(value, bool) or not isinstance(value, int) or not minimum <= value <= maximum:
+        raise InvalidParameterError(f"'{name}' must be an integer between {minimum} and {maximum}")
+    return value
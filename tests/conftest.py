@@ -2,8 +2,34 @@ import pytest
 import respx
 import pytest_asyncio
 from typing import AsyncGenerator
+from mcp_weather_plus.cache import reset_caches
+from mcp_weather_plus.config import set_settings
+from mcp_weather_plus.resilience import reset_resilience_state
+from mcp_weather_plus.ratelimit import reset_rate_limiters
+from mcp_weather_plus.prefetch import reset_prefetch_scheduler
+from mcp_weather_plus.metrics import reset_metrics
+from mcp_weather_plus.jobs import reset_job_manager
 
 @pytest_asyncio.fixture
 async def respx_mock() -> AsyncGenerator[respx.MockRouter, None]:
     async with respx.mock(base_url="https://") as respx_mock:
         yield respx_mock
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    """Shared caches and settings must not leak between tests."""
+    set_settings(None)
+    reset_caches()
+    reset_resilience_state()
+    reset_rate_limiters()
+    reset_prefetch_scheduler()
+    reset_metrics()
+    reset_job_manager()
+    yield
+    set_settings(None)
+    reset_caches()
+    reset_resilience_state()
+    reset_rate_limiters()
+    reset_prefetch_scheduler()
+    reset_metrics()
+    reset_job_manager()
@@ -43,3 +43,45 @@ async def test_get_air_quality_details(respx_mock):
     details = await service.get_air_quality_details(51.5074, -0.1278)
     assert details["current"]["us_aqi"] == 25
     assert details["hourly"]["us_aqi"] == [20, 25, 30]
+
+@pytest.mark.asyncio
+async def test_get_air_quality_batch(respx_mock):
+    from mcp_weather_plus.models import Coordinates
+
+    current = {
+        "pm10": 10.0,
+        "pm2_5": 5.0,
+        "ozone": 60.0,
+        "carbon_monoxide": 200.0,
+        "nitrogen_dioxide": 10.0,
+        "sulphur_dioxide": 2.0,
+    }
+    route = respx_mock.get("https://air-quality-api.open-meteo.com/v1/air-quality").mock(
+        return_value=Response(200, json=[
+            {"current": {**current, "us_aqi": 25}},
+            {"current": {**current, "us_aqi": 120}},
+        ])
+    )
+
+    service = AirQualityService()
+    readings = await service.get_air_quality_batch([
+        Coordinates(latitude=51.5074, longitude=-0.1278),
+        Coordinates(latitude=48.8566, longitude=2.3522),
+    ])
+    assert [r.aqi for r in readings] == [25, 120]
+    assert route.call_count == 1
+    assert route.calls[0].request.url.params["latitude"] == "51.5,48.85"
+
+@pytest.mark.asyncio
+async def test_get_air_quality_details_projection(respx_mock):
+    route = respx_mock.get("https://air-quality-api.open-meteo.com/v1/air-quality").mock(
+        return_value=Response(200, json={"hourly": {"pm2_5": [5.0]}})
+    )
+
+    service = AirQualityService()
+    details = await service.get_air_quality_details(51.5074, -0.1278, variables=["pm2_5"], forecast_hours=24)
+    assert details["hourly"]["pm2_5"] == [5.0]
+    params = route.calls[0].request.url.params
+    assert params.get_list("current") == ["pm2_5"]
+    assert params.get_list("hourly") == ["pm2_5"]
+    assert params["forecast_hours"] == "24"
@@ -0,0 +1,144 @@
+import time
+from mcp_weather_plus.cache import TTLCache
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" becomes most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_ttl_cache_expiry(monkeypatch):
+    cache = TTLCache(maxsize=10, ttl=60)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+def test_ttl_cache_disabled():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+def test_ttl_cache_byte_budget():
+    cache = TTLCache(maxsize=10, ttl=60, maxbytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    assert cache.get("a") == b"1234"  # "a" becomes most recently used
+    cache.set("c", b"1234")
+    assert cache.get("b") is None and cache.nbytes == 8
+    cache.set("a", b"12")  # replacing an entry releases its old size
+    assert cache.nbytes == 6
+    cache.set("huge", b"x" * 11)
+    assert cache.get("huge") is None and cache.get("a") == b"12"
+    cache.delete("a")
+    assert cache.nbytes == 4
+
+def test_expires_in(tmp_path):
+    from mcp_weather_plus.cache import SQLiteCache
+
+    for cache in (TTLCache(maxsize=10, ttl=60), SQLiteCache(str(tmp_path / "cache.sqlite3"), "test", maxsize=10, ttl=60)):
+        cache.set("a", 1, ttl=30)
+        assert 29 < cache.expires_in("a") <= 30
+        assert cache.expires_in("missing") is None
+        cache.set("b", 1, ttl=-1)
+        assert cache.expires_in("b") is None
+
+def test_snap_coordinates():
+    from mcp_weather_plus.cache import snap_coordinates
+    from mcp_weather_plus.config import Settings, set_settings
+
+    assert snap_coordinates(51.5074, -0.1278) == (51.5, -0.15)
+    set_settings(Settings(grid_resolution=0))
+    assert snap_coordinates(51.5074, -0.1278) == (51.5074, -0.1278)
+
+def test_sqlite_cache_shared_between_connections(tmp_path):
+    from mcp_weather_plus.cache import SQLiteCache
+
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SQLiteCache(path, "responses", maxsize=10, ttl=60)
+    reader = SQLiteCache(path, "responses", maxsize=10, ttl=60)
+    other = SQLiteCache(path, "geocoding", maxsize=10, ttl=60)
+
+    key = ("https://api.open-meteo.com/v1/forecast", (("latitude", "51.5"),))
+    writer.set(key, {"hourly": {"temperature_2m": [1.0, 2.0]}})
+    writer.set("london", None)
+    assert reader.get(key) == {"hourly": {"temperature_2m": [1.0, 2.0]}}
+    assert reader.get("london", "missing") is None
+    assert other.get(key) is None
+
+def test_sqlite_cache_skips_writes_while_another_process_holds_the_lock(tmp_path):
+    import sqlite3
+    import time
+    from mcp_weather_plus.cache import SQLiteCache
+
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, "responses", maxsize=10, ttl=60)
+    cache.set("london", 1)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN EXCLUSIVE")
+    try:
+        started = time.monotonic()
+        cache.set("paris", 2)
+        cache.delete("london")
+        cache.evict()
+        cache.clear()
+        assert time.monotonic() - started < 1
+        assert cache.get("london") == 1
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+    # Every write was skipped
+    assert cache.get("paris") is None and cache.get("london") == 1
+
+def test_sqlite_cache_expiry_and_eviction(tmp_path, monkeypatch):
+    from mcp_weather_plus.cache import SQLiteCache
+
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), "test", maxsize=2, ttl=60)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache.set("a", 1, ttl=5)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    monkeypatch.setattr(time, "time", lambda: now + 10)
+    assert cache.get("a") is None
+    cache.evict()
+    assert len(cache) == 2
+    assert cache.get("c") == 3
+
+def test_create_cache_uses_configured_backend(tmp_path):
+    from mcp_weather_plus.cache import SQLiteCache, create_cache
+    from mcp_weather_plus.config import Settings, set_settings
+
+    assert isinstance(create_cache("test", 10, 60), TTLCache)
+    set_settings(Settings(cache_backend="sqlite", cache_path=str(tmp_path / "c" / "cache.sqlite3")))
+    cache = create_cache("test", 10, 60)
+    assert isinstance(cache, SQLiteCache)
+    cache.close()
+
+def test_sqlite_cache_stores_bytes(tmp_path):
+    from mcp_weather_plus.cache import SQLiteCache
+
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), "responses", maxsize=10, ttl=60)
+    cache.set("body", b'{"a":1}')
+    assert cache.get("body") == b'{"a":1}'
+
+def test_sqlite_cache_byte_budget(tmp_path, monkeypatch):
+    from mcp_weather_plus.cache import SQLiteCache
+
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), "responses", maxsize=10, ttl=60, maxbytes=10)
+    now = time.time()
+    for i, key in enumerate("abc"):
+        monkeypatch.setattr(time, "time", lambda: now + i)
+        cache.set(key, b"1234")
+    cache.evict()
+    assert cache.get("a") is None
+    assert cache.get("b") == cache.get("c") == b"1234"
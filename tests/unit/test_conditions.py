@@ -0,0 +1,61 @@
+import pytest
+from httpx import Response
+from mcp_weather_plus.tools.conditions import ConditionsTools
+from mcp_weather_plus.exceptions import ApiError
+
+GEOCODING = {"results": [{"latitude": 51.5074, "longitude": -0.1278}]}
+WEATHER = {
+    "current": {
+        "temperature_2m": 20.0,
+        "apparent_temperature": 19.5,
+        "relative_humidity_2m": 50,
+        "wind_speed_10m": 10.0,
+        "wind_direction_10m": 180,
+        "precipitation": 0.0,
+        "visibility": 10000.0,
+    },
+    "daily": {"uv_index_max": [5.0]},
+}
+AIR_QUALITY = {
+    "current": {
+        "us_aqi": 25,
+        "pm10": 10.0,
+        "pm2_5": 5.0,
+        "ozone": 60.0,
+        "carbon_monoxide": 200.0,
+        "nitrogen_dioxide": 10.0,
+        "sulphur_dioxide": 2.0,
+    }
+}
+
+@pytest.mark.asyncio
+async def test_get_conditions(respx_mock):
+    geocoding = respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(return_value=Response(200, json=GEOCODING))
+    respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(return_value=Response(200, json=WEATHER))
+    respx_mock.get("https://air-quality-api.open-meteo.com/v1/air-quality").mock(return_value=Response(200, json=AIR_QUALITY))
+
+    result = await ConditionsTools().handle_call("get_conditions", {"city": "London"})
+    text = result[0].text
+    assert "**Temperature**: 20.0°C" in text
+    assert "**AQI**: 25 (Good)" in text
+    assert geocoding.call_count == 1
+
+@pytest.mark.asyncio
+async def test_get_conditions_partial_failure(respx_mock):
+    respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(return_value=Response(200, json=GEOCODING))
+    respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(return_value=Response(200, json=WEATHER))
+    respx_mock.get("https://air-quality-api.open-meteo.com/v1/air-quality").mock(return_value=Response(500))
+
+    result = await ConditionsTools().handle_call("get_conditions", {"city": "London"})
+    text = result[0].text
+    assert "**Temperature**: 20.0°C" in text
+    assert "### Air Quality\n- **Unavailable**: Air Quality API failed" in text
+
+@pytest.mark.asyncio
+async def test_get_conditions_total_failure(respx_mock):
+    respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(return_value=Response(200, json=GEOCODING))
+    respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(return_value=Response(503))
+    respx_mock.get("https://air-quality-api.open-meteo.com/v1/air-quality").mock(return_value=Response(500))
+
+    with pytest.raises(ApiError):
+        await ConditionsTools().handle_call("get_conditions", {"city": "London"})
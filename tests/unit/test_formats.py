@@ -0,0 +1,87 @@
+import json
+import pytest
+from httpx import Response
+from mcp_weather_plus.exceptions import InvalidParameterError
+from mcp_weather_plus.formats import RecordFormat, open_meteo_sections, render_sections, render_table
+from mcp_weather_plus.models import WEATHER_FORMAT, WeatherForecast
+
+HEADER = ("city", "temperature", "note")
+ROWS = [("London", 12.5, None), ("New York", -1.0, 'said "hi"')]
+
+def test_render_table_csv_and_tsv():
+    assert render_table("csv", HEADER, ROWS) == 'city,temperature,note\nLondon,12.5,\nNew York,-1.0,"said ""hi"""\n'
+    assert render_table("tsv", HEADER, ROWS).splitlines()[1] == "London\t12.5\t"
+
+def test_render_table_json():
+    assert json.loads(render_table("json", HEADER, ROWS)) == [
+        {"city": "London", "temperature": 12.5, "note": None},
+        {"city": "New York", "temperature": -1.0, "note": 'said "hi"'},
+    ]
+    assert json.loads(render_table("json", HEADER, ROWS[:1], single=True))["city"] == "London"
+
+def test_render_table_kv_quotes_and_skips_missing_values():
+    assert render_table("kv", HEADER, ROWS) == 'city=London temperature=12.5\ncity="New York" temperature=-1.0 note="said \\"hi\\""\n'
+
+def test_render_table_rejects_unknown_format():
+    with pytest.raises(InvalidParameterError):
+        render_table("xml", HEADER, ROWS)
+
+def test_record_format_rows_with_errors():
+    forecast = WeatherForecast(temperature=20.5, feels_like=21.0, humidity=40, wind_speed=10.0, wind_direction=90, precipitation=0.0, uv_index=5.0, visibility=10000)
+    assert WEATHER_FORMAT.header[:2] == ("temperature", "feels_like")
+    assert WEATHER_FORMAT.render("kv", forecast).startswith("temperature=20.5 feels_like=21.0 humidity=40")
+    csv = WEATHER_FORMAT.render_rows("csv", [("London", forecast), ("Atlantis", "City not found: Atlantis")])
+    assert csv.splitlines() == [
+        "city,temperature,feels_like,humidity,wind_speed,wind_direction,precipitation,uv_index,visibility,error",
+        "London,20.5,21.0,40,10.0,90,0.0,5.0,10000.0,",
+        "Atlantis,,,,,,,,,City not found: Atlantis",
+    ]
+    assert RecordFormat(["temperature"]).row(forecast) == (20.5,)
+
+def test_open_meteo_sections():
+    data = {
+        "latitude": 51.5,
+        "current": {"time": "2024-01-01T00:00", "temperature_2m": 5.0},
+        "hourly": {"time": ["2024-01-01T00:00", "2024-01-01T01:00"], "temperature_2m": [5.0, None]},
+    }
+    sections = open_meteo_sections(data)
+    assert render_sections("csv", sections) == (
+        "# current\ntime,temperature_2m\n2024-01-01T00:00,5.0\n"
+        "# hourly\ntime,temperature_2m\n2024-01-01T00:00,5.0\n2024-01-01T01:00,\n"
+    )
+    assert json.loads(render_sections("json", open_meteo_sections(data))) == {
+        "current": {"time": "2024-01-01T00:00", "temperature_2m": 5.0},
+        "hourly": [{"time": "2024-01-01T00:00", "temperature_2m": 5.0}, {"time": "2024-01-01T01:00", "temperature_2m": None}],
+    }
+
+@pytest.mark.asyncio
+async def test_details_tool_csv_is_smaller_than_json(respx_mock):
+    from mcp_weather_plus.tools.weather import WeatherTools
+
+    respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(
+        return_value=Response(200, json={"results": [{"latitude": 51.5074, "longitude": -0.1278}]})
+    )
+    hours = 24 * 7
+    respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(
+        return_value=Response(200, json={
+            "hourly": {
+                "time": [f"2024-01-{1 + i // 24:02d}T{i % 24:02d}:00" for i in range(hours)],
+                "temperature_2m": [10.5] * hours,
+                "wind_speed_10m": [3.2] * hours,
+            },
+        })
+    )
+
+    tools = WeatherTools()
+    args = {"city": "London", "variables": ["temperature_2m", "wind_speed_10m"]}
+    pretty = (await tools.handle_call("get_weather_details", args))[0].text
+    csv = (await tools.handle_call("get_weather_details", {**args, "format": "csv"}))[0].text
+    assert csv.splitlines()[:3] == ["# hourly", "time,temperature_2m,wind_speed_10m", "2024-01-01T00:00,10.5,3.2"]
+    assert len(csv) * 1.5 < len(pretty)
+
+@pytest.mark.asyncio
+async def test_tools_reject_formats_they_do_not_support():
+    from mcp_weather_plus.tools.weather import WeatherTools
+
+    with pytest.raises(InvalidParameterError, match="'format' must be one of: json, csv, tsv"):
+        await WeatherTools().handle_call("get_weather_details", {"city": "London", "format": "markdown"})
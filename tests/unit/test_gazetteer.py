@@ -0,0 +1,72 @@
+import pytest
+from httpx import Response
+from mcp_weather_plus.config import Settings, set_settings
+from mcp_weather_plus.services.gazetteer import Gazetteer, build_index, normalize_place_name
+from mcp_weather_plus.services.weather import WeatherService
+
+CSV = """name,asciiname,alternatenames,latitude,longitude,population
+London,London,"Londres,Londra",51.50853,-0.12574,8961989
+London,London,,42.98339,-81.23304,346765
+São Paulo,Sao Paulo,"Sampa",-23.5475,-46.63611,10021295
+Paris,Paris,,48.85341,2.3488,2138551
+Smallville,Smallville,,10.0,10.0,100
+"""
+
+@pytest.fixture
+def index_path(tmp_path):
+    csv_path = tmp_path / "cities.csv"
+    csv_path.write_text(CSV, encoding="utf-8")
+    path = tmp_path / "gazetteer.idx"
+    build_index(str(csv_path), str(path), min_population=1000)
+    return str(path)
+
+def test_normalize_place_name():
+    assert normalize_place_name("  São   PAULO ") == "sao paulo"
+
+def test_gazetteer_lookup(index_path):
+    gazetteer = Gazetteer(index_path)
+    # The most populous place wins for a shared name
+    assert gazetteer.lookup("london").latitude == 51.50853
+    assert gazetteer.lookup("Londres").latitude == 51.50853
+    assert gazetteer.lookup("SAO PAULO").longitude == -46.63611
+    assert gazetteer.lookup("Sampa").longitude == -46.63611
+    assert gazetteer.lookup("Smallville") is None
+    assert gazetteer.lookup("Atlantis") is None
+
+def test_gazetteer_prefix_search(index_path):
+    gazetteer = Gazetteer(index_path)
+    names = [name for name, _ in gazetteer.search_prefix("lond")]
+    assert names == ["london", "londra", "londres"]
+
+def test_gazetteer_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.idx"
+    path.write_bytes(b"not an index at all")
+    with pytest.raises(ValueError):
+        Gazetteer(str(path))
+
+def test_gazetteer_rejects_truncated_files(tmp_path, index_path):
+    short = tmp_path / "short.idx"
+    short.write_bytes(b"MWP")
+    with pytest.raises(ValueError):
+        Gazetteer(str(short))
+    cut = tmp_path / "cut.idx"
+    cut.write_bytes(open(index_path, "rb").read()[:20])
+    with pytest.raises(ValueError, match="Truncated"):
+        Gazetteer(str(cut))
+
+@pytest.mark.asyncio
+async def test_get_coordinates_uses_gazetteer(index_path, respx_mock):
+    set_settings(Settings(gazetteer_path=index_path))
+    route = respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(
+        return_value=Response(200, json={"results": [{"latitude": 52.52, "longitude": 13.41}]})
+    )
+
+    service = WeatherService()
+    coords = await service.get_coordinates("Paris")
+    assert coords.latitude == 48.85341
+    assert route.call_count == 0
+
+    # Misses fall back to the geocoding API
+    coords = await service.get_coordinates("Berlin")
+    assert coords.latitude == 52.52
+    assert route.call_count == 1
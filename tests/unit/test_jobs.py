@@ -0,0 +1,98 @@
+import asyncio
+import json
+import pytest
+from mcp_weather_plus.config import Settings, set_settings
+from mcp_weather_plus.exceptions import InvalidParameterError, JobFailedError, JobQueueFullError, JobsUnavailableError, WeatherMcpError
+from mcp_weather_plus.jobs import JobManager, close_job_manager, track_progress
+from mcp_weather_plus.tools.registry import create_registry
+
+@pytest.mark.asyncio
+async def test_job_runs_in_background_and_reports_progress():
+    manager = JobManager(workers=2, max_queue=10, result_ttl=60, max_results=10)
+    gate = asyncio.Event()
+    updates = []
+
+    async def run():
+        step = track_progress(3)
+        for _ in range(3):
+            await gate.wait()
+            step()
+        return ["done"]
+
+    async def watch(progress, total, message):
+        updates.append((progress, total, message))
+
+    job = manager.submit("get_weather_by_datetime_range", run)
+    assert manager.get(job.id)["status"] == "queued"
+    await asyncio.sleep(0)
+    assert manager.get(job.id)["status"] == "running" and manager.stats() == {"queued": 0, "running": 1}
+
+    gate.set()
+    record = await manager.wait(job.id, 1, watch)
+    assert record["status"] == "done" and record["result"] == ["done"]
+    assert record["progress"] == record["total"] == 3
+    await asyncio.sleep(0)
+    assert updates[-1] == (3, 3, "done")
+    # Finished jobs are served from the result store
+    assert manager.get(job.id) == record and manager.stats() == {"queued": 0, "running": 0}
+    await manager.close()
+
+def test_track_progress_outside_a_job_does_nothing():
+    track_progress(5)()
+
+@pytest.mark.asyncio
+async def test_job_failures_and_unknown_jobs():
+    manager = JobManager(workers=1, max_queue=10, result_ttl=60, max_results=10)
+
+    async def fail():
+        raise WeatherMcpError("City not found: Atlantis")
+
+    job = manager.submit("get_current_weather", fail)
+    record = await manager.wait(job.id, 1)
+    assert record["status"] == "failed" and record["error"] == "City not found: Atlantis"
+    with pytest.raises(InvalidParameterError, match="Unknown or expired job"):
+        manager.get("missing")
+    await manager.close()
+
+@pytest.mark.asyncio
+async def test_submit_rejects_jobs_when_the_queue_is_full():
+    manager = JobManager(workers=1, max_queue=1, result_ttl=60, max_results=10)
+    blocked = asyncio.Event()
+
+    async def run():
+        await blocked.wait()
+        return []
+
+    manager.submit("convert_times", run)
+    with pytest.raises(JobQueueFullError):
+        manager.submit("convert_times", run)
+    await manager.close()
+
+@pytest.mark.asyncio
+async def test_job_tools_run_other_tools():
+    registry = create_registry()
+    args = {"times": ["2024-03-01T12:00:00"], "from_timezone": "UTC", "to_timezones": ["Asia/Tokyo"], "format": "csv"}
+    direct = await registry.call("convert_times", args)
+
+    submitted = json.loads((await registry.call("submit_job", {"tool": "convert_times", "arguments": args}))[0].text)
+    assert submitted["status"] == "queued"
+    result = await registry.call("get_job_result", {"job_id": submitted["job_id"], "wait": 5})
+    assert [content.text for content in result] == [content.text for content in direct]
+
+    # Arguments are checked when the job is submitted
+    with pytest.raises(InvalidParameterError, match="Missing 'times' parameter"):
+        await registry.call("submit_job", {"tool": "convert_times", "arguments": {}})
+    with pytest.raises(InvalidParameterError, match="'tool' must be one of"):
+        await registry.call("submit_job", {"tool": "submit_job"})
+
+    failing = json.loads((await registry.call("submit_job", {"tool": "get_timezone_info", "arguments": {"timezone_name": "Mars/Base"}}))[0].text)
+    with pytest.raises(JobFailedError, match="get_timezone_info"):
+        await registry.call("get_job_result", {"job_id": failing["job_id"], "wait": 5})
+    await close_job_manager()
+
+@pytest.mark.asyncio
+async def test_submit_job_needs_a_shared_store_with_several_workers():
+    set_settings(Settings(server_workers=2))
+    registry = create_registry()
+    with pytest.raises(JobsUnavailableError):
+        await registry.call("submit_job", {"tool": "get_current_datetime", "arguments": {"timezone_name": "UTC"}})
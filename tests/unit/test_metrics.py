@@ -0,0 +1,60 @@
+import pytest
+from httpx import Response
+from mcp_weather_plus import metrics
+from mcp_weather_plus.exceptions import InvalidParameterError
+from mcp_weather_plus.metrics import CallbackMetric, Counter, Histogram, Metric
+from mcp_weather_plus.tools.weather import WeatherTools
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test", ["op"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.labels("read").observe(value)
+    lines = histogram.render()
+    assert lines[:2] == ["# HELP test_seconds Test", "# TYPE test_seconds histogram"]
+    assert 'test_seconds_bucket{op="read",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{op="read",le="1"} 2' in lines
+    assert 'test_seconds_bucket{op="read",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{op="read"} 3' in lines
+    assert histogram.labels("read").quantile(0.5) == 1.0
+
+def test_counter_escapes_label_values():
+    counter = Counter("test_total", "Test", ["name"])
+    counter.labels('a "b"').inc(2)
+    assert counter.render()[-1] == 'test_total{name="a \\"b\\""} 2'
+
+def test_callback_metric_reads_values_at_render_time():
+    state = {("a",): 1}
+    metric = CallbackMetric("test_items", "Test", ["name"], lambda: state)
+    state[("b",)] = 2
+    assert metric.render()[-2:] == ['test_items{name="a"} 1', 'test_items{name="b"} 2']
+    with pytest.raises(TypeError):
+        metric.labels("a")
+    with pytest.raises(TypeError):
+        Metric("test", "Test")
+
+@pytest.mark.asyncio
+async def test_tool_and_upstream_calls_are_recorded(respx_mock):
+    respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(
+        return_value=Response(200, json={"results": [{"latitude": 51.5074, "longitude": -0.1278}]})
+    )
+    respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(return_value=Response(200, json={"hourly": {}}))
+
+    tools = WeatherTools()
+    await tools.handle_call("get_weather_details", {"city": "London"})
+    with pytest.raises(InvalidParameterError):
+        await tools.handle_call("get_weather_details", {})
+
+    assert metrics.TOOL_DURATION.labels("get_weather_details").count == 2
+    assert metrics.TOOL_ERRORS.labels("get_weather_details", "InvalidParameterError").value == 1
+    assert metrics.TOOL_IN_FLIGHT.labels("get_weather_details").value == 0
+    assert metrics.TOOL_RESPONSE_BYTES.labels("get_weather_details").value > 0
+    assert metrics.UPSTREAM_RESPONSES.labels("api.open-meteo.com", "200").value == 1
+    assert metrics.STAGE_DURATION.labels("geocode").count == 1
+
+    text = metrics.render()
+    assert 'weather_mcp_upstream_request_duration_seconds_count{host="geocoding-api.open-meteo.com"} 1' in text
+    assert 'weather_mcp_cache_requests_total{cache="geocoding",result="miss"} 1' in text
+
+    summary = metrics.summary()
+    assert "get_weather_details: 2 calls" in summary
+    assert "get_weather_details InvalidParameterError: 1" in summary
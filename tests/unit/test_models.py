@@ -0,0 +1,147 @@
+import math
+import pytest
+from httpx import Response
+from mcp_weather_plus.models import HourlySeries, RangeSummary
+from mcp_weather_plus.services.weather import WeatherService
+
+DAY = 86400
+# 2024-01-01T00:00 local time in UTC+1
+START = 1704063600
+
+def _series(hours=48, utc_offset=3600):
+    return HourlySeries.from_open_meteo({
+        "utc_offset_seconds": utc_offset,
+        "hourly": {
+            "time": [START + 3600 * i for i in range(hours)],
+            "temperature_2m": [float(i % 24) for i in range(hours)],
+            "wind_speed_10m": [None if i == 5 else 10.0 for i in range(hours)],
+        },
+    })
+
+def test_from_open_meteo_iso_times():
+    series = HourlySeries.from_open_meteo({
+        "utc_offset_seconds": 3600,
+        "hourly": {"time": ["2024-01-01T00:00", "2024-01-01T01:00"], "temperature_2m": [1.0, None]},
+    })
+    assert series.timestamps.tolist() == [START, START + 3600]
+    assert series.column("temperature_2m")[0] == 1.0
+    assert math.isnan(series.column("temperature_2m")[1])
+    assert series.to_dict()["temperature_2m"] == [1.0, None]
+
+def test_slice():
+    series = _series()
+    window = series.slice(START + 3600 * 10, START + 3600 * 12)
+    assert len(window) == 2
+    assert window.column("temperature_2m").tolist() == [10.0, 11.0]
+
+def test_resample_daily():
+    daily = _series().resample(DAY, {"temperature_2m": "max", "wind_speed_10m": "mean"})
+    assert daily.timestamps.tolist() == [START, START + DAY]
+    assert daily.column("temperature_2m_max").tolist() == [23.0, 23.0]
+    # The missing wind value is ignored
+    assert daily.column("wind_speed_10m_mean").tolist() == [10.0, 10.0]
+
+def test_resample_partial_buckets():
+    series = _series(hours=30).slice(START + 3600 * 20, START + 3600 * 30)
+    six_hourly = series.resample(6 * 3600, {"temperature_2m": "min"})
+    # Buckets stay aligned to local midnight, so the first one covers only 20:00-23:00
+    assert six_hourly.timestamps.tolist() == [START + 3600 * 18, START + DAY]
+    assert six_hourly.column("temperature_2m_min").tolist() == [20.0, 0.0]
+
+def test_resample_follows_dst_changes():
+    from datetime import datetime, timezone
+    # Europe/Berlin moves from UTC+1 to UTC+2 on 2024-03-31
+    start = int(datetime(2024, 3, 29, 23, tzinfo=timezone.utc).timestamp())
+    series = HourlySeries.from_open_meteo({
+        "timezone": "Europe/Berlin",
+        "utc_offset_seconds": 3600,
+        "hourly": {"time": [start + 3600 * i for i in range(24 + 23 + 24)], "temperature_2m": [1.0] * 71},
+    })
+    daily = series.resample(DAY, {"temperature_2m": "sum"})
+    assert [daily.local_time(i).isoformat() for i in range(len(daily))] == [
+        "2024-03-30T00:00:00", "2024-03-31T00:00:00", "2024-04-01T00:00:00",
+    ]
+    assert daily.column("temperature_2m_sum").tolist() == [24.0, 23.0, 24.0]
+
+    iso = HourlySeries.from_open_meteo({
+        "timezone": "Europe/Berlin",
+        "hourly": {"time": ["2024-03-31T01:00", "2024-03-31T03:00"], "temperature_2m": [1.0, 2.0]},
+    })
+    assert iso.timestamps[1] - iso.timestamps[0] == 3600
+
+@pytest.mark.parametrize("zone, first_day, utc_start, hours", [
+    # New York falls back from UTC-4 to UTC-5 on 2024-11-03
+    ("America/New_York", "2024-11-02", (2024, 11, 2, 4), [24, 25, 24]),
+    # Sydney springs forward from UTC+10 to UTC+11 on 2024-10-06
+    ("Australia/Sydney", "2024-10-05", (2024, 10, 4, 14), [24, 23, 24]),
+    # and falls back from UTC+11 to UTC+10 on 2024-04-07
+    ("Australia/Sydney", "2024-04-06", (2024, 4, 5, 13), [24, 25, 24]),
+])
+def test_range_summary_days_follow_dst_changes(zone, first_day, utc_start, hours):
+    from datetime import date, datetime, timedelta, timezone
+    start = int(datetime(*utc_start, tzinfo=timezone.utc).timestamp())
+    series = HourlySeries.from_open_meteo({
+        "timezone": zone,
+        "hourly": {"time": [start + 3600 * i for i in range(sum(hours))], "temperature_2m": [1.0] * sum(hours)},
+    })
+    days = [(date.fromisoformat(first_day) + timedelta(days=i)).isoformat() for i in range(3)]
+    assert [series.local_time(0).isoformat(), series.local_time(len(series) - 1).isoformat()] == [
+        f"{days[0]}T00:00:00", f"{days[2]}T23:00:00",
+    ]
+    daily = series.resample(DAY, {"temperature_2m": "sum"})
+    assert daily.column("temperature_2m_sum").tolist() == [float(h) for h in hours]
+    assert [row[0] for row in RangeSummary.from_series(series).to_table()[1]] == days
+
+def test_resample_rejects_unknown_aggregation():
+    with pytest.raises(ValueError):
+        _series().resample(DAY, {"temperature_2m": "median"})
+
+def test_series_is_compact():
+    series = _series(hours=24 * 90)
+    assert series.nbytes == 8 * 24 * 90 * 3
+
+@pytest.mark.asyncio
+async def test_get_hourly_series_by_range(respx_mock):
+    route = respx_mock.get("https://archive-api.open-meteo.com/v1/archive").mock(
+        return_value=Response(200, json={"utc_offset_seconds": 0, "hourly": {"time": [0, 3600], "temperature_2m": [1.0, 2.0], "wind_speed_10m": [3.0, 4.0]}})
+    )
+
+    series = await WeatherService().get_hourly_series_by_range(51.5, -0.1, "2024-01-01", "2024-01-01")
+    assert series.column("temperature_2m").tolist() == [1.0, 2.0]
+    assert all(math.isnan(v) for v in series.column("precipitation_probability"))
+    assert route.calls[0].request.url.params["timeformat"] == "unixtime"
+
+def _range_series(days):
+    hours = 24 * days
+    return HourlySeries.from_open_meteo({
+        "utc_offset_seconds": 3600,
+        "hourly": {
+            "time": [START + 3600 * i for i in range(hours)],
+            "temperature_2m": [float(i % 24) for i in range(hours)],
+            "precipitation_probability": [None] * hours,
+            "wind_speed_10m": [float(i % 7) for i in range(hours)],
+        },
+    })
+
+def test_range_summary_daily():
+    summary = RangeSummary.from_series(_range_series(3))
+    assert len(summary.series) == 3
+    assert summary.series.column("temperature_2m_min").tolist() == [0.0, 0.0, 0.0]
+    assert summary.series.column("temperature_2m_max").tolist() == [23.0, 23.0, 23.0]
+
+    markdown = summary.to_markdown("Weather")
+    assert "| 2024-01-01 | 0 | 23 | - | 6 |" in markdown
+    assert markdown.count("\n") == 3 + 3
+
+def test_range_summary_size_is_capped():
+    summary = RangeSummary.from_series(_range_series(100), max_rows=30)
+    assert summary.period == 4 * DAY
+    assert len(summary.series) <= 30
+
+def test_range_summary_render_csv():
+    series = HourlySeries.from_open_meteo({
+        "utc_offset_seconds": 0,
+        "hourly": {"time": [1704067200 + 3600 * i for i in range(48)], "temperature_2m": [float(i % 24) for i in range(48)]},
+    })
+    summary = RangeSummary.from_series(series)
+    assert summary.render("csv") == "time,temperature_2m_min,temperature_2m_max\n2024-01-01,0.0,23.0\n2024-01-02,0.0,23.0\n"
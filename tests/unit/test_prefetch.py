@@ -0,0 +1,140 @@
+import time
+import pytest
+from httpx import Response
+from mcp_weather_plus.config import Settings, set_settings
+from mcp_weather_plus.prefetch import PrefetchScheduler, get_prefetch_scheduler
+from mcp_weather_plus.services.weather import WeatherService
+from mcp_weather_plus.upstream import refresh_raw
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+CURRENT = {
+    "current": {
+        "temperature_2m": 20.0,
+        "apparent_temperature": 19.5,
+        "relative_humidity_2m": 50,
+        "wind_speed_10m": 10.0,
+        "wind_direction_10m": 180,
+        "precipitation": 0.0,
+        "visibility": 10000.0,
+    },
+    "daily": {"uv_index_max": [5.0]},
+}
+
+def _scheduler(**overrides):
+    options = dict(interval=1, refresh_ahead=60, min_hits=3, max_entries=100, budget_per_minute=60)
+    options.update(overrides)
+    return PrefetchScheduler(**options)
+
+@pytest.mark.asyncio
+async def test_only_hot_entries_are_refreshed():
+    scheduler = _scheduler()
+    for _ in range(3):
+        scheduler.record("hot", "https://example.com/hot", {}, 900)
+    scheduler.record("cold", "https://example.com/cold", {}, 900)
+
+    refreshed = []
+
+    async def refresh(url, params, ttl):
+        refreshed.append(url)
+
+    await scheduler.refresh_due(refresh)
+    assert refreshed == ["https://example.com/hot"]
+
+@pytest.mark.asyncio
+async def test_entries_are_refreshed_only_near_expiry():
+    scheduler = _scheduler()
+    for _ in range(3):
+        scheduler.record("k", "https://example.com/k", {}, 900)
+    scheduler.fetched("k")
+
+    async def refresh(url, params, ttl):
+        raise AssertionError("refreshed too early")
+
+    await scheduler.refresh_due(refresh)
+    assert scheduler.refreshed == 0
+
+def test_responses_already_cached_are_not_due():
+    from mcp_weather_plus.cache import get_response_cache
+
+    # e.g. stored by another worker sharing the sqlite cache
+    get_response_cache().set("k", b"{}", ttl=900)
+    scheduler = _scheduler()
+    for _ in range(3):
+        scheduler.record("k", "https://example.com/k", {}, 900)
+    assert 800 < scheduler.entries["k"].expires_at - time.monotonic() <= 900
+    assert scheduler.due() == []
+
+@pytest.mark.asyncio
+async def test_refreshes_stay_within_budget():
+    scheduler = _scheduler(budget_per_minute=2)
+    for key in range(5):
+        for _ in range(3):
+            scheduler.record(key, f"https://example.com/{key}", {}, 900)
+
+    async def refresh(url, params, ttl):
+        pass
+
+    await scheduler.refresh_due(refresh)
+    assert scheduler.refreshed == 2
+    assert scheduler.skipped == 3
+
+@pytest.mark.asyncio
+async def test_cold_entries_decay_away_but_seeds_stay():
+    scheduler = _scheduler()
+    scheduler.record("once", "https://example.com/once", {}, 900)
+
+    async def warm(city):
+        scheduler.record(city, f"https://example.com/{city}", {}, 900)
+
+    await scheduler.load_seed(["London"], warm)
+
+    async def refresh(url, params, ttl):
+        pass
+
+    for _ in range(10):
+        await scheduler.refresh_due(refresh)
+    assert list(scheduler.entries) == ["London"]
+    assert scheduler.is_hot(scheduler.entries["London"])
+
+@pytest.mark.asyncio
+async def test_hot_current_weather_is_refreshed_in_the_cache(respx_mock):
+    set_settings(Settings(prefetch_enabled=True, prefetch_min_hits=2))
+    route = respx_mock.get(FORECAST_URL).mock(return_value=Response(200, json=CURRENT))
+    service = WeatherService()
+    for _ in range(2):
+        await service.get_current_weather(51.5, -0.1)
+    assert route.call_count == 1
+
+    scheduler = get_prefetch_scheduler()
+    # Pretend the cached response is about to expire
+    for entry in scheduler.entries.values():
+        entry.expires_at = 0
+    await scheduler.refresh_due(refresh_raw)
+    assert route.call_count == 2
+    assert scheduler.refreshed == 1
+
+    await service.get_current_weather(51.5, -0.1)
+    assert route.call_count == 2
+
+def test_prefetch_is_off_by_default():
+    assert get_prefetch_scheduler() is None
+
+@pytest.mark.asyncio
+async def test_unexpected_errors_do_not_stop_prefetching():
+    scheduler = _scheduler(min_hits=1)
+    scheduler.record("a", "https://example.com/a", {}, 900)
+    scheduler.record("b", "https://example.com/b", {}, 900)
+    refreshed = []
+
+    async def refresh(url, params, ttl):
+        if url.endswith("/a"):
+            raise RuntimeError("boom")
+        refreshed.append(url)
+
+    await scheduler.refresh_due(refresh)
+    assert refreshed == ["https://example.com/b"]
+
+    async def warm(city):
+        raise RuntimeError("boom")
+
+    await scheduler.load_seed(["London"], warm)
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from mcp_weather_plus.exceptions import RateLimitedError
+from mcp_weather_plus.ratelimit import Priority, RateLimiter, TokenBucket
+
+def test_token_bucket_burst():
+    bucket = TokenBucket(rate=1, capacity=2)
+    assert bucket.try_take()
+    assert bucket.try_take()
+    assert not bucket.try_take()
+    assert 0 < bucket.time_until_token() <= 1
+
+@pytest.mark.asyncio
+async def test_rate_limiter_serves_higher_priority_first():
+    limiter = RateLimiter("host", rate=100, burst=1, max_queue=10)
+    await limiter.acquire()  # uses the only token
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire(priority, max_wait=1.0)
+        order.append(name)
+
+    bulk = asyncio.create_task(request("bulk", Priority.BULK))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(request("interactive", Priority.INTERACTIVE))
+    await asyncio.gather(bulk, interactive)
+    assert order == ["interactive", "bulk"]
+    stats = limiter.stats()
+    assert stats["acquired"] == 3 and stats["queue_depth"] == 0
+    # The two queued requests waited for tokens (0.01 s apart at 100/s)
+    assert 0 < stats["max_wait_seconds"] <= stats["wait_seconds_total"]
+
+    from mcp_weather_plus import metrics, ratelimit
+
+    ratelimit._limiters["host"] = limiter
+    text = metrics.render()
+    assert 'weather_mcp_rate_limiter_acquired_total{host="host"} 3' in text
+    assert 'weather_mcp_rate_limiter_wait_seconds_total{host="host"}' in text
+    assert 'weather_mcp_rate_limiter_max_wait_seconds{host="host"}' in text
+
+@pytest.mark.asyncio
+async def test_rate_limiter_sheds_when_queue_full():
+    limiter = RateLimiter("host", rate=1, burst=1, max_queue=1)
+    await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire(max_wait=5.0))
+    await asyncio.sleep(0)
+    with pytest.raises(RateLimitedError):
+        await limiter.acquire(max_wait=5.0)
+    assert limiter.stats()["shed"] == 1
+    waiting.cancel()
+
+@pytest.mark.asyncio
+async def test_rate_limiter_sheds_past_deadline():
+    limiter = RateLimiter("host", rate=1, burst=1, max_queue=10)
+    await limiter.acquire()
+    # The next token is about a second away: fail fast instead of queueing
+    with pytest.raises(RateLimitedError):
+        await asyncio.wait_for(limiter.acquire(max_wait=0.1), timeout=0.05)
@@ -0,0 +1,64 @@
+import pytest
+import mcp.types as types
+from mcp_weather_plus.exceptions import InvalidParameterError
+from mcp_weather_plus.tools.registry import ToolRegistry, create_registry
+from mcp_weather_plus.tools.toolhandler import ToolHandler, compile_validator
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "city": {"type": "string"},
+        "cities": {"type": "array", "items": {"type": "string"}},
+        "days": {"type": "integer", "minimum": 1, "maximum": 16},
+        "compact": {"type": "boolean"},
+        "granularity": {"type": "string", "enum": ["daily", "6h"]},
+    },
+    "required": ["city"],
+}
+
+class EchoTools(ToolHandler):
+    def get_tools(self):
+        return [types.Tool(name="echo", description="Echo", inputSchema=SCHEMA)]
+
+    async def echo(self, args):
+        return args["city"]
+
+def test_validator_accepts_valid_arguments():
+    validate = compile_validator(SCHEMA)
+    validate({"city": "London", "cities": ["Paris"], "days": 3, "compact": True, "granularity": "6h"})
+
+@pytest.mark.parametrize("args, message", [
+    ({}, "Missing 'city' parameter"),
+    ({"city": ""}, "Missing 'city' parameter"),
+    ({"city": 5}, "'city' must be a string"),
+    ({"city": "x", "cities": ["a", 1]}, "'cities' must be a list of strings"),
+    ({"city": "x", "days": 0}, "'days' must be an integer between 1 and 16"),
+    ({"city": "x", "days": True}, "'days' must be an integer between 1 and 16"),
+    ({"city": "x", "compact": "yes"}, "'compact' must be true or false"),
+    ({"city": "x", "granularity": "weekly"}, "'granularity' must be one of: daily, 6h"),
+])
+def test_validator_rejects_invalid_arguments(args, message):
+    with pytest.raises(InvalidParameterError, match=message):
+        compile_validator(SCHEMA)(args)
+
+@pytest.mark.asyncio
+async def test_registry_dispatches_and_validates():
+    registry = ToolRegistry([EchoTools()])
+    assert await registry.call("echo", {"city": "London"}) == "London"
+    with pytest.raises(InvalidParameterError):
+        await registry.call("echo", None)
+    with pytest.raises(ValueError):
+        await registry.call("unknown", {})
+
+def test_registry_rejects_duplicate_tools():
+    with pytest.raises(ValueError):
+        ToolRegistry([EchoTools(), EchoTools()])
+
+def test_default_registry_lists_every_tool_once():
+    registry = create_registry()
+    tools = registry.list_tools()
+    names = [tool.name for tool in tools]
+    assert len(names) == len(set(names))
+    assert {"get_current_weather", "get_air_quality_details", "get_conditions", "convert_times"} <= set(names)
+    # The list is built once, not per request
+    assert registry.list_tools() is tools
@@ -0,0 +1,134 @@
+import asyncio
+import httpx
+import pytest
+from httpx import Response
+from mcp_weather_plus.config import Settings, set_settings
+from mcp_weather_plus.exceptions import ApiError, UpstreamUnavailableError
+from mcp_weather_plus.resilience import CircuitBreaker, hedged, parse_retry_after, retry_delay
+from mcp_weather_plus.services.weather import WeatherService
+from mcp_weather_plus.upstream import fetch_json
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+@pytest.fixture
+def fast_retries():
+    settings = Settings(retry_attempts=2, retry_backoff_base=0.001, retry_backoff_max=0.01, circuit_failure_threshold=3)
+    set_settings(settings)
+    return settings
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+def test_retry_delay_honors_retry_after(fast_retries):
+    request = httpx.Request("GET", FORECAST_URL)
+    error = httpx.HTTPStatusError("", request=request, response=Response(429, headers={"Retry-After": "0.005"}, request=request))
+    assert retry_delay(0, error, fast_retries) == 0.005
+    # Waiting longer than the backoff cap isn't worth it
+    error = httpx.HTTPStatusError("", request=request, response=Response(429, headers={"Retry-After": "60"}, request=request))
+    assert retry_delay(0, error, fast_retries) is None
+
+@pytest.mark.asyncio
+async def test_retries_on_server_error(respx_mock, fast_retries):
+    route = respx_mock.get(FORECAST_URL).mock(side_effect=[Response(503), Response(429), Response(200, json={"ok": True})])
+    assert await fetch_json(FORECAST_URL, {"latitude": 1.0}) == {"ok": True}
+    assert route.call_count == 3
+
+@pytest.mark.asyncio
+async def test_no_retry_on_client_error(respx_mock, fast_retries):
+    route = respx_mock.get(FORECAST_URL).mock(return_value=Response(400))
+    with pytest.raises(httpx.HTTPStatusError):
+        await fetch_json(FORECAST_URL, {"latitude": 1.0})
+    assert route.call_count == 1
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast(respx_mock, fast_retries):
+    route = respx_mock.get(FORECAST_URL).mock(return_value=Response(503))
+    service = WeatherService()
+    with pytest.raises(ApiError):
+        await service.get_weather_details(1.0, 2.0)
+    assert route.call_count == 3
+
+    with pytest.raises(UpstreamUnavailableError):
+        await service.get_weather_details(1.0, 2.0)
+    assert route.call_count == 3
+
+def test_circuit_breaker_half_open(monkeypatch):
+    import time
+
+    now = 1000.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.check("host")
+
+    now += 11
+    assert breaker.state == "half-open"
+    breaker.check("host")  # the trial call
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.check("host")  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+@pytest.mark.asyncio
+async def test_shed_trial_call_does_not_block_the_half_open_circuit(respx_mock, monkeypatch):
+    import time
+    from mcp_weather_plus.exceptions import RateLimitedError
+    from mcp_weather_plus.ratelimit import get_rate_limiter
+    from mcp_weather_plus.resilience import get_circuit_breaker
+
+    settings = Settings(circuit_failure_threshold=1, circuit_reset_timeout=10, rate_limit_per_second=1, rate_limit_burst=1, rate_limit_max_wait=0.01)
+    set_settings(settings)
+    route = respx_mock.get(FORECAST_URL).mock(return_value=Response(200, json={"ok": True}))
+    breaker = get_circuit_breaker("api.open-meteo.com", settings)
+    breaker.record_failure()
+    now = time.monotonic() + 11
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    assert breaker.state == "half-open"
+
+    # The trial call is shed by the rate limiter before reaching the upstream
+    assert get_rate_limiter("api.open-meteo.com", settings)._bucket.try_take()
+    with pytest.raises(RateLimitedError):
+        await fetch_json(FORECAST_URL, {"latitude": 1.0})
+    assert route.call_count == 0
+
+    set_settings(Settings(circuit_failure_threshold=1, circuit_reset_timeout=10, rate_limit_per_second=0))
+    assert await fetch_json(FORECAST_URL, {"latitude": 1.0}) == {"ok": True}
+    assert breaker.state == "closed"
+
+@pytest.mark.asyncio
+async def test_stale_response_served_when_upstream_fails(respx_mock, fast_retries):
+    route = respx_mock.get(FORECAST_URL).mock(side_effect=[Response(200, json={"v": 1}), Response(503), Response(503), Response(503)])
+    assert await fetch_json(FORECAST_URL, {"latitude": 1.0}, ttl=0.01) == {"v": 1}
+
+    await asyncio.sleep(0.02)
+    assert await fetch_json(FORECAST_URL, {"latitude": 1.0}, ttl=0.01) == {"v": 1}
+    assert route.call_count == 4
+
+@pytest.mark.asyncio
+async def test_hedged_returns_fastest_attempt():
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1.0 if calls == 1 else 0.01)
+        return calls
+
+    assert await asyncio.wait_for(hedged(call, 0.01), timeout=0.5) == 2
+
+@pytest.mark.asyncio
+async def test_hedged_skips_second_attempt_when_fast():
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await hedged(call, 0.1) == 1
+    assert calls == 1
@@ -0,0 +1,39 @@
+import json
+import pytest
+from httpx import Response
+from mcp_weather_plus import serialization
+from mcp_weather_plus.tools.weather import WeatherTools
+
+DATA = {"hourly": {"time": ["2024-01-01T00:00"], "temperature_2m": [1.5, None]}, "name": "Zürich"}
+
+def test_round_trip():
+    assert serialization.loads(serialization.dumps(DATA)) == DATA
+    assert serialization.loads(serialization.dumps(DATA).encode("utf-8")) == DATA
+
+def test_dumps_formats():
+    assert "\n" not in serialization.dumps(DATA)
+    assert json.loads(serialization.dumps(DATA, indent=True)) == DATA
+    assert serialization.dumps(DATA, indent=True).startswith('{\n  "hourly"')
+
+def test_backends_give_the_same_text(monkeypatch):
+    encoded = serialization.dumps(DATA), serialization.dumps(DATA, indent=True)
+    assert '"Zürich"' in encoded[0]
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert (serialization.dumps(DATA), serialization.dumps(DATA, indent=True)) == encoded
+
+@pytest.mark.asyncio
+async def test_compact_details_pass_upstream_body_through(respx_mock):
+    body = b'{"latitude":51.5,"hourly":{"temperature_2m":[1.0,2.0]}}'
+    respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(
+        return_value=Response(200, json={"results": [{"latitude": 51.5074, "longitude": -0.1278}]})
+    )
+    respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(return_value=Response(200, content=body))
+
+    tools = WeatherTools()
+    compact = await tools.handle_call("get_weather_details", {"city": "London", "compact": True})
+    assert compact[0].text == body.decode("utf-8")
+
+    # The cached body is decoded and pretty-printed for the default output
+    pretty = await tools.handle_call("get_weather_details", {"city": "London"})
+    assert json.loads(pretty[0].text) == json.loads(body)
+    assert "\n" in pretty[0].text
@@ -0,0 +1,68 @@
+from starlette.testclient import TestClient
+from mcp_weather_plus import utils
+from mcp_weather_plus.config import Settings, set_settings
+from mcp_weather_plus.ratelimit import get_rate_limiter
+from mcp_weather_plus.server import create_http_app
+
+def test_http_app_serves_metrics_and_closes_client_on_shutdown():
+    set_settings(Settings(prefetch_enabled=False))
+    app = create_http_app()
+    assert app.debug is False
+
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert "weather_mcp_tool_duration_seconds" in response.text
+        utils.get_http_client()
+    assert utils._http_client is None
+
+def test_workers_share_the_upstream_rate_limit():
+    set_settings(Settings(server_workers=4, rate_limit_per_second=10, rate_limit_burst=20))
+    limiter = get_rate_limiter("api.open-meteo.com")
+    assert limiter._bucket.rate == 2.5
+    assert limiter._bucket.capacity == 5
+
+def test_sse_is_only_served_by_a_single_worker():
+    set_settings(Settings(prefetch_enabled=False, server_workers=2, server_stateless=True))
+    paths = {route.path for route in create_http_app().routes}
+    assert paths == {"/mcp", "/metrics"}
+
+    set_settings(Settings(prefetch_enabled=False))
+    assert {"/sse", "/messages"} <= {route.path for route in create_http_app().routes}
+
+MCP_HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+INITIALIZE = {
+    "jsonrpc": "2.0", "id": 1, "method": "initialize",
+    "params": {"protocolVersion": "2025-06-18", "capabilities": {}, "clientInfo": {"name": "test", "version": "0"}},
+}
+
+def test_stateless_streamable_http_needs_no_session():
+    set_settings(Settings(prefetch_enabled=False, server_stateless=True, server_json_response=True))
+
+    with TestClient(create_http_app()) as client:
+        response = client.post("/mcp", json=INITIALIZE, headers=MCP_HEADERS)
+        assert response.status_code == 200
+        assert "mcp-session-id" not in response.headers
+        assert response.json()["result"]["serverInfo"]["name"] == "weather-mcp"
+
+        # Any request can be served on its own, e.g. by another replica
+        response = client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers=MCP_HEADERS)
+        names = {tool["name"] for tool in response.json()["result"]["tools"]}
+        assert "get_weather_details" in names
+
+def test_stateful_streamable_http_issues_a_session():
+    set_settings(Settings(prefetch_enabled=False, server_json_response=True))
+
+    with TestClient(create_http_app()) as client:
+        response = client.post("/mcp", json=INITIALIZE, headers=MCP_HEADERS)
+        assert response.status_code == 200
+        session_id = response.headers["mcp-session-id"]
+
+        response = client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers=MCP_HEADERS)
+        assert response.status_code == 400  # no session id
+
+        headers = {**MCP_HEADERS, "mcp-session-id": session_id}
+        client.post("/mcp", json={"jsonrpc": "2.0", "method": "notifications/initialized"}, headers=headers)
+        response = client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["result"]["tools"]
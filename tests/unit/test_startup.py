@@ -0,0 +1,43 @@
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+# Generous budgets: these guard against regressions (an eager heavy import), not against slow CI machines
+OWN_MODULES_BUDGET_MS = 300
+TOTAL_BUDGET_MS = 5000
+
+def _import_times(statement: str) -> Dict[str, Tuple[int, int]]:
+    """Runs `statement` in a fresh interpreter with -X importtime; returns {module: (self_us, cumulative_us)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, check=True, timeout=60,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def test_stdio_startup_import_budget():
+    times = _import_times("import mcp_weather_plus.server")
+    own_ms = sum(self_us for name, (self_us, _) in times.items() if name.startswith("mcp_weather_plus")) / 1000
+    total_ms = times["mcp_weather_plus.server"][1] / 1000
+    assert own_ms < OWN_MODULES_BUDGET_MS, f"mcp_weather_plus modules took {own_ms:.0f} ms to import"
+    assert total_ms < TOTAL_BUDGET_MS, f"importing the server took {total_ms:.0f} ms"
+
+def test_server_module_defers_the_http_stack_and_services():
+    # mcp itself pulls in httpx, starlette and uvicorn, so it must not be imported at module level either
+    deferred = ("uvicorn", "starlette", "httpx", "mcp", "mcp_weather_plus.services", "mcp_weather_plus.tools", "mcp_weather_plus.upstream")
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, mcp_weather_plus.server; print('\\n'.join(sys.modules))"],
+        capture_output=True, text=True, check=True, timeout=60,
+    )
+    loaded = [name for name in result.stdout.split() if name in deferred or name.startswith(tuple(f"{d}." for d in deferred))]
+    assert loaded == []
+
+def test_sqlite_is_only_imported_for_the_sqlite_backend():
+    times = _import_times("import mcp_weather_plus.cache")
+    assert "sqlite3" not in times
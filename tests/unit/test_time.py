@@ -30,3 +30,36 @@ def test_invalid_timezone():
     service = TimeService()
     with pytest.raises(InvalidParameterError):
         service.get_current_datetime("Invalid/Timezone")
+
+def test_timezone_names_are_case_insensitive():
+    service = TimeService()
+    converted = service.convert_time("2023-01-01T12:00:00+00:00", "utc", "asia/shanghai")
+    assert converted == "2023-01-01T20:00:00+08:00"
+    assert service.get_timezone_info("AMERICA/NEW_YORK")["name"] in ("EST", "EDT")
+
+def test_convert_time_naive_uses_source_zone_dst():
+    service = TimeService()
+    # New York is on daylight saving time in July
+    assert service.convert_time("2023-07-01T08:00:00", "America/New_York", "UTC") == "2023-07-01T12:00:00+00:00"
+
+def test_convert_times_batch():
+    service = TimeService()
+    rows = service.convert_times(
+        ["2023-01-01T12:00:00+00:00", "2023-07-01T12:00:00", "not a time"],
+        "UTC",
+        ["Asia/Shanghai", "Europe/London"],
+    )
+    assert rows[0] == {
+        "time": "2023-01-01T12:00:00+00:00",
+        "Asia/Shanghai": "2023-01-01T20:00:00+08:00",
+        "Europe/London": "2023-01-01T12:00:00+00:00",
+    }
+    assert rows[1]["Europe/London"] == "2023-07-01T13:00:00+01:00"
+    assert "error" in rows[2]
+
+def test_convert_times_rejects_unknown_zone():
+    service = TimeService()
+    with pytest.raises(InvalidParameterError):
+        service.convert_times(["2023-01-01T12:00:00"], "UTC", ["Mars/Olympus"])
+    with pytest.raises(InvalidParameterError):
+        service.convert_times(["2023-01-01T12:00:00"], "../etc/passwd", ["UTC"])
@@ -0,0 +1,115 @@
+import asyncio
+import httpx
+import pytest
+from httpx import Response
+from mcp_weather_plus.upstream import SingleFlight, fetch_json, request_key
+from mcp_weather_plus.services.weather import WeatherService
+from mcp_weather_plus.exceptions import ApiError
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+def test_request_key_ignores_param_order():
+    a = request_key(FORECAST_URL, {"latitude": 1.0, "current": ["a", "b"]})
+    b = request_key(FORECAST_URL, {"current": ["a", "b"], "latitude": 1.0})
+    assert a == b
+    assert a != request_key(FORECAST_URL, {"latitude": 1.0, "current": ["b", "a"]})
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    flight = SingleFlight()
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(10)))
+    assert results == [1] * 10
+    assert len(flight) == 0
+    # Once the first call completed, a new one is issued
+    assert await flight.do("k", work) == 2
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_all_waiters():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    flight = SingleFlight()
+    results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_waiter_cancellation():
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    flight = SingleFlight()
+    first = asyncio.create_task(flight.do("k", work))
+    second = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "done"
+
+@pytest.mark.asyncio
+async def test_fetch_json_coalesces_identical_requests(respx_mock):
+    async def slow(request):
+        await asyncio.sleep(0.01)
+        return Response(200, json={"ok": True})
+
+    route = respx_mock.get(FORECAST_URL).mock(side_effect=slow)
+    params = {"latitude": 1.0, "longitude": 2.0}
+    results = await asyncio.gather(*(fetch_json(FORECAST_URL, params) for _ in range(5)))
+    assert results == [{"ok": True}] * 5
+    assert route.call_count == 1
+
+@pytest.mark.asyncio
+async def test_upstream_base_url_redirects_requests_but_not_cache_keys(respx_mock):
+    from mcp_weather_plus.cache import get_response_cache
+    from mcp_weather_plus.config import update_settings
+    update_settings(upstream_base_url="http://127.0.0.1:9100/")
+
+    route = respx_mock.get("http://127.0.0.1:9100/v1/forecast").mock(return_value=Response(200, json={"ok": True}))
+    params = {"latitude": 1.0, "longitude": 2.0}
+    assert await fetch_json(FORECAST_URL, params, ttl=60) == {"ok": True}
+    assert route.call_count == 1
+    assert get_response_cache().get(request_key(FORECAST_URL, params)) is not None
+
+@pytest.mark.asyncio
+async def test_coalesced_upstream_error_raises_api_error(respx_mock):
+    async def failing(request):
+        await asyncio.sleep(0.01)
+        return Response(500)
+
+    respx_mock.get(FORECAST_URL).mock(side_effect=failing)
+    service = WeatherService()
+    results = await asyncio.gather(*(service.get_current_weather(1.0, 2.0) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ApiError) for r in results)
+
+@pytest.mark.asyncio
+async def test_create_http_client_uses_settings():
+    from mcp_weather_plus.config import get_settings, update_settings
+    from mcp_weather_plus.utils import create_http_client
+
+    update_settings(http_connect_timeout=1.5, http_read_timeout=20.0, http_max_connections=7)
+    assert get_settings().http_max_connections == 7
+    client = create_http_client(get_settings())
+    try:
+        assert client.timeout.connect == 1.5
+        assert client.timeout.read == 20.0
+        assert client.timeout.pool == get_settings().http_pool_timeout
+    finally:
+        await client.aclose()
+
+@pytest.mark.asyncio
+async def test_warm_up_http_client_opens_each_host_once(respx_mock):
+    from mcp_weather_plus.utils import warm_up_http_client
+
+    forecast = respx_mock.head("https://api.open-meteo.com/").mock(return_value=Response(404))
+    geocoding = respx_mock.head("https://geocoding-api.open-meteo.com/").mock(side_effect=httpx.ConnectError("down"))
+    await warm_up_http_client([FORECAST_URL, FORECAST_URL + "?x=1", "https://geocoding-api.open-meteo.com/v1/search"])
+    assert forecast.call_count == 1
+    assert geocoding.call_count == 1
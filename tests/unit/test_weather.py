@@ -49,3 +49,254 @@ async def test_get_current_weather(respx_mock):
     forecast = await service.get_current_weather(51.5074, -0.1278)
     assert forecast.temperature == 20.0
     assert forecast.uv_index == 5.0
+
+@pytest.mark.asyncio
+async def test_get_coordinates_cached(respx_mock):
+    route = respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(
+        return_value=Response(200, json={"results": [{"latitude": 51.5074, "longitude": -0.1278}]})
+    )
+
+    service = WeatherService()
+    await service.get_coordinates("London")
+    coords = await service.get_coordinates("  LONDON ")
+    assert coords.latitude == 51.5074
+    assert route.call_count == 1
+
+@pytest.mark.asyncio
+async def test_get_coordinates_not_found_cached(respx_mock):
+    route = respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(
+        return_value=Response(200, json={"results": []})
+    )
+
+    service = WeatherService()
+    for _ in range(2):
+        with pytest.raises(GeocodingError):
+            await service.get_coordinates("NonExistentCity")
+    assert route.call_count == 1
+
+@pytest.mark.asyncio
+async def test_nearby_coordinates_share_cached_response(respx_mock):
+    route = respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(
+        return_value=Response(200, json={"hourly": {"temperature_2m": [1.0]}})
+    )
+
+    service = WeatherService()
+    first = await service.get_weather_details(51.5074, -0.1278)
+    second = await service.get_weather_details(51.5101, -0.1301)
+    assert first == second
+    assert route.call_count == 1
+    assert route.calls[0].request.url.params["latitude"] == "51.5"
+
+def test_range_ttl():
+    from datetime import date, timedelta
+    from mcp_weather_plus.config import get_settings
+
+    settings = get_settings()
+    past = (date.today() - timedelta(days=30)).isoformat()
+    future = (date.today() + timedelta(days=3)).isoformat()
+    assert WeatherService._range_ttl(past) == settings.historical_cache_ttl
+    assert WeatherService._range_ttl(future) == settings.forecast_cache_ttl
+    assert WeatherService._range_ttl("not-a-date") == settings.forecast_cache_ttl
+
+def _current_payload(temperature):
+    return {
+        "current": {
+            "temperature_2m": temperature,
+            "apparent_temperature": temperature,
+            "relative_humidity_2m": 50,
+            "wind_speed_10m": 10.0,
+            "wind_direction_10m": 180,
+            "precipitation": 0.0,
+            "visibility": 10000.0,
+        },
+        "daily": {"uv_index_max": [5.0]},
+    }
+
+@pytest.mark.asyncio
+async def test_get_current_weather_batch_chunks_locations(respx_mock):
+    from mcp_weather_plus.config import Settings, set_settings
+    from mcp_weather_plus.models import Coordinates
+
+    set_settings(Settings(batch_chunk_size=2))
+
+    def respond(request):
+        latitudes = request.url.params["latitude"].split(",")
+        payload = [_current_payload(float(lat)) for lat in latitudes]
+        return Response(200, json=payload if len(payload) > 1 else payload[0])
+
+    route = respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(side_effect=respond)
+    locations = [Coordinates(latitude=lat, longitude=0.0) for lat in (10.0, 20.0, 30.0)]
+
+    service = WeatherService()
+    forecasts = await service.get_current_weather_batch(locations)
+    assert [f.temperature for f in forecasts] == [10.0, 20.0, 30.0]
+    assert route.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_coordinates_batch_keeps_failures_in_place(respx_mock):
+    def respond(request):
+        if request.url.params["name"] == "Atlantis":
+            return Response(200, json={"results": []})
+        return Response(200, json={"results": [{"latitude": 51.5074, "longitude": -0.1278}]})
+
+    respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(side_effect=respond)
+
+    service = WeatherService()
+    results = await service.get_coordinates_batch(["London", "Atlantis"])
+    assert results[0].latitude == 51.5074
+    assert isinstance(results[1], GeocodingError)
+
+@pytest.mark.asyncio
+async def test_get_weather_details_projection(respx_mock):
+    route = respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(
+        return_value=Response(200, json={"hourly": {"temperature_2m": [1.0]}})
+    )
+
+    service = WeatherService()
+    await service.get_weather_details(51.5, -0.1, variables=["temperature_2m", "sunrise"], forecast_days=2, forecast_hours=12)
+    params = route.calls[0].request.url.params
+    assert params.get_list("current") == ["temperature_2m"]
+    assert params.get_list("hourly") == ["temperature_2m"]
+    assert params.get_list("daily") == ["sunrise"]
+    assert params["forecast_days"] == "2"
+    assert params["forecast_hours"] == "12"
+
+    # A different projection is a different cache entry
+    await service.get_weather_details(51.5, -0.1, variables=["uv_index"])
+    params = route.calls[1].request.url.params
+    assert params.get_list("hourly") == ["uv_index"]
+    assert "current" not in params and "daily" not in params
+    assert route.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_weather_details_rejects_unknown_variables():
+    from mcp_weather_plus.exceptions import InvalidParameterError
+
+    service = WeatherService()
+    with pytest.raises(InvalidParameterError):
+        await service.get_weather_details(51.5, -0.1, variables=["bogus"])
+    with pytest.raises(InvalidParameterError):
+        await service.get_weather_details(51.5, -0.1, forecast_days=30)
+
+@pytest.mark.asyncio
+async def test_weather_range_tool_returns_daily_summary(respx_mock):
+    from mcp_weather_plus.tools.weather import WeatherTools
+
+    respx_mock.get("https://geocoding-api.open-meteo.com/v1/search").mock(
+        return_value=Response(200, json={"results": [{"latitude": 51.5074, "longitude": -0.1278}]})
+    )
+    hours = 24 * 14
+    respx_mock.get("https://archive-api.open-meteo.com/v1/archive").mock(
+        return_value=Response(200, json={
+            "utc_offset_seconds": 0,
+            "hourly": {
+                "time": [1704067200 + 3600 * i for i in range(hours)],
+                "temperature_2m": [float(i % 24) for i in range(hours)],
+                "wind_speed_10m": [5.0] * hours,
+            },
+        })
+    )
+
+    result = await WeatherTools().handle_call("get_weather_by_datetime_range", {
+        "city": "London", "start_date": "2024-01-01", "end_date": "2024-01-14",
+    })
+    lines = result[0].text.strip().splitlines()
+    assert len(lines) == 3 + 14
+    assert lines[3] == "| 2024-01-01 | 0 | 23 | - | 5 |"
+
+    # An explicit null means the default
+    result = await WeatherTools().handle_call("get_weather_by_datetime_range", {
+        "city": "London", "start_date": "2024-01-01", "end_date": "2024-01-14", "granularity": None,
+    })
+    assert result[0].text.strip().splitlines() == lines
+
+@pytest.mark.asyncio
+async def test_weather_range_tool_rejects_unknown_granularity():
+    from mcp_weather_plus.exceptions import InvalidParameterError
+    from mcp_weather_plus.tools.weather import WeatherTools
+
+    with pytest.raises(InvalidParameterError):
+        await WeatherTools().handle_call("get_weather_by_datetime_range", {
+            "city": "London", "start_date": "2024-01-01", "end_date": "2024-01-14", "granularity": "weekly",
+        })
+
+def test_range_chunks_split_at_months_and_archive_cutoff():
+    from datetime import date
+
+    chunks = WeatherService._range_chunks(date(2024, 1, 20), date(2024, 3, 10), archive_cutoff=date(2024, 3, 5))
+    assert chunks == [
+        (date(2024, 1, 20), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29)),
+        (date(2024, 3, 1), date(2024, 3, 4)),
+        (date(2024, 3, 5), date(2024, 3, 10)),
+    ]
+    assert WeatherService._range_chunks(date(2024, 12, 30), date(2025, 1, 2), date(2020, 1, 1)) == [
+        (date(2024, 12, 30), date(2024, 12, 31)),
+        (date(2025, 1, 1), date(2025, 1, 2)),
+    ]
+
+@pytest.mark.asyncio
+async def test_get_weather_by_range_routes_past_chunks_to_archive(respx_mock):
+    from datetime import date, timedelta
+
+    def respond(request):
+        params = request.url.params
+        start, end = date.fromisoformat(params["start_date"]), date.fromisoformat(params["end_date"])
+        days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+        hourly = {"time": days, "temperature_2m": [1.0] * len(days), "wind_speed_10m": [2.0] * len(days)}
+        if "precipitation_probability" in params.get_list("hourly"):
+            hourly["precipitation_probability"] = [50] * len(days)
+        return Response(200, json={"utc_offset_seconds": 0, "hourly": hourly})
+
+    archive = respx_mock.get("https://archive-api.open-meteo.com/v1/archive").mock(side_effect=respond)
+    forecast = respx_mock.get("https://api.open-meteo.com/v1/forecast").mock(side_effect=respond)
+
+    start = date.today() - timedelta(days=40)
+    end = date.today() + timedelta(days=2)
+    data = await WeatherService().get_weather_by_range(51.5, -0.1, start.isoformat(), end.isoformat())
+
+    hourly = data["hourly"]
+    assert hourly["time"][0] == start.isoformat() and hourly["time"][-1] == end.isoformat()
+    assert len(hourly["time"]) == len(hourly["precipitation_probability"]) == 43
+    assert archive.call_count >= 1 and forecast.call_count >= 1
+    assert all(date.fromisoformat(c.request.url.params["end_date"]) < date.today() - timedelta(days=5) for c in archive.calls)
+    assert hourly["precipitation_probability"][0] is None and hourly["precipitation_probability"][-1] == 50
+
+    # Archived chunks are cached, so a repeated query doesn't hit the upstream again
+    calls = archive.call_count + forecast.call_count
+    await WeatherService().get_weather_by_range(51.5, -0.1, start.isoformat(), end.isoformat())
+    assert archive.call_count + forecast.call_count == calls
+
+@pytest.mark.asyncio
+async def test_get_weather_by_range_rejects_bad_dates():
+    from mcp_weather_plus.exceptions import InvalidParameterError
+
+    with pytest.raises(InvalidParameterError):
+        await WeatherService().get_weather_by_range(51.5, -0.1, "2024-02-01", "2024-01-01")
+    with pytest.raises(InvalidParameterError):
+        await WeatherService().get_weather_by_range(51.5, -0.1, "yesterday", "2024-01-01")
+    with pytest.raises(InvalidParameterError, match="Date range too long"):
+        await WeatherService().get_weather_by_range(51.5, -0.1, "1940-01-01", "2025-12-31")
+
+@pytest.mark.asyncio
+async def test_get_weather_by_range_stops_fetching_after_a_failed_chunk(respx_mock):
+    import asyncio
+    from mcp_weather_plus.config import Settings, set_settings
+    from mcp_weather_plus.exceptions import ApiError
+
+    set_settings(Settings(range_max_concurrency=2))
+    requested = []
+
+    async def respond(request):
+        requested.append(request.url.params["start_date"])
+        if request.url.params["start_date"] == "2020-01-01":
+            return Response(400, json={"reason": "bad request"})
+        await asyncio.sleep(0.1)
+        return Response(200, json={"hourly": {"time": []}})
+
+    respx_mock.get("https://archive-api.open-meteo.com/v1/archive").mock(side_effect=respond)
+    with pytest.raises(ApiError):
+        await WeatherService().get_weather_by_range(51.5, -0.1, "2020-01-01", "2020-06-30")
+    await asyncio.sleep(0.2)
+    # At most the month handed January's slot starts; the rest are never requested
+    assert set(requested) <= {"2020-01-01", "2020-02-01", "2020-03-01"}